@@ -0,0 +1,81 @@
+"""
+aliassampler.py - Walker/Vose alias tables for repeated categorical draws
+A table is built once per distribution in O(k); every draw after that costs
+one uniform random number and one table lookup, whatever k is.
+"""
+
+import numpy as np
+from typing import Tuple, Union
+
+
+def build_alias(probabilities: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Build (prob, alias) arrays for one distribution using Vose's method"""
+    p = np.asarray(probabilities, dtype=float)
+    k = len(p)
+    total = p.sum()
+    scaled = p * k / total if total > 0 else np.ones(k)
+    prob = np.ones(k)
+    alias = np.arange(k)
+
+    small = [i for i in range(k) if scaled[i] < 1.0]
+    large = [i for i in range(k) if scaled[i] >= 1.0]
+    while small and large:
+        s = small.pop()
+        g = large.pop()
+        prob[s] = scaled[s]
+        alias[s] = g
+        scaled[g] -= 1.0 - scaled[s]
+        (small if scaled[g] < 1.0 else large).append(g)
+    # Whatever is left over is 1 up to rounding error
+    for i in small + large:
+        prob[i] = 1.0
+
+    return prob, alias
+
+
+def build_alias_arrays(probabilities: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Build alias tables for every distribution in a (..., k) array"""
+    p = np.asarray(probabilities, dtype=float)
+    rows = p.reshape(-1, p.shape[-1])
+    prob = np.empty_like(rows)
+    alias = np.empty(rows.shape, dtype=np.int64)
+    for r, row in enumerate(rows):
+        prob[r], alias[r] = build_alias(row)
+    return prob.reshape(p.shape), alias.reshape(p.shape)
+
+
+def draw_alias(prob: np.ndarray, alias: np.ndarray, table: np.ndarray, u: np.ndarray) -> np.ndarray:
+    """Map uniforms u in [0, 1) to outcomes through a stack of alias tables
+
+    prob and alias have shape (n_tables, k) and table picks the table used
+    for each draw. The integer part of u * k picks the column and the
+    fractional part decides between the column and its alias.
+    """
+    scaled = u * prob.shape[-1]
+    column = scaled.astype(np.int64)
+    keep = (scaled - column) < prob[table, column]
+    return np.where(keep, column, alias[table, column])
+
+
+class AliasTable:
+    """Alias table for a single distribution"""
+    __slots__ = ('prob', 'alias', 'k')
+
+    def __init__(self, probabilities: np.ndarray):
+        prob, alias = build_alias(probabilities)
+        self.prob = prob.tolist()
+        self.alias = alias.tolist()
+        self.k = len(self.prob)
+
+    def draw(self, rng: np.random.Generator, size: Union[int, None] = None):
+        """Draw one outcome index (size=None) or an array of size indices"""
+        if size is None:
+            scaled = rng.random() * self.k
+            column = int(scaled)
+            return column if scaled - column < self.prob[column] else self.alias[column]
+
+        scaled = rng.random(size) * self.k
+        column = scaled.astype(np.int64)
+        prob = np.asarray(self.prob)
+        alias = np.asarray(self.alias)
+        return np.where(scaled - column < prob[column], column, alias[column])
@@ -0,0 +1,191 @@
+"""
+api.py - JSON API for scripted simulations
+POST /api/simulate takes one matchup or a batch and returns the same stats
+dicts the UI shows. Batches are gathered from the matchup matrix in one step
+and drawn in vectorized blocks; ask for application/x-ndjson (or ?stream=1)
+to get one line per matchup as blocks finish. Request bodies may be gzipped
+(Content-Encoding: gzip), and responses are gzipped for clients that accept it.
+
+Single matchup (give a cage from cages.py or a plain park_factor, and
+optionally a model from matchupmodels.py):
+    {"batter_id": "...", "pitcher_id": "...", "n": 1000, "cage": "right",
+     "seed": 42, "exact": false, "model": "log5"}
+Batch:
+    {"matchups": [{"batter_id": "...", "pitcher_id": "...", "n": 1000}, ...],
+     "seed": 42, "exact": false, "model": "log5"}
+"""
+
+import json
+import os
+import zlib
+import numpy as np
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from typing import Callable, Dict, Iterator, List, Tuple, Union
+
+from cages import CAGES, hit_factors
+from matchupmodels import DEFAULT_MODEL, MODELS
+
+MAX_BATCH = int(os.environ.get('YEO_API_MAX_BATCH', 100000))
+MAX_SIMS = 10000000
+MAX_BODY_BYTES = 64 * 1024 * 1024
+# Matchups drawn per multinomial call; block k is seeded from child k of the
+# request seed, so streamed and buffered responses are identical
+BLOCK_SIZE = 10000
+
+
+class APIError(Exception):
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def read_json_body():
+    """Parse the request body, inflating it first if it is gzip/deflate encoded"""
+    data = request.get_data()
+    encoding = request.headers.get('Content-Encoding', '').lower()
+    if encoding in ('gzip', 'deflate'):
+        # wbits=47 auto-detects gzip or zlib headers; max_length guards against zip bombs
+        inflater = zlib.decompressobj(47)
+        try:
+            data = inflater.decompress(data, MAX_BODY_BYTES)
+        except zlib.error as e:
+            raise APIError(f"Invalid {encoding} body: {e}")
+        if inflater.unconsumed_tail:
+            raise APIError("Request body too large", 413)
+    elif encoding not in ('', 'identity'):
+        raise APIError(f"Unsupported Content-Encoding: {encoding}", 415)
+    try:
+        return json.loads(data)
+    except ValueError as e:
+        raise APIError(f"Invalid JSON: {e}")
+
+
+def parse_matchup(item, sim, index=None) -> Tuple[str, str, int, Union[str, float]]:
+    """Validate one matchup and return (batter_id, pitcher_id, n, cage name or park_factor)"""
+    where = '' if index is None else f" in matchup {index}"
+    if not isinstance(item, dict):
+        raise APIError(f"Expected an object{where}")
+    batter_id, pitcher_id = item.get('batter_id'), item.get('pitcher_id')
+    if not isinstance(batter_id, str) or not isinstance(pitcher_id, str):
+        raise APIError(f"batter_id and pitcher_id must be strings{where}")
+    if batter_id not in sim.batters:
+        raise APIError(f"Unknown batter_id {batter_id!r}{where}", 404)
+    if pitcher_id not in sim.pitchers:
+        raise APIError(f"Unknown pitcher_id {pitcher_id!r}{where}", 404)
+    try:
+        n = int(item.get('n', 1000))
+        park_factor = float(item.get('park_factor', 1.0))
+    except (TypeError, ValueError):
+        raise APIError(f"n and park_factor must be numbers{where}")
+    if not 1 <= n <= MAX_SIMS:
+        raise APIError(f"n must be between 1 and {MAX_SIMS}{where}")
+    if not 0 < park_factor <= 2:
+        raise APIError(f"park_factor must be in (0, 2]{where}")
+    if 'cage' in item:
+        if not isinstance(item['cage'], str) or item['cage'] not in CAGES:
+            raise APIError(f"Unknown cage {item['cage']!r}{where}; expected one of {sorted(CAGES)}")
+        return batter_id, pitcher_id, n, item['cage']
+    return batter_id, pitcher_id, n, park_factor
+
+
+def simulate_matchups(sim, matchups: List[Tuple], seed: int, exact: bool,
+                      model: str = DEFAULT_MODEL) -> Iterator[Dict]:
+    """Yield a result record per matchup, drawing BLOCK_SIZE matchups per call"""
+    batter_ids, pitcher_ids, ns, park_factors = (list(column) for column in zip(*matchups))
+    probabilities = sim.park_adjusted_probabilities(sim.batch_probabilities(batter_ids, pitcher_ids, model),
+                                                    np.array([hit_factors(pf) for pf in park_factors]))
+    for k, start in enumerate(range(0, len(matchups), BLOCK_SIZE)):
+        block = slice(start, start + BLOCK_SIZE)
+        results = sim.simulate_batch(probabilities[block], ns[block],
+                                     seed=np.random.SeedSequence(seed, spawn_key=(k,)), exact=exact)
+        for i, stats in enumerate(results, start):
+            stats['summary']['cage' if isinstance(park_factors[i], str) else 'park_factor'] = park_factors[i]
+            stats['summary']['model'] = model
+            if not exact:
+                stats['summary']['seed'] = seed
+            record = {'batter_id': batter_ids[i], 'pitcher_id': pitcher_ids[i], 'n': ns[i], 'stats': stats}
+            record['cage' if isinstance(park_factors[i], str) else 'park_factor'] = park_factors[i]
+            yield record
+
+
+def accepts_gzip() -> bool:
+    return 'gzip' in request.headers.get('Accept-Encoding', '').lower()
+
+
+def json_response(payload) -> Response:
+    body = json.dumps(payload).encode()
+    response = Response(body, mimetype='application/json')
+    if accepts_gzip() and len(body) > 1024:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        response.set_data(compressor.compress(body) + compressor.flush())
+        response.headers['Content-Encoding'] = 'gzip'
+        response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+
+def ndjson_response(records: Iterator[Dict]) -> Response:
+    compress = accepts_gzip()
+
+    def generate():
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+        for record in records:
+            line = (json.dumps(record) + '\n').encode()
+            yield compressor.compress(line) if compressor else line
+        if compressor:
+            yield compressor.flush()
+
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    if compress:
+        response.headers['Content-Encoding'] = 'gzip'
+        response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+
+def create_api(get_simulator: Callable) -> Blueprint:
+    """Build the /api blueprint; get_simulator returns the simulator to serve from
+
+    It is called once per request, so a reload never changes the data under
+    a request that is already running.
+    """
+    api = Blueprint('api', __name__, url_prefix='/api')
+
+    @api.errorhandler(APIError)
+    def api_error(error: APIError):
+        return jsonify({'error': str(error)}), error.status
+
+    @api.route('/simulate', methods=['POST'])
+    def simulate():
+        sim = get_simulator()
+        body = read_json_body()
+        batch = isinstance(body, list) or (isinstance(body, dict) and 'matchups' in body)
+        options = body if isinstance(body, dict) else {}
+        exact = options.get('exact', False)
+        if not isinstance(exact, bool):
+            raise APIError("exact must be true or false")
+        seed = options.get('seed')
+        if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int)):
+            raise APIError("seed must be an integer")
+        if seed is not None and seed < 0:
+            raise APIError("seed must be non-negative")
+        seed = sim.resolve_seed(seed)
+        model = options.get('model', DEFAULT_MODEL)
+        if not isinstance(model, str) or model not in MODELS:
+            raise APIError(f"Unknown model {model!r}; expected one of {sorted(MODELS)}")
+
+        if not batch:
+            matchup = parse_matchup(body, sim)
+            return json_response(next(simulate_matchups(sim, [matchup], seed, exact, model))['stats'])
+
+        items = body if isinstance(body, list) else body['matchups']
+        if not isinstance(items, list) or not items:
+            raise APIError("matchups must be a non-empty list")
+        if len(items) > MAX_BATCH:
+            raise APIError(f"At most {MAX_BATCH} matchups per request", 413)
+        matchups = [parse_matchup(item, sim, i) for i, item in enumerate(items)]
+
+        records = simulate_matchups(sim, matchups, seed, exact, model)
+        if request.args.get('stream') or 'application/x-ndjson' in request.headers.get('Accept', ''):
+            return ndjson_response(records)
+        return json_response({'seed': seed, 'exact': exact, 'model': model, 'results': list(records)})
+
+    return api
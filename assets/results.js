@@ -0,0 +1,111 @@
+/*
+ * Client-side rendering of the results view (see create_results_view in yeoAPP.py).
+ *
+ * results-store holds the distribution a result was computed from and the
+ * cage it was computed under; results-config holds the cage factors and the
+ * stat weights. Switching cages re-applies the park adjustment to the same
+ * distribution here, so it needs no server round trip and no new simulation.
+ * The math mirrors park_adjusted_probabilities and analytic_summary in
+ * atbatsimmyYEO.py.
+ */
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    results: {
+        render: function(data, cageName, config) {
+            var stats = config.stats, outcomes = config.outcomes;
+            if (!data) {
+                return [true, '', '', 'results-info', '', blank(stats, ''), blank(stats, ''),
+                        blank(outcomes, {}), blank(outcomes, '')];
+            }
+
+            var cage = config.cages[cageName] ? cageName : data.cage;
+            var info = config.cages[cage];
+            // The stored distribution already carries its own cage's factors,
+            // so only the ratio to the selected cage is applied
+            var ratio = info.factors.map(function(f, i) { return f / config.cages[data.cage].factors[i]; });
+            var p = parkAdjust(data.pct, ratio, config.hits, config.fo);
+            var summary = summarize(p, data.n, config.weights);
+
+            var details = [' • Park Factors: ' + info.detail, ' • Model: ' + data.model,
+                           data.seed === null ? ' • Exact Expectation' : ' • Seed: ' + data.seed];
+            if (data.seed !== null && cage !== data.cage) {
+                details.push(' • Reweighted from ' + config.cages[data.cage].label + ' sample');
+            }
+            return [
+                false,
+                info.label + ' (' + info.description + ')',
+                details.join(''),
+                'results-info' + (info.hitter_friendly ? ' hitter-friendly' : ''),
+                '* ' + (info.hitter_friendly ? '↑' : '↓') + ' Hit probabilities scaled for cage dimensions ('
+                    + info.detail + ') before simulating',
+                stats.map(function(stat) { return summary.expected[stat].toFixed(3); }),
+                stats.map(function(stat) {
+                    if (data.z === null) {
+                        return '';
+                    }
+                    var sd = data.z * Math.sqrt(summary.variance[stat]);
+                    return Math.round(data.confidence * 100) + '% CI ' + (summary.expected[stat] - sd).toFixed(3)
+                        + '–' + (summary.expected[stat] + sd).toFixed(3);
+                }),
+                p.map(function(pct) { return {width: (pct * 300).toFixed(1) + 'px'}; }),
+                p.map(function(pct) { return (pct * 100).toFixed(1) + '%'; })
+            ];
+        }
+    }
+});
+
+function blank(items, value) {
+    return items.map(function() { return value; });
+}
+
+// Scale hit probabilities, moving the difference to/from fielded outs
+function parkAdjust(p, factors, hits, fo) {
+    var adjusted = p.slice(), gained = 0;
+    hits.forEach(function(j, i) {
+        adjusted[j] = p[j] * factors[i];
+        gained += adjusted[j] - p[j];
+    });
+    adjusted[fo] -= gained;
+    if (adjusted[fo] < 0) {
+        adjusted[fo] = 0;
+        var total = adjusted.reduce(function(a, b) { return a + b; }, 0);
+        adjusted = adjusted.map(function(x) { return x / total; });
+    }
+    return adjusted;
+}
+
+// Expected AVG/OBP/SLG/OPS and their delta-method variance over n plate appearances
+function summarize(p, n, weights) {
+    var means = weights.map(function(w) {
+        return w.reduce(function(sum, wj, j) { return sum + wj * p[j]; }, 0);
+    });
+    var cov = weights.map(function(wk, k) {
+        return weights.map(function(wl, l) {
+            var second = wk.reduce(function(sum, wkj, j) { return sum + wkj * wl[j] * p[j]; }, 0);
+            return second - means[k] * means[l];
+        });
+    });
+    var hits = means[0], atBats = means[1], onBase = means[2], totalBases = means[3];
+    var avg = atBats > 0 ? hits / atBats : 0, slg = atBats > 0 ? totalBases / atBats : 0;
+    var safeAB = atBats > 0 ? atBats : Infinity;
+    var gradients = {
+        AVG: [1 / safeAB, -avg / safeAB, 0, 0],
+        OBP: [0, 0, 1, 0],
+        SLG: [0, -slg / safeAB, 0, 1 / safeAB]
+    };
+    gradients.OPS = gradients.OBP.map(function(g, i) { return g + gradients.SLG[i]; });
+
+    var variance = {};
+    Object.keys(gradients).forEach(function(stat) {
+        var g = gradients[stat], v = 0;
+        for (var k = 0; k < 4; k++) {
+            for (var l = 0; l < 4; l++) {
+                v += g[k] * cov[k][l] * g[l];
+            }
+        }
+        variance[stat] = Math.max(v, 0) / Math.max(n, 1);
+    });
+    return {
+        expected: {AVG: avg, OBP: onBase, SLG: slg, OPS: onBase + slg},
+        variance: variance
+    };
+}
@@ -3,110 +3,476 @@ atbatsimmyYeo.py - Oberlin Baseball At-Bat Simulator
 Simulates individual at-bats between any Oberlin batter and pitcher
 """
 
+import copy
 import json
+import logging
+import os
 import random
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from collections.abc import Mapping
+from concurrent.futures import Executor
+from statistics import NormalDist
+from typing import Dict, List, Tuple, Optional, Union
+
+from aliassampler import AliasTable
+from cages import HIT_OUTCOMES, cage_factors
+from matchupmodels import DEFAULT_MODEL, MODELS, get_model, league_rates
+from metrics import SIMULATED_AT_BATS, SIMULATOR_SECONDS, configure_logging, log_event, timed
+from parallelsim import parallel_outcome_counts
+from playerstore import PlayerTable, PlayerView, year_from_player_id
+import snapshot
+
+logger = logging.getLogger(__name__)
+
+# Outcome order shared by every probability vector and count array
+OUTCOMES = ['1B', '2B', '3B', 'HR', 'BB', 'K', 'HBP', 'FO']
+# Player rate keys, in OUTCOMES order
+RATE_KEYS = [f'{o}%' for o in OUTCOMES]
+
+# Per-plate-appearance value of each outcome (in OUTCOMES order) for the
+# quantities the rate stats are built from: hits, at-bats, times on base and
+# total bases
+STAT_WEIGHTS = np.array([
+    [1, 1, 1, 1, 0, 0, 0, 0],
+    [1, 1, 1, 1, 0, 1, 0, 1],
+    [1, 1, 1, 1, 1, 0, 1, 0],
+    [1, 2, 3, 4, 0, 0, 0, 0],
+], dtype=float)
+SUMMARY_STATS = ['AVG', 'OBP', 'SLG', 'OPS']
+# Batters per broadcasted chunk in all_pairs
+ALL_PAIRS_CHUNK = 256
+
+
+def analytic_summary(probabilities: np.ndarray, n: int) -> Tuple[Dict, Dict]:
+    """Expected AVG/OBP/SLG/OPS and their variance over n plate appearances
+
+    probabilities has shape (..., 8) and every result keeps the leading shape,
+    so whole matchup matrices can be evaluated at once; n is a scalar or
+    broadcasts against that leading shape. AVG and SLG are ratios
+    of per-PA means, so their expectation and variance use the delta method;
+    both are exact as n grows.
+    """
+    p = np.asarray(probabilities, dtype=float)
+    means = p @ STAT_WEIGHTS.T
+    hits, at_bats, on_base, total_bases = np.moveaxis(means, -1, 0)
+    # Per-PA covariance of (hits, at-bats, times on base, total bases)
+    second_moments = (STAT_WEIGHTS * p[..., None, :]) @ STAT_WEIGHTS.T
+    covariance = second_moments - means[..., :, None] * means[..., None, :]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        safe_ab = np.where(at_bats > 0, at_bats, np.nan)
+        avg = hits / safe_ab
+        slg = total_bases / safe_ab
+        zero = np.zeros_like(hits)
+        # Gradient of each stat with respect to the four per-PA means
+        gradients = {
+            'AVG': np.stack([1 / safe_ab, -avg / safe_ab, zero, zero], axis=-1),
+            'OBP': np.stack([zero, zero, zero + 1, zero], axis=-1),
+            'SLG': np.stack([zero, -slg / safe_ab, zero, 1 / safe_ab], axis=-1),
+        }
+    gradients['OPS'] = gradients['OBP'] + gradients['SLG']
 
+    expected = {'AVG': np.nan_to_num(avg), 'OBP': on_base, 'SLG': np.nan_to_num(slg)}
+    expected['OPS'] = expected['OBP'] + expected['SLG']
+    variance = {
+        stat: np.nan_to_num(np.einsum('...i,...ij,...j->...', g, covariance, g)) / np.maximum(n, 1)
+        for stat, g in gradients.items()
+    }
+    return expected, variance
 
-class OberlinAtBatSimulator:
-    def __init__(self):
-        """Initialize the Oberlin at-bat simulator"""
-        self.batters = self.load_batters()
-        self.pitchers = self.load_pitchers()
-        print(f"✅ Loaded {len(self.batters)} batters and {len(self.pitchers)} pitchers")
 
-    def load_batters(self) -> Dict:
-        """Load batter data from JSON"""
+def count_summary(counts: np.ndarray, n) -> Dict[str, np.ndarray]:
+    """Observed AVG/OBP/SLG/OPS of (..., 8) outcome counts over n plate appearances
+
+    Like analytic_summary, every stat keeps the leading shape of counts.
+    """
+    hits, at_bats, on_base, total_bases = np.moveaxis(np.asarray(counts) @ STAT_WEIGHTS.T, -1, 0)
+    safe_ab = np.where(at_bats > 0, at_bats, 1)
+    summary = {
+        'AVG': np.where(at_bats > 0, hits / safe_ab, 0.0),
+        'OBP': on_base / np.maximum(n, 1),
+        'SLG': np.where(at_bats > 0, total_bases / safe_ab, 0.0)
+    }
+    summary['OPS'] = summary['OBP'] + summary['SLG']
+    return summary
+
+
+class OberlinAtBatSimulator:
+    def __init__(self, seed: Optional[Union[int, np.random.Generator]] = None,
+                 data_dir: str = 'oberlin_baseball_data', use_snapshot: bool = True):
+        """Initialize the Oberlin at-bat simulator
+
+        seed may be an int or a np.random.Generator. It drives single at-bats
+        and picks the seed of any batch run that is not given one explicitly.
+        With use_snapshot, player data is loaded from the compiled snapshot in
+        data_dir (see snapshot.py), which is rebuilt if the JSON changed.
+        """
+        self.rng = np.random.default_rng(seed)
+        self.data_dir = data_dir
+        # Alias tables for single at-bat draws, keyed on (batter_id, pitcher_id)
+        self.alias_tables: Dict[Tuple[str, str], AliasTable] = {}
+        # Keyed on (batter_id, pitcher_id, cage, model)
+        self.cage_distributions: Dict[Tuple[str, str, str, str], np.ndarray] = {}
+        # Matchup matrices of non-default models, built on first use
+        self.model_matrices: Dict[str, np.ndarray] = {}
+        source = 'snapshot'
+        if use_snapshot and self.load_snapshot():
+            sources = snapshot.recorded_sources(data_dir)
+        else:
+            source = 'json'
+            sources = snapshot.source_signatures(data_dir)
+            self.batters = self.load_batters()
+            self.pitchers = self.load_pitchers()
+            self.build_matchup_matrix()
+            if use_snapshot:
+                self.save_snapshot(sources)
+        # Identifies the player data loaded, e.g. to version persisted results
+        self.data_version = snapshot.data_version(sources)
+        log_event(logger, 'players_loaded', batters=len(self.batters), pitchers=len(self.pitchers),
+                  source=source, data_version=self.data_version)
+
+    @timed(SIMULATOR_SECONDS, method='load_snapshot')
+    def load_snapshot(self) -> bool:
+        """Load tables and the matchup matrix from a current snapshot, if there is one"""
+        arrays = snapshot.load_snapshot(self.data_dir, RATE_KEYS)
+        if arrays is None:
+            return False
+        self.batters = PlayerTable(arrays['batters'], arrays['batter_rates'], RATE_KEYS)
+        self.pitchers = PlayerTable(arrays['pitchers'], arrays['pitcher_rates'], RATE_KEYS)
+        self.batter_index, self.pitcher_index = self.batters.index, self.pitchers.index
+        self.batter_rates, self.pitcher_rates = self.batters.rates, self.pitchers.rates
+        self.update_league()
+        self.matchup_matrix = arrays['matchups']
+        self.freeze_arrays()
+        return True
+
+    def save_snapshot(self, sources: Dict) -> bool:
+        """Write the loaded tables and matchup matrix as the data_dir snapshot"""
+        return snapshot.save_snapshot(self.data_dir, RATE_KEYS, {
+            'batters': self.batters.data,
+            'pitchers': self.pitchers.data,
+            'batter_rates': self.batter_rates,
+            'pitcher_rates': self.pitcher_rates,
+            'matchups': self.matchup_matrix
+        }, sources)
+
+    @timed(SIMULATOR_SECONDS, method='build_matchup_matrix')
+    def build_matchup_matrix(self):
+        """Precompute the (n_batters, n_pitchers, 8) matchup probability tensor of the default model"""
+        self.batter_index = self.batters.index
+        self.pitcher_index = self.pitchers.index
+        self.batter_rates = self.batters.rates
+        self.pitcher_rates = self.pitchers.rates
+        self.update_league()
+        self.matchup_matrix = self.build_model_matrix(DEFAULT_MODEL)
+        self.freeze_arrays()
+
+    def freeze_arrays(self):
+        """Mark the shared arrays read-only
+
+        Nothing writes to them after load (update_player swaps in edited
+        copies), so threads can read them without locks and workers forked
+        from a preloaded server share their pages copy-on-write.
+        """
+        for array in (self.batter_rates, self.pitcher_rates, self.batter_sizes, self.pitcher_sizes,
+                      self.league, self.matchup_matrix):
+            array.flags.writeable = False
+
+    def warm_model_matrices(self):
+        """Build every model's matrix now, e.g. before forking workers so they share them"""
+        for name in MODELS:
+            self.model_matrix(name)
+
+    def update_league(self):
+        """Refresh player sample sizes (PA/BF) and the roster-wide league rates"""
+        self.batter_sizes = self.batters.numeric_column('pa')
+        self.pitcher_sizes = self.pitchers.numeric_column('bf')
+        self.league = league_rates(self.batter_rates, self.batter_sizes, self.pitcher_rates, self.pitcher_sizes)
+
+    @timed(SIMULATOR_SECONDS, method='build_model_matrix')
+    def build_model_matrix(self, model: Optional[str]) -> np.ndarray:
+        """Apply a matchup model to every batter against every pitcher in one broadcasted pass"""
+        return self.combine_rates(self.batter_rates[:, None, :], self.pitcher_rates[None, :, :], model,
+                                  self.batter_sizes[:, None], self.pitcher_sizes[None, :])
+
+    def model_matrix(self, model: Optional[str] = None) -> np.ndarray:
+        """Matchup matrix of a model (see matchupmodels.py); None is the default model
+
+        Other models are computed on first use and kept read-only, so
+        switching models costs one pass over the roster.
+        """
+        name = get_model(model).name
+        if name == DEFAULT_MODEL:
+            return self.matchup_matrix
+        matrix = self.model_matrices.get(name)
+        if matrix is None:
+            matrix = self.build_model_matrix(name)
+            matrix.flags.writeable = False
+            self.model_matrices[name] = matrix
+        return matrix
+
+    def rate_matrix(self, players) -> np.ndarray:
+        """Stack the 8 outcome rates of each player into an (n_players, 8) array"""
+        rows = [player.rates if isinstance(player, PlayerView)
+                else [player.get(key, 0.125) for key in RATE_KEYS]  # Default to 1/8 if missing
+                for player in players]
+        return np.array(rows, dtype=float).reshape(-1, len(OUTCOMES))
+
+    def combine_rates(self, batter_rates: np.ndarray, pitcher_rates: np.ndarray, model: Optional[str] = None,
+                      batter_sizes=None, pitcher_sizes=None) -> np.ndarray:
+        """Turn batter and pitcher rates (broadcastable arrays) into matchup distributions
+
+        The sizes are the PA/BF sample sizes the shrinkage model weighs each
+        player by; they broadcast against the rates without their last axis.
+        """
+        return get_model(model).probabilities(batter_rates, pitcher_rates, self.league,
+                                              batter_sizes, pitcher_sizes)
+
+    @timed(SIMULATOR_SECONDS, method='update_player')
+    def update_player(self, player: Dict, player_type: str):
+        """Add or replace one player and refresh only its slice of the matchup matrix"""
+        pid = player['player_id']
+        is_new = pid not in (self.batters if player_type == 'batter' else self.pitchers)
+        # The league rates move with any player, so models built on them are stale everywhere
+        self.model_matrices.clear()
+        for key in [key for key in self.cage_distributions if pid in key or get_model(key[3]).uses_league]:
+            self.cage_distributions.pop(key, None)
+        for key in [key for key in self.alias_tables if pid in key]:
+            self.alias_tables.pop(key, None)
+
+        if player_type == 'batter':
+            self.batters = self.batters.replace(player)
+            self.batter_index, self.batter_rates = self.batters.index, self.batters.rates
+        else:
+            self.pitchers = self.pitchers.replace(player)
+            self.pitcher_index, self.pitcher_rates = self.pitchers.index, self.pitchers.rates
+        self.update_league()
+        if get_model(DEFAULT_MODEL).uses_league:
+            self.matchup_matrix = self.build_model_matrix(DEFAULT_MODEL)
+        elif player_type == 'batter':
+            i = self.batter_index[pid]
+            new_slice = self.combine_rates(self.batter_rates[i:i + 1, None, :], self.pitcher_rates[None, :, :],
+                                           batter_sizes=self.batter_sizes[i:i + 1, None],
+                                           pitcher_sizes=self.pitcher_sizes[None, :])
+            if is_new:
+                # New player: grow the matrix by one row
+                self.matchup_matrix = np.concatenate([self.matchup_matrix, new_slice], axis=0)
+            else:
+                # Edit a copy and publish it whole, so readers never see a half-written matrix
+                matrix = np.array(self.matchup_matrix)
+                matrix[i] = new_slice[0]
+                self.matchup_matrix = matrix
+        else:
+            j = self.pitcher_index[pid]
+            new_slice = self.combine_rates(self.batter_rates[:, None, :], self.pitcher_rates[None, j:j + 1, :],
+                                           batter_sizes=self.batter_sizes[:, None],
+                                           pitcher_sizes=self.pitcher_sizes[None, j:j + 1])
+            if is_new:
+                # New player: grow the matrix by one column
+                self.matchup_matrix = np.concatenate([self.matchup_matrix, new_slice], axis=1)
+            else:
+                matrix = np.array(self.matchup_matrix)
+                matrix[:, j] = new_slice[:, 0]
+                self.matchup_matrix = matrix
+        self.freeze_arrays()
+
+    def copy(self) -> 'OberlinAtBatSimulator':
+        """Shallow copy sharing the read-only tables and arrays, with its own memo caches and generator"""
+        clone = copy.copy(self)
+        clone.rng = self.rng.spawn(1)[0]
+        clone.alias_tables = dict(self.alias_tables)
+        clone.cage_distributions = dict(self.cage_distributions)
+        clone.model_matrices = dict(self.model_matrices)
+        return clone
+
+    @timed(SIMULATOR_SECONDS, method='reload')
+    def reload(self) -> 'OberlinAtBatSimulator':
+        """Return a simulator on the current JSON in data_dir, leaving this one untouched
+
+        Changed and added players go through update_player on a copy, so only
+        their slices of the matchup matrix are recomputed. Removed players
+        need a full rebuild, since update_player only adds or replaces.
+        """
+        sources = snapshot.source_signatures(self.data_dir)
+        batters, pitchers = self.load_batters(), self.load_pitchers()
+        if not (set(self.batters.index) <= set(batters.index) and set(self.pitchers.index) <= set(pitchers.index)):
+            return type(self)(data_dir=self.data_dir)
+
+        new = self.copy()
+        for table, player_type in ((batters, 'batter'), (pitchers, 'pitcher')):
+            current = self.batters if player_type == 'batter' else self.pitchers
+            for pid in sorted(current.changed_ids(table), key=table.index.get):
+                new.update_player(table.record(table.index[pid]), player_type)
+        new.data_version = snapshot.data_version(sources)
+        new.save_snapshot(sources)
+        return new
+
+    @timed(SIMULATOR_SECONDS, method='load_players')
+    def load_players(self, path: str) -> PlayerTable:
+        """Load a player JSON file into a columnar table keyed by player_id"""
         try:
-            with open('oberlin_baseball_data/batters.json', 'r') as f:
-                batters_list = json.load(f)
-            # Convert to dict with player_id as key
-            return {b['player_id']: b for b in batters_list}
+            with open(path, 'r') as f:
+                players_list = json.load(f)
         except FileNotFoundError:
-            print("❌ Error: oberlin_baseball_data/batters.json not found!")
-            return {}
+            log_event(logger, 'player_file_missing', logging.ERROR, path=path)
+            players_list = []
+
+        # Not every record has a year; fill it in from the player_id
+        for player in players_list:
+            if player.get('year') is None:
+                year = year_from_player_id(player['player_id'])
+                if year is not None:
+                    player['year'] = year
+        return PlayerTable.from_records(players_list, RATE_KEYS)
+
+    def load_batters(self) -> PlayerTable:
+        """Load batter data from JSON"""
+        return self.load_players(os.path.join(self.data_dir, 'batters.json'))
 
-    def load_pitchers(self) -> Dict:
+    def load_pitchers(self) -> PlayerTable:
         """Load pitcher data from JSON"""
-        try:
-            with open('oberlin_baseball_data/pitchers.json', 'r') as f:
-                pitchers_list = json.load(f)
-            # Convert to dict with player_id as key
-            return {p['player_id']: p for p in pitchers_list}
-        except FileNotFoundError:
-            print("❌ Error: oberlin_baseball_data/pitchers.json not found!")
-            return {}
-
-    def find_player(self, identifier: str, player_dict: Dict, player_type: str) -> Optional[Dict]:
-        """Find a player by ID, name, or jersey number"""
-        identifier = identifier.strip().upper()
-
-        # Try exact player_id match first
-        for pid, player in player_dict.items():
-            if pid.upper() == identifier:
-                return player
-
-        # Try by name (partial match)
-        for pid, player in player_dict.items():
-            if identifier in player['name'].upper():
-                return player
-
-        # Try by jersey number and year
-        if '_' in identifier:  # Format: JERSEY_YEAR
-            parts = identifier.split('_')
-            if len(parts) == 2:
-                jersey, year = parts
-                for pid, player in player_dict.items():
-                    if str(player.get('jersey')) == jersey and str(player.get('year')) == year:
-                        return player
-
-        # Try by jersey number only (return most recent)
-        matching = []
-        for pid, player in player_dict.items():
-            if str(player.get('jersey')) == identifier:
-                matching.append(player)
-        if matching:
-            # Return most recent year
-            return max(matching, key=lambda x: x.get('year', 0))
-
-        return None
-
-    def get_outcomes(self, batter: Dict, pitcher: Dict) -> List[Tuple[str, float]]:
+        return self.load_players(os.path.join(self.data_dir, 'pitchers.json'))
+
+    @timed(SIMULATOR_SECONDS, method='find_player')
+    def find_player(self, identifier: str, player_dict: Dict, player_type: str,
+                    fuzzy: bool = False) -> Optional[Dict]:
+        """Find a player by ID, name, or jersey number
+
+        Lookups go through the indexes built with the player table. With
+        fuzzy=True, an identifier that matches nothing falls back to the
+        closest name.
+        """
+        table = self.as_table(player_dict)
+        row = table.find_row(identifier)
+        if row is None and fuzzy:
+            candidates = table.fuzzy_rows(identifier, limit=1)
+            row = candidates[0][0] if candidates else None
+        return None if row is None else table.view(row)
+
+    def find_player_candidates(self, identifier: str, player_dict: Dict,
+                               limit: int = 5) -> List[Tuple[Dict, float]]:
+        """Rank players by how closely their name matches identifier"""
+        table = self.as_table(player_dict)
+        return [(table.view(row), score) for row, score in table.fuzzy_rows(identifier, limit)]
+
+    def as_table(self, player_dict: Dict) -> PlayerTable:
+        """Use a loaded PlayerTable as-is; index any other player mapping on the fly"""
+        if isinstance(player_dict, PlayerTable):
+            return player_dict
+        return PlayerTable.from_records([dict(p) for p in player_dict.values()], RATE_KEYS)
+
+    @timed(SIMULATOR_SECONDS, method='get_outcomes')
+    def get_outcomes(self, batter: Dict, pitcher: Dict, model: Optional[str] = None) -> List[Tuple[str, float]]:
         """Get outcome probabilities for a batter-pitcher matchup"""
-        # For simplicity, average the batter and pitcher outcome probabilities
-        outcomes = []
-        outcome_types = ['1B%', '2B%', '3B%', 'HR%', 'BB%', 'K%', 'HBP%', 'FO%']
-
-        for outcome in outcome_types:
-            # Average batter and pitcher tendencies
-            batter_prob = batter.get(outcome, 0.125)  # Default to 1/8 if missing
-            pitcher_prob = pitcher.get(outcome, 0.125)
-            avg_prob = (batter_prob + pitcher_prob) / 2
-
-            # Convert outcome name
-            outcome_name = outcome.replace('%', '')
-            outcomes.append((outcome_name, avg_prob))
-
-        # Normalize probabilities
-        total = sum(prob for _, prob in outcomes)
-        if total > 0:
-            outcomes = [(name, prob / total) for name, prob in outcomes]
-
-        return outcomes
-
-    def simulate_at_bat(self, batter: Dict, pitcher: Dict) -> str:
+        probabilities = self.outcome_probabilities(batter, pitcher, model)
+        return list(zip(OUTCOMES, probabilities.tolist()))
+
+    def is_loaded(self, batter: Dict, pitcher: Dict) -> bool:
+        """True if both dicts are the simulator's own loaded player records"""
+        return (isinstance(batter, PlayerView) and batter.table is self.batters
+                and isinstance(pitcher, PlayerView) and pitcher.table is self.pitchers)
+
+    def outcome_probabilities(self, batter: Dict, pitcher: Dict, model: Optional[str] = None) -> np.ndarray:
+        """Get the matchup distribution of a model as an array in OUTCOMES order"""
+        # Loaded players are read straight from the precomputed matrix
+        if self.is_loaded(batter, pitcher):
+            return self.model_matrix(model)[batter.row, pitcher.row].copy()
+
+        return self.combine_rates(self.rate_matrix([batter])[0], self.rate_matrix([pitcher])[0], model,
+                                  batter.get('pa'), pitcher.get('bf'))
+
+    def matchup_probabilities(self, batter_id: str, pitcher_id: str, model: Optional[str] = None) -> np.ndarray:
+        """Look up the matchup distribution for two loaded player IDs"""
+        return self.model_matrix(model)[self.batter_index[batter_id], self.pitcher_index[pitcher_id]].copy()
+
+    def park_adjusted_probabilities(self, probabilities: np.ndarray, park_factor) -> np.ndarray:
+        """Scale hit probabilities by the park factor, moving the difference to/from FO
+
+        probabilities may be a (..., 8) stack. park_factor is one factor for
+        every hit type, a {hit outcome: factor} mapping (see cages.py), an
+        array with one factor per distribution, or an array with one
+        HIT_OUTCOMES-ordered row of factors per distribution.
+        """
+        probabilities = np.asarray(probabilities, dtype=float)
+        if isinstance(park_factor, Mapping):
+            park_factor = np.array([park_factor.get(o, 1.0) for o in HIT_OUTCOMES])
+        else:
+            park_factor = np.asarray(park_factor, dtype=float)
+            if park_factor.ndim == probabilities.ndim - 1:
+                park_factor = park_factor[..., None]
+        adjusted = probabilities.copy()
+        hits = [OUTCOMES.index(o) for o in HIT_OUTCOMES]
+        fo = OUTCOMES.index('FO')
+        adjusted[..., hits] *= park_factor
+        adjusted[..., fo] -= adjusted[..., hits].sum(axis=-1) - probabilities[..., hits].sum(axis=-1)
+        short = adjusted[..., fo] < 0
+        if np.any(short):
+            adjusted[..., fo] = np.maximum(adjusted[..., fo], 0)
+            adjusted[short] /= adjusted[short].sum(axis=-1, keepdims=True)
+        return adjusted
+
+    def cage_probabilities(self, batter: Dict, pitcher: Dict, cage: str, model: Optional[str] = None) -> np.ndarray:
+        """Matchup distribution with a cage's park factors folded in, cached for loaded players
+
+        The cached array is shared and read-only.
+        """
+        if not self.is_loaded(batter, pitcher):
+            return self.park_adjusted_probabilities(self.outcome_probabilities(batter, pitcher, model),
+                                                    cage_factors(cage))
+
+        key = (batter.player_id, pitcher.player_id, cage, get_model(model).name)
+        probabilities = self.cage_distributions.get(key)
+        if probabilities is None:
+            probabilities = self.park_adjusted_probabilities(self.outcome_probabilities(batter, pitcher, model),
+                                                             cage_factors(cage))
+            probabilities.flags.writeable = False
+            self.cage_distributions[key] = probabilities
+        return probabilities
+
+    def alias_table(self, batter: Dict, pitcher: Dict) -> AliasTable:
+        """Get the alias table for a matchup, cached for loaded players"""
+        if not self.is_loaded(batter, pitcher):
+            return AliasTable(self.outcome_probabilities(batter, pitcher))
+
+        key = (batter.player_id, pitcher.player_id)
+        table = self.alias_tables.get(key)
+        if table is None:
+            table = self.alias_tables[key] = AliasTable(self.outcome_probabilities(batter, pitcher))
+        return table
+
+    def simulate_at_bat(self, batter: Dict, pitcher: Dict, rng: Optional[np.random.Generator] = None) -> str:
         """Simulate a single at-bat"""
-        outcomes = self.get_outcomes(batter, pitcher)
-
-        # Create probability distribution
-        outcome_names = [name for name, _ in outcomes]
-        probabilities = [prob for _, prob in outcomes]
-
-        # Simulate the outcome
-        result = np.random.choice(outcome_names, p=probabilities)
-
-        return result
+        # Simulate the outcome with an O(1) alias-table draw
+        return OUTCOMES[self.alias_table(batter, pitcher).draw(rng or self.rng)]
+
+    def resolve_seed(self, seed: Optional[int] = None) -> int:
+        """Return seed, or draw a fresh one from the simulator's generator
+
+        Batch runs are a pure function of their inputs plus this seed, so
+        reporting it makes every result reproducible. Drawn seeds stay below
+        2**32 so they survive the browser's JSON numbers (exact only to 2**53)
+        and can be typed back into the seed input.
+        """
+        if seed is None:
+            return int(self.rng.integers(2 ** 32))
+        return int(seed)
+
+    @timed(SIMULATOR_SECONDS, method='simulate_outcome_counts')
+    def simulate_outcome_counts(self, batter: Dict, pitcher: Dict, n: int, seed: int,
+                                workers: Optional[int] = None, executor: Optional[Executor] = None,
+                                cage: Optional[str] = None, model: Optional[str] = None) -> np.ndarray:
+        """Draw n at-bats with multinomial draws and return counts in OUTCOMES order
+
+        The draw is split into fixed chunks seeded from seed (see parallelsim),
+        which run across a process pool when workers or an executor is given.
+        The counts depend only on the inputs and seed, never on the workers.
+        """
+        if cage is None:
+            probabilities = self.outcome_probabilities(batter, pitcher, model)
+        else:
+            probabilities = self.cage_probabilities(batter, pitcher, cage, model)
+        SIMULATED_AT_BATS.inc(n)
+        return parallel_outcome_counts(probabilities, n, seed=seed, workers=workers, executor=executor)
 
     def format_result(self, result: str) -> str:
         """Format the result for display"""
@@ -122,35 +488,188 @@ class OberlinAtBatSimulator:
         }
         return result_map.get(result, result)
 
-    def simulate_multiple_at_bats(self, batter: Dict, pitcher: Dict, n: int = 1000) -> Dict:
-        """Simulate multiple at-bats and return statistics"""
-        results = []
-        for _ in range(n):
-            result = self.simulate_at_bat(batter, pitcher)
-            results.append(result)
-
-        # Calculate statistics
-        stats = {}
-        outcomes = ['1B', '2B', '3B', 'HR', 'BB', 'K', 'HBP', 'FO']
-        for outcome in outcomes:
-            count = results.count(outcome)
-            stats[outcome] = {
-                'count': count,
-                'pct': count / n
-            }
-
-        # Calculate batting average and other stats
-        hits = sum(results.count(x) for x in ['1B', '2B', '3B', 'HR'])
-        at_bats = n - results.count('BB') - results.count('HBP')
-
-        stats['summary'] = {
-            'AVG': hits / at_bats if at_bats > 0 else 0,
-            'OBP': (hits + results.count('BB') + results.count('HBP')) / n,
-            'SLG': self.calculate_slg(results, at_bats),
-            'total_sims': n
+    @timed(SIMULATOR_SECONDS, method='simulate_multiple_at_bats')
+    def simulate_multiple_at_bats(self, batter: Dict, pitcher: Dict, n: int = 1000, seed: Optional[int] = None,
+                                  workers: Optional[int] = None, exact: bool = False,
+                                  cage: Optional[str] = None, model: Optional[str] = None) -> Dict:
+        """Simulate multiple at-bats and return statistics
+
+        With exact=True the analytic expectations are returned instead (see
+        expected_stats), which costs nothing however large n is. A cage (see
+        cages.py) folds its park factors into the distribution first, and
+        model picks the matchup model (see matchupmodels.py).
+        """
+        if exact:
+            if cage is None:
+                stats = self.expected_stats(batter, pitcher, n, model=model)
+            else:
+                stats = self.stats_from_probabilities(self.cage_probabilities(batter, pitcher, cage, model), n)
+        else:
+            seed = self.resolve_seed(seed)
+            counts = self.simulate_outcome_counts(batter, pitcher, n, seed, workers=workers, cage=cage, model=model)
+            stats = self.stats_from_counts(counts, n)
+            stats['summary']['seed'] = seed
+        if cage is not None:
+            stats['summary']['cage'] = cage
+        if model is not None:
+            stats['summary']['model'] = model
+        return stats
+
+    def batch_probabilities(self, batter_ids: List[str], pitcher_ids: List[str],
+                            model: Optional[str] = None) -> np.ndarray:
+        """Gather the (m, 8) matchup distributions of paired loaded player IDs from a model's matrix"""
+        rows = [self.batter_index[pid] for pid in batter_ids]
+        cols = [self.pitcher_index[pid] for pid in pitcher_ids]
+        return self.model_matrix(model)[rows, cols]
+
+    @timed(SIMULATOR_SECONDS, method='simulate_batch')
+    def simulate_batch(self, probabilities: np.ndarray, n, seed=None, exact: bool = False,
+                       confidence: float = 0.95) -> List[Dict]:
+        """Simulate many matchups at once from a (m, 8) stack of distributions
+
+        n is one at-bat count or one per matchup. Every matchup is drawn in a
+        single multinomial call from a generator seeded with seed (an int or a
+        SeedSequence), or evaluated analytically with exact=True.
+        """
+        if exact:
+            return self.stats_from_probability_batch(probabilities, n, confidence)
+        p = np.asarray(probabilities, dtype=float).reshape(-1, len(OUTCOMES))
+        n = np.broadcast_to(np.asarray(n, dtype=np.int64), p.shape[:1])
+        SIMULATED_AT_BATS.inc(int(n.sum()))
+        counts = np.random.default_rng(seed).multinomial(n, p)
+        return self.stats_from_count_batch(counts, n)
+
+    @timed(SIMULATOR_SECONDS, method='all_pairs')
+    def all_pairs(self, year: Optional[int] = None, n: int = 1000, park_factor=1.0,
+                  simulate: bool = False, seed: Optional[int] = None,
+                  chunk_size: int = ALL_PAIRS_CHUNK, model: Optional[str] = None) -> Dict:
+        """Expected (and optionally simulated) stats for every batter against every pitcher
+
+        Restricted to one season's roster when year is given. The matchup
+        matrix is processed chunk_size batters at a time, each chunk in one
+        broadcasted pass, so memory stays bounded for any roster size. Stats
+        come back as (n_batters, n_pitchers) arrays keyed by stat name.
+        park_factor is a single factor or a {hit outcome: factor} mapping.
+        """
+        matrix = self.model_matrix(model)
+        batter_rows = self.batters.by_year.get(year, np.array([], dtype=int)) if year is not None \
+            else np.arange(len(self.batters))
+        pitcher_rows = self.pitchers.by_year.get(year, np.array([], dtype=int)) if year is not None \
+            else np.arange(len(self.pitchers))
+        shape = (len(batter_rows), len(pitcher_rows))
+        expected = {stat: np.zeros(shape) for stat in SUMMARY_STATS}
+        simulated = {stat: np.zeros(shape) for stat in SUMMARY_STATS} if simulate else None
+        seed = self.resolve_seed(seed) if simulate else None
+
+        for k, start in enumerate(range(0, shape[0], chunk_size)):
+            rows = batter_rows[start:start + chunk_size]
+            probabilities = self.park_adjusted_probabilities(matrix[np.ix_(rows, pitcher_rows)],
+                                                             park_factor)
+            chunk_expected, _ = analytic_summary(probabilities, n)
+            for stat in SUMMARY_STATS:
+                expected[stat][start:start + len(rows)] = chunk_expected[stat]
+            if simulate:
+                rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(k,)))
+                SIMULATED_AT_BATS.inc(n * probabilities.shape[0] * probabilities.shape[1])
+                chunk_simulated = count_summary(rng.multinomial(n, probabilities), n)
+                for stat in SUMMARY_STATS:
+                    simulated[stat][start:start + len(rows)] = chunk_simulated[stat]
+
+        return {
+            'batter_ids': [self.batters.ids[row] for row in batter_rows],
+            'pitcher_ids': [self.pitchers.ids[row] for row in pitcher_rows],
+            'n': n,
+            'park_factor': park_factor,
+            'model': get_model(model).name,
+            'seed': seed,
+            'expected': expected,
+            'simulated': simulated
         }
 
-        return stats
+    def expected_stats(self, batter: Dict, pitcher: Dict, n: int = 1000, confidence: float = 0.95,
+                       model: Optional[str] = None) -> Dict:
+        """Analytic expectations of the simulate_multiple_at_bats stats, no sampling"""
+        return self.stats_from_probabilities(self.outcome_probabilities(batter, pitcher, model), n, confidence)
+
+    def stats_from_probabilities(self, probabilities: np.ndarray, n: int, confidence: float = 0.95) -> Dict:
+        """Build the statistics dict from a distribution instead of sampled counts
+
+        Counts are expected counts. Each outcome and the summary also carry
+        the variance and a normal-approximation confidence interval of what
+        n sampled at-bats would show.
+        """
+        return self.stats_from_probability_batch(np.asarray(probabilities)[None], [n], confidence)[0]
+
+    def stats_from_probability_batch(self, probabilities: np.ndarray, n, confidence: float = 0.95) -> List[Dict]:
+        """stats_from_probabilities for a (m, 8) stack of distributions in one vectorized pass"""
+        p = np.asarray(probabilities, dtype=float).reshape(-1, len(OUTCOMES))
+        n = np.broadcast_to(np.asarray(n), p.shape[:1])
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        half_width = z * np.sqrt(p * (1 - p) / np.maximum(n, 1)[:, None])
+        low = np.maximum(p - half_width, 0.0).tolist()
+        high = np.minimum(p + half_width, 1.0).tolist()
+        expected_counts = (p * n[:, None]).tolist()
+
+        expected, variance = analytic_summary(p, n)
+        sd = {stat: np.sqrt(variance[stat]) for stat in SUMMARY_STATS}
+        columns = {stat: expected[stat].tolist() for stat in SUMMARY_STATS}
+        variances = {stat: variance[stat].tolist() for stat in SUMMARY_STATS}
+        ci_low = {stat: (expected[stat] - z * sd[stat]).tolist() for stat in SUMMARY_STATS}
+        ci_high = {stat: (expected[stat] + z * sd[stat]).tolist() for stat in SUMMARY_STATS}
+
+        results = []
+        for i, (pcts, total) in enumerate(zip(p.tolist(), n.tolist())):
+            stats = {outcome: {'count': expected_counts[i][j], 'pct': pct, 'ci': [low[i][j], high[i][j]]}
+                     for j, (outcome, pct) in enumerate(zip(OUTCOMES, pcts))}
+            stats['summary'] = {stat: columns[stat][i] for stat in ('AVG', 'OBP', 'SLG')}
+            stats['summary'].update({
+                'total_sims': total,
+                'exact': True,
+                'confidence': confidence,
+                'variance': {stat: variances[stat][i] for stat in SUMMARY_STATS},
+                'ci': {stat: [ci_low[stat][i], ci_high[stat][i]] for stat in SUMMARY_STATS}
+            })
+            results.append(stats)
+        return results
+
+    def stats_from_counts(self, counts: np.ndarray, n: int, confidence: Optional[float] = None) -> Dict:
+        """Build the statistics dict from outcome counts in OUTCOMES order
+
+        With a confidence level the summary also carries a plug-in
+        confidence interval for each stat, treating the observed frequencies
+        as the true distribution.
+        """
+        return self.stats_from_count_batch(np.asarray(counts)[None], [n], confidence)[0]
+
+    def stats_from_count_batch(self, counts: np.ndarray, n, confidence: Optional[float] = None) -> List[Dict]:
+        """stats_from_counts for a (m, 8) stack of outcome counts in one vectorized pass"""
+        counts = np.asarray(counts).reshape(-1, len(OUTCOMES))
+        n = np.broadcast_to(np.asarray(n), counts.shape[:1])
+        safe_n = np.maximum(n, 1)
+        columns = count_summary(counts, n)
+        if confidence is not None:
+            z = NormalDist().inv_cdf(0.5 + confidence / 2)
+            _, variance = analytic_summary(counts / safe_n[:, None], n)
+            sd = {stat: np.sqrt(variance[stat]) for stat in SUMMARY_STATS}
+            variances = {stat: variance[stat].tolist() for stat in SUMMARY_STATS}
+            ci_low = {stat: (columns[stat] - z * sd[stat]).tolist() for stat in SUMMARY_STATS}
+            ci_high = {stat: (columns[stat] + z * sd[stat]).tolist() for stat in SUMMARY_STATS}
+        pcts = (counts / safe_n[:, None]).tolist()
+        columns = {stat: columns[stat].tolist() for stat in SUMMARY_STATS}
+
+        results = []
+        for i, (row, total) in enumerate(zip(counts.tolist(), n.tolist())):
+            stats = {outcome: {'count': count, 'pct': pct} for outcome, count, pct in zip(OUTCOMES, row, pcts[i])}
+            stats['summary'] = {stat: columns[stat][i] for stat in ('AVG', 'OBP', 'SLG')}
+            stats['summary']['total_sims'] = total
+            if confidence is not None:
+                stats['summary'].update({
+                    'confidence': confidence,
+                    'variance': {stat: variances[stat][i] for stat in SUMMARY_STATS},
+                    'ci': {stat: [ci_low[stat][i], ci_high[stat][i]] for stat in SUMMARY_STATS}
+                })
+            results.append(stats)
+        return results
 
     def calculate_slg(self, results: List[str], at_bats: int) -> float:
         """Calculate slugging percentage"""
@@ -162,6 +681,16 @@ class OberlinAtBatSimulator:
                        results.count('HR') * 4)
         return total_bases / at_bats
 
+    def calculate_slg_from_stats(self, stats: Dict, at_bats: int) -> float:
+        """Calculate slugging percentage from a statistics dict"""
+        if at_bats == 0:
+            return 0
+        total_bases = (stats['1B']['count'] +
+                       stats['2B']['count'] * 2 +
+                       stats['3B']['count'] * 3 +
+                       stats['HR']['count'] * 4)
+        return total_bases / at_bats
+
     def print_matchup_info(self, batter: Dict, pitcher: Dict):
         """Print information about the matchup"""
         print("\n" + "=" * 60)
@@ -183,7 +712,7 @@ class OberlinAtBatSimulator:
         print(f"{'Outcome':<15} {'Count':<10} {'Percentage':<10}")
         print("-" * 40)
 
-        for outcome in ['1B', '2B', '3B', 'HR', 'BB', 'K', 'HBP', 'FO']:
+        for outcome in OUTCOMES:
             result = stats[outcome]
             formatted = self.format_result(outcome)
             print(f"{formatted:<15} {result['count']:<10} {result['pct'] * 100:<10.1f}%")
@@ -195,6 +724,16 @@ class OberlinAtBatSimulator:
         print(f"  OBP: {summary['OBP']:.3f}")
         print(f"  SLG: {summary['SLG']:.3f}")
         print(f"  OPS: {summary['OBP'] + summary['SLG']:.3f}")
+        if 'seed' in summary:
+            print(f"  Seed: {summary['seed']}")
+
+    def print_suggestions(self, identifier: str, player_dict: Dict):
+        """Print the closest name matches for an identifier that was not found"""
+        candidates = self.find_player_candidates(identifier, player_dict)
+        if candidates:
+            print("   Did you mean:")
+            for player, score in candidates:
+                print(f"     {player['name']} (#{player.get('jersey', 'N/A')}, {player['player_id']})")
 
     def list_players(self, year: Optional[int] = None):
         """List available players"""
@@ -202,13 +741,13 @@ class OberlinAtBatSimulator:
         print("AVAILABLE OBERLIN PLAYERS")
         print("=" * 60)
 
-        # Filter by year if specified
-        batters = list(self.batters.values())
-        pitchers = list(self.pitchers.values())
-
+        # Filter by year if specified, through the tables' year index
         if year:
-            batters = [b for b in batters if b.get('year') == year]
-            pitchers = [p for p in pitchers if p.get('year') == year]
+            batters = [self.batters.view(row) for row in self.batters.by_year.get(year, [])]
+            pitchers = [self.pitchers.view(row) for row in self.pitchers.by_year.get(year, [])]
+        else:
+            batters = list(self.batters.values())
+            pitchers = list(self.pitchers.values())
 
         # Sort by jersey number
         batters.sort(key=lambda x: int(x.get('jersey', 0)))
@@ -225,8 +764,26 @@ class OberlinAtBatSimulator:
             print(f"  #{p['jersey']:<3} {p['name']:<20} ({p['year']}) - ERA: {p.get('era', 0):.2f}")
 
 
-def main():
-    """Main function to run the simulator"""
+def main(argv: Optional[List[str]] = None):
+    """Main function to run the simulator
+
+    With no arguments this is the interactive menu; `batch` runs a matchup
+    file non-interactively (see batchsim.py and `batch --help`).
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Oberlin Baseball At-Bat Simulator")
+    commands = parser.add_subparsers(dest='command')
+    batch = commands.add_parser('batch', help="Simulate a file of matchups and stream the results")
+    # Imported here because batchsim imports this module
+    import batchsim
+    batchsim.add_batch_arguments(batch)
+    args = parser.parse_args(argv)
+    # Load messages go to stderr, clear of batch output on stdout
+    configure_logging()
+    if args.command == 'batch':
+        return batchsim.run_batch(args)
+
     print("\n" + "=" * 60)
     print("OBERLIN BASEBALL AT-BAT SIMULATOR")
     print("=" * 60)
@@ -249,6 +806,7 @@ def main():
 
             if not batter:
                 print(f"❌ Batter '{batter_id}' not found!")
+                sim.print_suggestions(batter_id, sim.batters)
                 continue
 
             # Get pitcher
@@ -258,6 +816,7 @@ def main():
 
             if not pitcher:
                 print(f"❌ Pitcher '{pitcher_id}' not found!")
+                sim.print_suggestions(pitcher_id, sim.pitchers)
                 continue
 
             # Print matchup info
@@ -292,4 +851,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    raise SystemExit(main())
\ No newline at end of file
@@ -0,0 +1,296 @@
+"""
+batchsim.py - Non-interactive batch mode for the at-bat simulator
+Reads matchups from CSV, JSON or JSON Lines (a file or stdin), simulates them
+in fixed-size blocks across a process pool and streams one row per matchup
+as CSV, JSON Lines or Parquet. Input is read and output written block by
+block, so memory stays flat however many matchups there are.
+
+Each input row needs a batter and a pitcher (player_id, name or jersey, as
+the interactive prompt accepts) and may set n and park_factor. Block k is
+seeded from child k of --seed, so a run is reproducible on any worker count.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+import numpy as np
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
+
+from atbatsimmyYEO import OberlinAtBatSimulator, OUTCOMES, SUMMARY_STATS
+from matchupmodels import DEFAULT_MODEL, MODELS
+
+# Matchups per task; fixed so seeds never depend on the worker count
+BLOCK_SIZE = 2000
+OUTPUT_FIELDS = (['batter_id', 'pitcher_id', 'n', 'park_factor'] + OUTCOMES + SUMMARY_STATS
+                 + ['seed', 'error'])
+
+_worker_sim: Optional[OberlinAtBatSimulator] = None
+
+
+def init_worker(data_dir: str):
+    """Process pool initializer: load the simulator once per worker
+
+    Loading goes through the memory-mapped snapshot, so workers start fast
+    and share the data pages.
+    """
+    global _worker_sim
+    _worker_sim = OberlinAtBatSimulator(data_dir=data_dir)
+
+
+def resolve_id(sim: OberlinAtBatSimulator, identifier: str, players, player_type: str) -> Optional[str]:
+    if identifier in players:
+        return identifier
+    player = sim.find_player(identifier, players, player_type)
+    return player['player_id'] if player else None
+
+
+def simulate_block(block: List[Dict], block_index: int, seed: int, exact: bool,
+                   sim: Optional[OberlinAtBatSimulator] = None, model: Optional[str] = None) -> List[Dict]:
+    """Simulate one block of parsed matchups and return an output row per matchup"""
+    sim = sim or _worker_sim
+    rows, valid = [], []
+    for matchup in block:
+        row = dict.fromkeys(OUTPUT_FIELDS)
+        row.update(n=matchup['n'], park_factor=matchup['park_factor'], seed=None if exact else seed)
+        row['batter_id'] = resolve_id(sim, matchup['batter'], sim.batters, 'batter')
+        row['pitcher_id'] = resolve_id(sim, matchup['pitcher'], sim.pitchers, 'pitcher')
+        if row['batter_id'] is None:
+            row['error'] = f"batter not found: {matchup['batter']}"
+        elif row['pitcher_id'] is None:
+            row['error'] = f"pitcher not found: {matchup['pitcher']}"
+        elif matchup['n'] is None or matchup['n'] < 1:
+            row['error'] = "n must be a positive integer"
+        elif matchup['park_factor'] is None or not 0 < matchup['park_factor'] <= 2:
+            row['error'] = "park_factor must be in (0, 2]"
+        else:
+            valid.append(row)
+        rows.append(row)
+
+    if valid:
+        probabilities = sim.park_adjusted_probabilities(
+            sim.batch_probabilities([r['batter_id'] for r in valid], [r['pitcher_id'] for r in valid], model),
+            np.array([r['park_factor'] for r in valid]))
+        results = sim.simulate_batch(probabilities, [r['n'] for r in valid],
+                                     seed=np.random.SeedSequence(seed, spawn_key=(block_index,)), exact=exact)
+        for row, stats in zip(valid, results):
+            row.update({outcome: stats[outcome]['count'] for outcome in OUTCOMES})
+            row.update({stat: stats['summary'][stat] for stat in ('AVG', 'OBP', 'SLG')})
+            row['OPS'] = row['OBP'] + row['SLG']
+    return rows
+
+
+def parse_matchup(record: Dict, default_n: int, default_park_factor: float) -> Dict:
+    """Normalize one input record; unparseable numbers become None and are reported per row"""
+    def number(key, default, kind):
+        value = record.get(key)
+        if value in (None, ''):
+            return default
+        try:
+            return kind(value)
+        except (TypeError, ValueError):
+            return None
+
+    return {
+        'batter': str(record.get('batter_id') or record.get('batter') or '').strip(),
+        'pitcher': str(record.get('pitcher_id') or record.get('pitcher') or '').strip(),
+        'n': number('n', default_n, int),
+        'park_factor': number('park_factor', default_park_factor, float)
+    }
+
+
+def read_matchups(stream: TextIO, input_format: str) -> Iterator[Dict]:
+    """Yield raw matchup records from CSV, a JSON list or JSON Lines"""
+    if input_format == 'csv':
+        yield from csv.DictReader(stream)
+    elif input_format == 'jsonl':
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+    else:
+        data = json.load(stream)
+        yield from (data['matchups'] if isinstance(data, dict) else data)
+
+
+def detect_format(path: str, fallback: str) -> str:
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    return {'csv': 'csv', 'json': 'json', 'jsonl': 'jsonl', 'ndjson': 'jsonl',
+            'parquet': 'parquet'}.get(extension, fallback)
+
+
+def blocks(matchups: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    block = []
+    for matchup in matchups:
+        block.append(matchup)
+        if len(block) == size:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
+class CSVWriter:
+    def __init__(self, stream: TextIO):
+        self.writer = csv.DictWriter(stream, fieldnames=OUTPUT_FIELDS)
+        self.writer.writeheader()
+
+    def write(self, rows: List[Dict]):
+        self.writer.writerows(rows)
+
+    def close(self):
+        pass
+
+
+class JSONLWriter:
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+
+    def write(self, rows: List[Dict]):
+        self.stream.write(''.join(json.dumps(row) + '\n' for row in rows))
+
+    def close(self):
+        pass
+
+
+class ParquetWriter:
+    """Writes each block as a row group; needs pyarrow"""
+
+    def __init__(self, path: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Parquet output needs pyarrow (pip install pyarrow)")
+        self.pa = pa
+        self.schema = pa.schema(
+            [('batter_id', pa.string()), ('pitcher_id', pa.string()), ('n', pa.int64()),
+             ('park_factor', pa.float64())]
+            + [(outcome, pa.float64()) for outcome in OUTCOMES]
+            + [(stat, pa.float64()) for stat in SUMMARY_STATS]
+            + [('seed', pa.uint64()), ('error', pa.string())])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, rows: List[Dict]):
+        self.writer.write_table(self.pa.Table.from_pylist(rows, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+class Progress:
+    """Throttled progress and throughput report on stderr"""
+
+    def __init__(self, enabled: bool = True, every: float = 1.0):
+        self.enabled = enabled
+        self.every = every
+        self.start = self.last = time.perf_counter()
+        self.matchups = 0
+        self.sims = 0
+        self.errors = 0
+
+    def update(self, rows: List[Dict]):
+        self.matchups += len(rows)
+        self.sims += sum(row['n'] for row in rows if row['error'] is None)
+        self.errors += sum(row['error'] is not None for row in rows)
+        now = time.perf_counter()
+        if self.enabled and now - self.last >= self.every:
+            self.last = now
+            self.report(end='\r')
+
+    def report(self, end: str = '\n'):
+        elapsed = max(time.perf_counter() - self.start, 1e-9)
+        print(f"{self.matchups:,} matchups • {self.sims:,} sims • {self.sims / elapsed:,.0f} sims/sec"
+              f" • {self.matchups / elapsed:,.0f} matchups/sec • {self.errors:,} errors",
+              file=sys.stderr, end=end, flush=True)
+
+
+def run_batch(args) -> int:
+    """Run a batch job from parsed command-line arguments; returns the exit code"""
+    input_format = args.input_format or detect_format(args.input, 'csv')
+    output_format = args.format or detect_format(args.output, 'csv')
+    if output_format == 'parquet' and args.output == '-':
+        raise SystemExit("Parquet output needs a file (-o results.parquet)")
+
+    sim = OberlinAtBatSimulator(data_dir=args.data_dir)
+    seed = sim.resolve_seed(args.seed)
+    print(f"Seed: {seed}", file=sys.stderr)
+
+    try:
+        in_stream = sys.stdin if args.input == '-' else open(args.input, 'r', newline='')
+    except OSError as e:
+        raise SystemExit(f"❌ Cannot read {args.input}: {e.strerror}")
+    if output_format == 'parquet':
+        out_stream, writer = None, ParquetWriter(args.output)
+    else:
+        out_stream = sys.stdout if args.output == '-' else open(args.output, 'w', newline='')
+        writer = CSVWriter(out_stream) if output_format == 'csv' else JSONLWriter(out_stream)
+
+    matchups = (parse_matchup(record, args.n, args.park_factor)
+                for record in read_matchups(in_stream, input_format))
+    progress = Progress(enabled=not args.quiet)
+    pool = ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                               initargs=(args.data_dir,)) if args.workers > 1 else None
+    try:
+        if pool is None:
+            for k, block in enumerate(blocks(matchups, BLOCK_SIZE)):
+                rows = simulate_block(block, k, seed, args.exact, sim=sim, model=args.model)
+                writer.write(rows)
+                progress.update(rows)
+        else:
+            # Keep a bounded window of blocks in flight and write them in input order
+            pending = deque()
+            for k, block in enumerate(blocks(matchups, BLOCK_SIZE)):
+                pending.append(pool.submit(simulate_block, block, k, seed, args.exact, model=args.model))
+                if len(pending) >= args.workers * 2:
+                    rows = pending.popleft().result()
+                    writer.write(rows)
+                    progress.update(rows)
+            while pending:
+                rows = pending.popleft().result()
+                writer.write(rows)
+                progress.update(rows)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        writer.close()
+        if in_stream is not sys.stdin:
+            in_stream.close()
+        if out_stream not in (None, sys.stdout):
+            out_stream.close()
+
+    if not args.quiet:
+        progress.report()
+    return 1 if progress.errors else 0
+
+
+def non_negative_int(value: str) -> int:
+    """argparse type for --seed: SeedSequence rejects negative entropy"""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be non-negative, got {number}")
+    return number
+
+
+def add_batch_arguments(parser):
+    parser.add_argument('input', nargs='?', default='-',
+                        help="Matchup file (.csv, .json or .jsonl), or - for stdin (default)")
+    parser.add_argument('-o', '--output', default='-', help="Output file, or - for stdout (default)")
+    parser.add_argument('-f', '--format', choices=['csv', 'jsonl', 'parquet'],
+                        help="Output format (default: from the output extension, else csv)")
+    parser.add_argument('--input-format', choices=['csv', 'json', 'jsonl'],
+                        help="Input format (default: from the input extension, else csv)")
+    parser.add_argument('-n', type=int, default=1000, help="At-bats per matchup when a row has no n")
+    parser.add_argument('--park-factor', type=float, default=1.0,
+                        help="Park factor when a row has no park_factor")
+    parser.add_argument('--seed', type=non_negative_int, help="Base random seed (default: random, printed to stderr)")
+    parser.add_argument('--exact', action='store_true', help="Analytic expected stats instead of sampling")
+    parser.add_argument('--model', choices=sorted(MODELS), default=DEFAULT_MODEL,
+                        help=f"Matchup model (default: {DEFAULT_MODEL}; see matchupmodels.py)")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: all cores; 1 runs in-process)")
+    parser.add_argument('--data-dir', default='oberlin_baseball_data', help="Player data directory")
+    parser.add_argument('-q', '--quiet', action='store_true', help="No progress output")
@@ -0,0 +1,73 @@
+"""
+bench_parallel.py - Scaling benchmark for the process-pool simulation backend
+Runs the same seeded game and at-bat batches with 1 worker up to every core,
+reports wall time and speedup, and checks every run returns identical results.
+
+Usage: python bench_parallel.py [n_games] [n_at_bats]
+"""
+
+import sys
+import time
+import numpy as np
+
+from gamesim import OberlinGameSimulator, default_lineup, default_staff
+from parallelsim import default_workers, parallel_outcome_counts
+
+SEED = 20250101
+
+
+def time_call(func, *args, **kwargs):
+    """Return (elapsed seconds, result) for one call"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def worker_counts():
+    """1, 2, 4, ... up to and including every core"""
+    counts = []
+    workers = 1
+    while workers < default_workers():
+        counts.append(workers)
+        workers *= 2
+    counts.append(default_workers())
+    return counts
+
+
+def main():
+    n_games = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    n_at_bats = int(sys.argv[2]) if len(sys.argv) > 2 else 10000000
+
+    games = OberlinGameSimulator()
+    lineup = default_lineup(games.simulator, 2025)
+    staff = default_staff(games.simulator, 2025)
+    probabilities = games.simulator.outcome_probabilities(lineup[0], staff[0])
+
+    print("\n" + "=" * 60)
+    print(f"PARALLEL SCALING ({default_workers()} cores)")
+    print("=" * 60)
+    print(f"{'Workers':<10} {'Games (s)':<12} {'Speedup':<10} {'At-bats (s)':<12} {'Speedup':<10}")
+    print("-" * 60)
+
+    baseline = None
+    for workers in worker_counts():
+        game_time, game_result = time_call(games.simulate_runs, lineup, staff, n_games,
+                                           seed=SEED, workers=workers)
+        ab_time, counts = time_call(parallel_outcome_counts, probabilities, n_at_bats,
+                                    seed=SEED, workers=workers)
+        if baseline is None:
+            baseline = (game_time, ab_time, game_result, counts)
+        elif game_result != baseline[2] or not np.array_equal(counts, baseline[3]):
+            print(f"❌ Results with {workers} workers differ from 1 worker!")
+            sys.exit(1)
+
+        print(f"{workers:<10} {game_time:<12.3f} {baseline[0] / game_time:<10.2f} "
+              f"{ab_time:<12.3f} {baseline[1] / ab_time:<10.2f}")
+
+    print("-" * 60)
+    print(f"✅ Identical seeded results for every worker count "
+          f"({n_games} games, {n_at_bats} at-bats)")
+
+
+if __name__ == "__main__":
+    main()
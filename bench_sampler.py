@@ -0,0 +1,62 @@
+"""
+bench_sampler.py - Microbenchmark of alias-table draws against np.random.choice
+Times single at-bat draws the way simulate_at_bat used to make them (string
+labels through the legacy np.random.choice) against the cached alias table,
+then checks the alias draws reproduce the matchup distribution.
+
+Usage: python bench_sampler.py [n_draws]
+"""
+
+import sys
+import time
+import numpy as np
+
+from aliassampler import AliasTable
+from atbatsimmyYEO import OberlinAtBatSimulator, OUTCOMES
+
+
+def time_draws(draw, n):
+    """Return microseconds per call of draw() over n calls"""
+    start = time.perf_counter()
+    for _ in range(n):
+        draw()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    sim = OberlinAtBatSimulator(seed=1)
+    batter = sim.batters['OBR_2025_0_Norman_Dylan']
+    pitcher = next(iter(sim.pitchers.values()))
+    probabilities = sim.outcome_probabilities(batter, pitcher)
+    names = [name for name, _ in sim.get_outcomes(batter, pitcher)]
+    rng = np.random.default_rng(1)
+    table = AliasTable(probabilities)
+
+    results = [
+        ("np.random.choice (labels)", lambda: np.random.choice(names, p=probabilities)),
+        ("Generator.choice", lambda: rng.choice(len(OUTCOMES), p=probabilities)),
+        ("AliasTable.draw", lambda: table.draw(rng)),
+        ("simulate_at_bat", lambda: sim.simulate_at_bat(batter, pitcher)),
+    ]
+
+    print("\n" + "=" * 60)
+    print(f"SINGLE-DRAW MICROBENCHMARK ({n} draws each)")
+    print("=" * 60)
+    print(f"{'Sampler':<30} {'us/draw':<10} {'Speedup':<10}")
+    print("-" * 60)
+    baseline = None
+    for label, draw in results:
+        per_draw = time_draws(draw, n)
+        baseline = baseline or per_draw
+        print(f"{label:<30} {per_draw:<10.2f} {baseline / per_draw:<10.1f}")
+
+    counts = np.bincount(table.draw(rng, size=n * 10), minlength=len(OUTCOMES))
+    error = np.abs(counts / counts.sum() - probabilities).max()
+    print("-" * 60)
+    print(f"Max |alias frequency - p| over {n * 10} vectorized draws: {error:.4f}")
+
+
+if __name__ == "__main__":
+    main()
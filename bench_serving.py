@@ -0,0 +1,194 @@
+"""
+bench_serving.py - Load test for the Dash app under gunicorn
+Starts the app with gunicorn_config.py at each worker count, drives it with
+concurrent clients for a fixed time and reports requests/sec and latency.
+Each request is either the Run Simulation callback (exact mode) through
+/_dash-update-component or a POST to /api/simulate.
+
+Usage: python bench_serving.py [--workers 1,2,4] [--threads 4] [--clients 16]
+                               [--seconds 10] [--url http://host:port]
+With --url an already running server is tested once instead.
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from typing import Dict, List, Optional, Tuple
+
+from parallelsim import default_workers
+
+DATA_DIR = 'oberlin_baseball_data'
+
+
+def player_ids(kind: str) -> List[str]:
+    with open(os.path.join(DATA_DIR, f'{kind}.json')) as f:
+        return [player['player_id'] for player in json.load(f)]
+
+
+def callback_body(dependencies: List[Dict], trigger: str, values: Dict) -> Dict:
+    """Build a /_dash-update-component body for the callback the 'id.property'
+    trigger fires, taking every input and state value from values by id"""
+    component, prop = trigger.rsplit('.', 1)
+    callback = next(d for d in dependencies
+                    if any(i['id'] == component and i['property'] == prop for i in d['inputs']))
+    outputs = [dict(zip(('id', 'property'), output.rsplit('.', 1)))
+               for output in callback['output'].strip('.').split('...')]
+    fill = lambda items: [{'id': item['id'], 'property': item['property'], 'value': values.get(item['id'])}
+                          for item in items]
+    return {
+        'output': callback['output'],
+        'outputs': outputs if callback['output'].startswith('..') else outputs[0],
+        'inputs': fill(callback['inputs']),
+        'state': fill(callback['state']),
+        'changedPropIds': [trigger]
+    }
+
+
+def run_simulation_request(base_url: str) -> Dict:
+    """Build a /_dash-update-component body for the run_simulation callback"""
+    with urllib.request.urlopen(f"{base_url}/_dash-dependencies") as response:
+        dependencies = json.load(response)
+    return callback_body(dependencies, 'run-sim-btn.n_clicks', {'run-sim-btn': 1})
+
+
+def make_requests(base_url: str, n: int) -> List[urllib.request.Request]:
+    """A shuffled mix of callback and API requests over random matchups"""
+    rng = random.Random(0)
+    batters, pitchers = player_ids('batters'), player_ids('pitchers')
+    template = run_simulation_request(base_url)
+    values = {'sim-count': 1000, 'ballpark-select': 'right', 'sim-mode': 'exact', 'model-select': 'log5'}
+    requests = []
+    for k in range(n):
+        batter, pitcher = rng.choice(batters), rng.choice(pitchers)
+        if k % 2 == 0:
+            body = json.loads(json.dumps(template))
+            for state in body['state']:
+                state['value'] = {'batter-select': batter, 'pitcher-select': pitcher}.get(
+                    state['id'], values.get(state['id']))
+            url = f"{base_url}/_dash-update-component"
+        else:
+            body = {'batter_id': batter, 'pitcher_id': pitcher, 'n': 1000, 'seed': k}
+            url = f"{base_url}/api/simulate"
+        requests.append(urllib.request.Request(url, data=json.dumps(body).encode(),
+                                               headers={'Content-Type': 'application/json'}))
+    rng.shuffle(requests)
+    return requests
+
+
+def load(base_url: str, clients: int, seconds: float) -> Dict:
+    """Keep `clients` requests in flight for `seconds` and summarize the latencies"""
+    requests = make_requests(base_url, 512)
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def client(offset: int):
+        k = offset
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(requests[k % len(requests)], timeout=30) as response:
+                    response.read()
+                ok = True
+            except OSError:
+                ok = False
+            with lock:
+                if ok:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors[0] += 1
+            k += clients
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    pick = lambda q: latencies[min(int(len(latencies) * q), len(latencies) - 1)] * 1000 if latencies else 0.0
+    return {'requests': len(latencies), 'errors': errors[0], 'rps': len(latencies) / elapsed,
+            'p50_ms': pick(0.5), 'p95_ms': pick(0.95)}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers: int, threads: int) -> Tuple[subprocess.Popen, str]:
+    """Start gunicorn with gunicorn_config.py and wait until it answers"""
+    port = free_port()
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), YEO_THREADS=str(threads), PORT=str(port))
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', 'yeoAPP:server', '--config', 'gunicorn_config.py',
+                               '--access-logfile', '/dev/null'],
+                              env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(600):
+        if server.poll() is not None:
+            raise SystemExit("❌ gunicorn exited on startup (pip install gunicorn?)")
+        try:
+            urllib.request.urlopen(f"{base_url}/_dash-layout", timeout=1).read()
+            return server, base_url
+        except OSError:
+            time.sleep(0.1)
+    server.terminate()
+    raise SystemExit("❌ gunicorn did not start within 60s")
+
+
+def worker_counts(spec: Optional[str]) -> List[int]:
+    if spec:
+        return [int(w) for w in spec.split(',')]
+    counts, workers = [], 1
+    while workers < default_workers():
+        counts.append(workers)
+        workers *= 2
+    return counts + [default_workers()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Requests/sec of the Dash app as gunicorn workers scale")
+    parser.add_argument('--workers', help="Comma-separated worker counts (default: 1, 2, 4, ... cores)")
+    parser.add_argument('--threads', type=int, default=4, help="gthread threads per worker")
+    parser.add_argument('--clients', type=int, default=16, help="Concurrent client connections")
+    parser.add_argument('--seconds', type=float, default=10, help="Load duration per worker count")
+    parser.add_argument('--url', help="Test a running server instead of starting gunicorn")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print(f"SERVING THROUGHPUT ({args.clients} clients, {args.seconds:g}s per run)")
+    print("=" * 60)
+    print(f"{'Workers':<10} {'Req/s':<10} {'Speedup':<10} {'p50 (ms)':<10} {'p95 (ms)':<10} {'Errors':<8}")
+    print("-" * 60)
+
+    runs = [(None, args.url)] if args.url else [(w, None) for w in worker_counts(args.workers)]
+    baseline = None
+    for workers, url in runs:
+        server = None
+        if url is None:
+            server, url = start_server(workers, args.threads)
+        try:
+            result = load(url, args.clients, args.seconds)
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+        baseline = baseline or result['rps']
+        print(f"{workers or '-':<10} {result['rps']:<10.1f} {result['rps'] / baseline:<10.2f} "
+              f"{result['p50_ms']:<10.1f} {result['p95_ms']:<10.1f} {result['errors']:<8}")
+    print("-" * 60)
+
+
+if __name__ == "__main__":
+    main()
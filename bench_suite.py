@@ -0,0 +1,239 @@
+"""
+bench_suite.py - Latency benchmark suite for the simulator and the Dash app
+Two layers, written to one JSON file so runs can be compared between commits:
+
+  micro   get_outcomes, simulate_at_bat and find_player per call, and
+          simulate_multiple_at_bats for N = 1e2 .. 1e7 (sampled and exact)
+  server  concurrent synthetic users driving yeoAPP.server in-process through
+          /_dash-update-component: pick a season, run an exact simulation,
+          then run a sampled one and poll its job until the result arrives
+
+Each case reports p50/p99 latency and throughput. The file records the git
+commit it was measured at; --compare prints the change against an older file.
+
+Usage: python bench_suite.py [--output FILE] [--compare OLD.json] [--max-n 1e7]
+                             [--users 8] [--seconds 10] [--skip-server]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from atbatsimmyYEO import OberlinAtBatSimulator
+from bench_serving import callback_body, player_ids
+
+SEED = 20250101
+
+
+def git_commit() -> str:
+    """Short hash of HEAD, with -dirty when the tree has uncommitted changes"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'diff', '--quiet', 'HEAD', '--', '*.py']).returncode != 0
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return commit + ('-dirty' if dirty else '')
+
+
+def summarize(latencies: List[float], elapsed: Optional[float] = None, work: int = 1) -> Dict:
+    """p50/p99/mean in ms, plus calls/sec (or work units/sec when work > 1)"""
+    ms = np.array(latencies) * 1000
+    if not len(ms):
+        return {'calls': 0, 'p50_ms': None, 'p99_ms': None, 'mean_ms': None, 'per_sec': 0.0}
+    elapsed = elapsed if elapsed is not None else float(np.sum(latencies))
+    return {'calls': len(ms), 'p50_ms': float(np.percentile(ms, 50)), 'p99_ms': float(np.percentile(ms, 99)),
+            'mean_ms': float(ms.mean()), 'per_sec': len(ms) * work / elapsed}
+
+
+def time_calls(call: Callable, repeats: int, work: int = 1) -> Dict:
+    """Time repeats calls one by one (after one warm-up call)"""
+    call()
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies, work=work)
+
+
+def repeats_for(n: int) -> int:
+    """Enough repeats for a stable p50 without letting 1e7 runs take minutes"""
+    return int(min(200, max(5, 2e7 / n)))
+
+
+def micro_benchmarks(max_n: int) -> Dict[str, Dict]:
+    sim = OberlinAtBatSimulator(seed=SEED)
+    batter = sim.batters['OBR_2025_0_Norman_Dylan']
+    pitcher = next(iter(sim.pitchers.values()))
+    name = str(batter['name'])
+    jersey = str(batter.get('jersey'))
+
+    results = {
+        'get_outcomes': time_calls(lambda: sim.get_outcomes(batter, pitcher), 2000),
+        'simulate_at_bat': time_calls(lambda: sim.simulate_at_bat(batter, pitcher), 2000),
+        'find_player/id': time_calls(lambda: sim.find_player(batter['player_id'], sim.batters, 'batter'), 2000),
+        'find_player/name': time_calls(lambda: sim.find_player(name[:5], sim.batters, 'batter'), 2000),
+        'find_player/jersey': time_calls(lambda: sim.find_player(jersey, sim.batters, 'batter'), 2000),
+        'find_player/fuzzy': time_calls(lambda: sim.find_player(name[::-1], sim.batters, 'batter', fuzzy=True), 500),
+    }
+    n = 100
+    while n <= max_n:
+        results[f'simulate_multiple_at_bats/sampled/{n:.0e}'] = time_calls(
+            lambda: sim.simulate_multiple_at_bats(batter, pitcher, n, seed=SEED), repeats_for(n), work=n)
+        results[f'simulate_multiple_at_bats/exact/{n:.0e}'] = time_calls(
+            lambda: sim.simulate_multiple_at_bats(batter, pitcher, n, exact=True), 200, work=n)
+        n *= 10
+    return results
+
+
+class DashUser:
+    """One synthetic browser session against the in-process Flask server"""
+
+    def __init__(self, server, dependencies: List[Dict], rng: random.Random,
+                 batters: List[str], pitchers: List[str], years: List[int]):
+        self.client = server.test_client()
+        self.dependencies = dependencies
+        self.rng = rng
+        self.batters, self.pitchers, self.years = batters, pitchers, years
+        self.latencies: Dict[str, List[float]] = {'update_player_options': [], 'run_simulation/exact': [],
+                                                  'run_simulation/sampled': [], 'poll_simulation_job': []}
+        self.errors = 0
+
+    def fire(self, name: str, trigger: str, values: Dict) -> Optional[Dict]:
+        body = callback_body(self.dependencies, trigger, values)
+        start = time.perf_counter()
+        response = self.client.post('/_dash-update-component', json=body)
+        elapsed = time.perf_counter() - start
+        if response.status_code == 204:
+            self.latencies[name].append(elapsed)
+            return {}
+        if response.status_code != 200:
+            self.errors += 1
+            return None
+        self.latencies[name].append(elapsed)
+        return response.get_json()['response']
+
+    def session(self, seed: int):
+        """Pick a season, run an exact simulation, then a sampled one to completion"""
+        values = {'year-select': self.rng.choice(self.years), 'run-sim-btn': 1,
+                  'batter-select': self.rng.choice(self.batters), 'pitcher-select': self.rng.choice(self.pitchers),
+                  'sim-count': 1000, 'ballpark-select': 'right', 'sim-seed': seed, 'model-select': 'log5'}
+        self.fire('update_player_options', 'year-select.value', values)
+        self.fire('run_simulation/exact', 'run-sim-btn.n_clicks', dict(values, **{'sim-mode': 'exact'}))
+        response = self.fire('run_simulation/sampled', 'run-sim-btn.n_clicks',
+                             dict(values, **{'sim-mode': 'sampled'}))
+        job = response and response.get('job-store', {}).get('data')
+        while job:
+            time.sleep(0.01)
+            response = self.fire('poll_simulation_job', 'job-interval.n_intervals',
+                                 {'job-interval': 1, 'job-store': job})
+            if response is None:
+                return
+            job = response.get('job-store', {}).get('data', job)
+
+
+def server_benchmark(users: int, seconds: float) -> Dict[str, Dict]:
+    """Run users concurrent DashUser sessions for seconds and summarize each callback"""
+    from yeoAPP import app, season_options
+
+    server = app.server
+    dependencies = server.test_client().get('/_dash-dependencies').get_json()
+    batters, pitchers = player_ids('batters'), player_ids('pitchers')
+    years = [option['value'] for option in season_options() if option['value'] != 'all'] or ['all']
+    sessions = [DashUser(server, dependencies, random.Random(i), batters, pitchers, years) for i in range(users)]
+    deadline = time.perf_counter() + seconds
+
+    def run(user: DashUser, offset: int):
+        k = offset
+        while time.perf_counter() < deadline:
+            user.session(SEED + k)
+            k += users
+
+    threads = [threading.Thread(target=run, args=(user, i)) for i, user in enumerate(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    results = {}
+    for name in sessions[0].latencies:
+        latencies = [t for user in sessions for t in user.latencies[name]]
+        results[f'dash/{name}'] = summarize(latencies, elapsed)
+    everything = [t for user in sessions for times in user.latencies.values() for t in times]
+    results['dash/all'] = dict(summarize(everything, elapsed), errors=sum(user.errors for user in sessions),
+                               users=users)
+    return results
+
+
+def compare(current: Dict, path: str):
+    """Print p50/p99 of every case shared with an older results file"""
+    with open(path) as f:
+        previous = json.load(f)
+    print("\n" + "=" * 78)
+    print(f"COMPARISON {previous.get('commit')} -> {current['commit']} (ratio < 1 is faster)")
+    print("=" * 78)
+    print(f"{'Case':<44} {'p50 (ms)':<10} {'ratio':<8} {'p99 (ms)':<10} {'ratio':<8}")
+    print("-" * 78)
+    for name, result in current['results'].items():
+        old = previous.get('results', {}).get(name)
+        if not old or not old.get('p50_ms') or not result.get('p50_ms'):
+            continue
+        print(f"{name:<44} {result['p50_ms']:<10.3f} {result['p50_ms'] / old['p50_ms']:<8.2f} "
+              f"{result['p99_ms']:<10.3f} {result['p99_ms'] / old['p99_ms']:<8.2f}")
+    print("-" * 78)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency benchmarks for the simulator and the Dash app")
+    parser.add_argument('--output', help="Results file (default: bench-<commit>.json)")
+    parser.add_argument('--compare', help="Earlier results file to compare against")
+    parser.add_argument('--max-n', type=float, default=1e7, help="Largest N for simulate_multiple_at_bats")
+    parser.add_argument('--users', type=int, default=8, help="Concurrent synthetic Dash users")
+    parser.add_argument('--seconds', type=float, default=10, help="Duration of the server benchmark")
+    parser.add_argument('--skip-server', action='store_true', help="Only run the microbenchmarks")
+    args = parser.parse_args()
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'cores': os.cpu_count(),
+        'results': micro_benchmarks(int(args.max_n)),
+    }
+    if not args.skip_server:
+        report['results'].update(server_benchmark(args.users, args.seconds))
+
+    print("\n" + "=" * 78)
+    print(f"BENCHMARK SUITE ({report['commit']})")
+    print("=" * 78)
+    print(f"{'Case':<44} {'p50 (ms)':<10} {'p99 (ms)':<10} {'per sec':<12}")
+    print("-" * 78)
+    for name, result in report['results'].items():
+        if result['calls']:
+            print(f"{name:<44} {result['p50_ms']:<10.3f} {result['p99_ms']:<10.3f} {result['per_sec']:<12.4g}")
+    print("-" * 78)
+
+    output = args.output or f"bench-{report['commit']}.json"
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
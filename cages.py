@@ -0,0 +1,51 @@
+"""
+cages.py - Batting cage park factors
+Each cage scales the probability of each hit type separately; whatever
+probability the hits gain or lose is taken from or given to fielded outs
+(see OberlinAtBatSimulator.park_adjusted_probabilities). Add a cage by adding
+a row here.
+"""
+
+from typing import Dict, List, Union
+
+# Hit outcomes a cage can scale, in the simulator's OUTCOMES order
+HIT_OUTCOMES = ['1B', '2B', '3B', 'HR']
+
+# Per-hit-type multipliers; outcomes left out keep a factor of 1
+CAGES: Dict[str, Dict] = {
+    'left': {
+        'label': '⬅️ Left Cage',
+        'description': 'Pitcher Friendly',
+        'factors': {'1B': 0.95, '2B': 0.95, '3B': 0.95, 'HR': 0.95}
+    },
+    'right': {
+        'label': '➡️ Right Cage',
+        'description': 'Hitter Friendly',
+        'factors': {'1B': 1.05, '2B': 1.05, '3B': 1.05, 'HR': 1.05}
+    },
+}
+DEFAULT_CAGE = 'right'
+
+
+def cage_factors(cage: str) -> Dict[str, float]:
+    """Hit-type factors of a cage; unknown names fall back to the default cage"""
+    return CAGES.get(cage, CAGES[DEFAULT_CAGE])['factors']
+
+
+def hit_factors(park_factor: Union[str, float]) -> List[float]:
+    """Per-hit-type factors, in HIT_OUTCOMES order, of a cage name or a plain park factor"""
+    if isinstance(park_factor, str):
+        factors = cage_factors(park_factor)
+        return [factors.get(outcome, 1.0) for outcome in HIT_OUTCOMES]
+    return [park_factor] * len(HIT_OUTCOMES)
+
+
+def cage_lean(cage: str) -> float:
+    """Mean hit factor of a cage, > 1 for hitter-friendly cages"""
+    factors = cage_factors(cage)
+    return sum(factors.values()) / len(factors) if factors else 1.0
+
+
+def describe_factors(cage: str) -> str:
+    """Short factor listing such as '1B 1.05 · 2B 1.05 · 3B 1.05 · HR 1.05'"""
+    return ' · '.join(f"{outcome} {factor:.2f}" for outcome, factor in cage_factors(cage).items())
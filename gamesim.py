@@ -0,0 +1,255 @@
+"""
+gamesim.py - Oberlin Baseball Game Simulator
+Simulates full games between a nine-man lineup and a pitching staff on top of
+the 8-outcome at-bat model, vectorized across thousands of games at once
+"""
+
+import numpy as np
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from aliassampler import build_alias_arrays, draw_alias
+from atbatsimmyYEO import OberlinAtBatSimulator, OUTCOMES
+from parallelsim import run_chunked
+
+LINEUP_SIZE = 9
+# Games per chunk when a batch is split across worker processes
+GAME_CHUNK_SIZE = 10000
+
+
+def _build_transitions() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Build the base-state transition tables indexed by [bases, outcome]
+
+    Bases are a 3-bit mask (bit 0 = first, bit 1 = second, bit 2 = third).
+    On a hit every runner advances as many bases as the batter, walks and
+    HBP only move forced runners, and outs never advance runners.
+    """
+    next_bases = np.zeros((8, len(OUTCOMES)), dtype=np.int64)
+    runs = np.zeros((8, len(OUTCOMES)), dtype=np.int64)
+    outs = np.zeros(len(OUTCOMES), dtype=np.int64)
+
+    for bases in range(8):
+        for k, outcome in enumerate(OUTCOMES):
+            if outcome in ('1B', '2B', '3B', 'HR'):
+                advance = OUTCOMES.index(outcome) + 1
+                # Batter starts at base 0, runners at bases 1-3
+                positions = [0] + [base + 1 for base in range(3) if bases & (1 << base)]
+                moved = [pos + advance for pos in positions]
+                runs[bases, k] = sum(pos >= 4 for pos in moved)
+                next_bases[bases, k] = sum(1 << (pos - 1) for pos in moved if pos < 4)
+            elif outcome in ('BB', 'HBP'):
+                if not bases & 1:
+                    next_bases[bases, k] = bases | 1
+                elif not bases & 2:
+                    next_bases[bases, k] = bases | 3
+                else:
+                    next_bases[bases, k] = 7
+                    runs[bases, k] = 1 if bases == 7 else 0
+            else:
+                next_bases[bases, k] = bases
+                outs[k] = 1
+
+    return next_bases, runs, outs
+
+
+NEXT_BASES, RUNS_SCORED, OUTS_MADE = _build_transitions()
+
+
+def simulate_innings(lineup_probs: np.ndarray, n_games: int, rng: np.random.Generator,
+                     start_slot: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Simulate consecutive half-innings for many games at once
+
+    lineup_probs has shape (9, innings, 8): the outcome distribution of each
+    lineup slot against the pitcher working that inning. Returns the runs
+    scored per game and inning, shape (n_games, innings), and the lineup slot
+    due up next in each game.
+    """
+    innings = lineup_probs.shape[1]
+    # One alias table per (lineup slot, inning) makes every draw O(1)
+    alias_prob, alias = build_alias_arrays(lineup_probs)
+
+    slot = np.zeros(n_games, dtype=np.int64) if start_slot is None else start_slot.copy()
+    runs = np.zeros((n_games, innings), dtype=np.int64)
+
+    for inning in range(innings):
+        inning_prob = alias_prob[:, inning]
+        inning_alias = alias[:, inning]
+        bases = np.zeros(n_games, dtype=np.int64)
+        outs = np.zeros(n_games, dtype=np.int64)
+        inning_runs = runs[:, inning]
+        active = np.arange(n_games)
+
+        while active.size:
+            batter_slot = slot[active]
+            outcome = draw_alias(inning_prob, inning_alias, batter_slot, rng.random(active.size))
+
+            current = bases[active]
+            inning_runs[active] += RUNS_SCORED[current, outcome]
+            bases[active] = NEXT_BASES[current, outcome]
+            outs[active] += OUTS_MADE[outcome]
+            slot[active] = (batter_slot + 1) % LINEUP_SIZE
+
+            active = active[outs[active] < 3]
+
+    return runs, slot
+
+
+def simulate_game_totals(home_probs: np.ndarray, away_probs: np.ndarray, n_games: int,
+                         rng: np.random.Generator, max_extra_innings: int = 9) -> np.ndarray:
+    """Play head-to-head games and return final runs and tie flags
+
+    Both halves of every inning are played. Games tied after regulation go
+    to extra innings (the last pitcher of each staff stays in) until they
+    are decided or max_extra_innings have been played. Returns an array of
+    shape (4, n_games): home runs, away runs, tied after regulation, and
+    still tied at the end.
+    """
+    home_runs, home_slot = simulate_innings(home_probs, n_games, rng)
+    away_runs, away_slot = simulate_innings(away_probs, n_games, rng)
+    home_total = home_runs.sum(axis=1)
+    away_total = away_runs.sum(axis=1)
+    regulation_tied = home_total == away_total
+
+    extra = 0
+    tied = np.flatnonzero(regulation_tied)
+    while tied.size and extra < max_extra_innings:
+        away_extra, away_slot[tied] = simulate_innings(away_probs[:, -1:], tied.size, rng, away_slot[tied])
+        home_extra, home_slot[tied] = simulate_innings(home_probs[:, -1:], tied.size, rng, home_slot[tied])
+        away_total[tied] += away_extra[:, 0]
+        home_total[tied] += home_extra[:, 0]
+        tied = tied[home_total[tied] == away_total[tied]]
+        extra += 1
+
+    return np.stack([home_total, away_total, regulation_tied, home_total == away_total])
+
+
+def innings_task(n_games: int, seed_seq: np.random.SeedSequence, lineup_probs: np.ndarray) -> np.ndarray:
+    """Worker task: runs per inning for one chunk of games"""
+    runs, _ = simulate_innings(lineup_probs, n_games, np.random.default_rng(seed_seq))
+    return runs
+
+
+def game_task(n_games: int, seed_seq: np.random.SeedSequence, home_probs: np.ndarray,
+              away_probs: np.ndarray, max_extra_innings: int) -> np.ndarray:
+    """Worker task: final scores for one chunk of head-to-head games"""
+    return simulate_game_totals(home_probs, away_probs, n_games, np.random.default_rng(seed_seq),
+                                max_extra_innings)
+
+
+class OberlinGameSimulator:
+    """Full-game simulator built on the at-bat simulator's matchup model"""
+
+    def __init__(self, simulator: Optional[OberlinAtBatSimulator] = None):
+        self.simulator = simulator or OberlinAtBatSimulator()
+
+    def resolve_players(self, players: Sequence[Union[str, Dict]], player_dict: Dict) -> List[Dict]:
+        """Accept player dicts or player IDs and return the player dicts"""
+        return [player_dict[p] if isinstance(p, str) else p for p in players]
+
+    def lineup_probabilities(self, lineup: Sequence[Union[str, Dict]], staff: Sequence[Union[str, Dict]],
+                             innings: int = 9) -> np.ndarray:
+        """Build the (9, innings, 8) matchup tensor for a lineup against a staff
+
+        The staff pitches in order, splitting the innings as evenly as possible.
+        """
+        batters = self.resolve_players(lineup, self.simulator.batters)
+        pitchers = self.resolve_players(staff, self.simulator.pitchers)
+        if len(batters) != LINEUP_SIZE:
+            raise ValueError(f"A lineup needs {LINEUP_SIZE} batters, got {len(batters)}")
+        if not pitchers:
+            raise ValueError("A pitching staff needs at least one pitcher")
+
+        by_pitcher = np.array([[self.simulator.outcome_probabilities(b, p) for p in pitchers]
+                               for b in batters])
+        pitcher_for_inning = [inning * len(pitchers) // innings for inning in range(innings)]
+        return by_pitcher[:, pitcher_for_inning]
+
+    def simulate_runs(self, lineup: Sequence[Union[str, Dict]], staff: Sequence[Union[str, Dict]],
+                      n_games: int = 10000, innings: int = 9, seed: Optional[int] = None,
+                      workers: Optional[int] = None, executor: Optional[Executor] = None) -> Dict:
+        """Simulate one lineup batting against a staff and return run expectancy
+
+        Games run in chunks of GAME_CHUNK_SIZE, optionally across worker
+        processes; a seeded run gives the same result for any worker count.
+        """
+        if n_games < 1:
+            raise ValueError(f"n_games must be at least 1, got {n_games}")
+        seed = self.simulator.resolve_seed(seed)
+        lineup_probs = self.lineup_probabilities(lineup, staff, innings)
+        chunks = run_chunked(innings_task, n_games, lineup_probs, seed=seed, workers=workers,
+                             chunk_size=GAME_CHUNK_SIZE, executor=executor)
+        runs = np.concatenate(chunks) if chunks else np.zeros((0, innings), dtype=np.int64)
+        totals = runs.sum(axis=1)
+
+        return {
+            'runs_per_game': float(totals.mean()),
+            'runs_std': float(totals.std()),
+            'runs_per_inning': runs.mean(axis=0).tolist(),
+            'scoring_inning_pct': float((runs > 0).mean()),
+            'shutout_pct': float((totals == 0).mean()),
+            'run_distribution': np.bincount(totals).tolist(),
+            'total_games': n_games,
+            'seed': seed
+        }
+
+    def simulate_games(self, home_lineup: Sequence[Union[str, Dict]], home_staff: Sequence[Union[str, Dict]],
+                       away_lineup: Sequence[Union[str, Dict]], away_staff: Sequence[Union[str, Dict]],
+                       n_games: int = 10000, innings: int = 9, max_extra_innings: int = 9,
+                       seed: Optional[int] = None, workers: Optional[int] = None,
+                       executor: Optional[Executor] = None) -> Dict:
+        """Simulate head-to-head games and return win probability and run expectancy"""
+        if n_games < 1:
+            raise ValueError(f"n_games must be at least 1, got {n_games}")
+        seed = self.simulator.resolve_seed(seed)
+        home_probs = self.lineup_probabilities(home_lineup, away_staff, innings)
+        away_probs = self.lineup_probabilities(away_lineup, home_staff, innings)
+        chunks = run_chunked(game_task, n_games, home_probs, away_probs, max_extra_innings, seed=seed,
+                             workers=workers, chunk_size=GAME_CHUNK_SIZE, executor=executor)
+        home_total, away_total, regulation_tied, tied = np.concatenate(chunks, axis=1)
+
+        return {
+            'home_win_pct': float((home_total > away_total).mean()),
+            'away_win_pct': float((away_total > home_total).mean()),
+            'tie_pct': float(tied.mean()),
+            'home_runs_per_game': float(home_total.mean()),
+            'away_runs_per_game': float(away_total.mean()),
+            'extra_innings_pct': float(regulation_tied.mean()),
+            'total_games': n_games,
+            'seed': seed
+        }
+
+
+def default_lineup(simulator: OberlinAtBatSimulator, year: int) -> List[Dict]:
+    """Pick the nine batters with the most plate appearances in a season"""
+    batters = [simulator.batters.view(row) for row in simulator.batters.by_year.get(year, [])]
+    return sorted(batters, key=lambda b: b.get('pa', 0), reverse=True)[:LINEUP_SIZE]
+
+
+def default_staff(simulator: OberlinAtBatSimulator, year: int, size: int = 3) -> List[Dict]:
+    """Pick the pitchers with the most batters faced in a season"""
+    pitchers = [simulator.pitchers.view(row) for row in simulator.pitchers.by_year.get(year, [])]
+    return sorted(pitchers, key=lambda p: p.get('bf', 0), reverse=True)[:size]
+
+
+def main():
+    """Simulate a season of games for each roster year against itself"""
+    print("\n" + "=" * 60)
+    print("OBERLIN BASEBALL GAME SIMULATOR")
+    print("=" * 60)
+
+    games = OberlinGameSimulator()
+    for year in (2023, 2024, 2025):
+        lineup = default_lineup(games.simulator, year)
+        staff = default_staff(games.simulator, year)
+        if len(lineup) < LINEUP_SIZE or not staff:
+            continue
+
+        result = games.simulate_runs(lineup, staff, n_games=100000)
+        print(f"\n{year} lineup vs {year} staff ({result['total_games']} games):")
+        print(f"  Runs/Game: {result['runs_per_game']:.2f} (sd {result['runs_std']:.2f})")
+        print(f"  Shutouts: {result['shutout_pct'] * 100:.1f}%")
+        print(f"  Scoring innings: {result['scoring_inning_pct'] * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,35 @@
 # gunicorn_config.py
-import multiprocessing
 import os
 
-# Use only 1 worker for Dash apps to avoid callback issues
-workers = 1  # Don't use multiple workers with Dash!
-worker_class = "sync"  # or "gevent" for async
-worker_connections = 1000
+from metrics import configure_logging
+
+# The app is safe to run in several processes with several threads each: the
+# simulator's arrays are read-only after load, callbacks keep their state in
+# dcc.Store on the client, and a sampled job polled on a worker that never saw
+# it is resubmitted under the same ID and seed. Per-process state is only the
+# result cache and job queue.
+#
+# One worker unless WEB_CONCURRENCY says otherwise: POST /admin/reload reaches
+# only the worker that serves it, so when scaling out also set YEO_WATCH_DATA
+# to have every worker pick up data changes. The count is not taken from the
+# CPU count, which sees every host core inside a container and would start
+# more workers than its memory limit allows.
+workers = int(os.environ.get('WEB_CONCURRENCY', 1))
+threads = int(os.environ.get('YEO_THREADS', 4))
+worker_class = "gthread"
 timeout = 120
 keepalive = 5
 
-# Important for Dash
-preload_app = True  # This can cause issues with Dash, try False if having problems
+# Load the app (and the simulator) once, then fork: workers share the
+# read-only simulator pages copy-on-write instead of loading their own
+preload_app = True
 
 # Binding
 bind = f"0.0.0.0:{os.environ.get('PORT', 8050)}"
 
-# Logging
+# Logging: the app logs key=value records to stderr (level from YEO_LOG_LEVEL),
+# configured here so the preloaded app's startup records are included
+configure_logging()
 accesslog = "-"
 errorlog = "-"
 loglevel = "info"
@@ -0,0 +1,178 @@
+"""
+jobs.py - In-process job queue for long simulations
+Runs submitted functions on a small thread pool so a long simulation never
+holds the request thread. Jobs get an ID the UI can poll, can be cancelled,
+and are capped both in how many run at once and how many may wait. Queue
+depth and wait/run latencies are kept for monitoring.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = 'queued', 'running', 'done', 'failed', 'cancelled'
+
+
+class QueueFull(Exception):
+    """Raised by submit when max_pending jobs are already waiting or running"""
+
+
+class Job:
+    __slots__ = ('job_id', 'future', 'state', 'submitted_at', 'started_at', 'finished_at', 'error')
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.future: Optional[Future] = None
+        self.state = QUEUED
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+
+
+class JobQueue:
+    """Thread-pool job queue with job IDs, cancellation and latency metrics"""
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 32, keep_finished: int = 256,
+                 latency_window: int = 1000):
+        """max_workers caps concurrent jobs, max_pending the jobs queued or
+        running, keep_finished how many finished jobs stay pollable."""
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.keep_finished = keep_finished
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='simjob')
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._wait_times = deque(maxlen=latency_window)
+        self._run_times = deque(maxlen=latency_window)
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.rejected = 0
+
+    def submit(self, fn: Callable, *args, job_id: Optional[str] = None, **kwargs) -> str:
+        """Queue fn(*args, **kwargs) and return its job ID
+
+        Submitting an ID that is already queued, running or finished returns
+        it unchanged, so a client can safely resubmit a job it lost track of.
+        """
+        with self._lock:
+            if job_id is not None and job_id in self._jobs and self._jobs[job_id].state != CANCELLED:
+                return job_id
+            if self._pending() >= self.max_pending:
+                self.rejected += 1
+                raise QueueFull(f"{self.max_pending} simulation jobs already pending")
+            job = Job(job_id or uuid.uuid4().hex)
+            self._jobs[job.job_id] = job
+            self._jobs.move_to_end(job.job_id)
+            self.submitted += 1
+            job.future = self._pool.submit(self._run, job, fn, args, kwargs)
+            self._prune()
+        return job.job_id
+
+    def _run(self, job: Job, fn: Callable, args, kwargs) -> Any:
+        with self._lock:
+            if job.state == CANCELLED:
+                return None
+            job.state = RUNNING
+            job.started_at = time.time()
+            self._wait_times.append(job.started_at - job.submitted_at)
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            with self._lock:
+                job.finished_at = time.time()
+                if job.state != CANCELLED:
+                    job.state = FAILED
+                    job.error = str(e)
+                    self.failed += 1
+            raise
+        with self._lock:
+            job.finished_at = time.time()
+            self._run_times.append(job.finished_at - job.started_at)
+            if job.state != CANCELLED:
+                job.state = DONE
+                self.completed += 1
+        return result
+
+    def _pending(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.state in (QUEUED, RUNNING))
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.state not in (QUEUED, RUNNING)]
+        for job_id in finished[:max(len(finished) - self.keep_finished, 0)]:
+            del self._jobs[job_id]
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        """State of a job, with its result once done; None if the ID is unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            status = {
+                'job_id': job_id,
+                'state': job.state,
+                'submitted_at': job.submitted_at,
+                'started_at': job.started_at,
+                'finished_at': job.finished_at,
+                'error': job.error
+            }
+            if job.state == QUEUED:
+                status['position'] = sum(1 for other in self._jobs.values() if other.state == QUEUED
+                                         and other.submitted_at <= job.submitted_at)
+        if status['state'] == DONE:
+            try:
+                status['result'] = job.future.result()
+            except CancelledError:
+                status['state'] = CANCELLED
+        return status
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job; a running job finishes in the background but its result is dropped"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.state not in (QUEUED, RUNNING):
+                return False
+            job.state = CANCELLED
+            job.finished_at = time.time()
+            self.cancelled += 1
+        job.future.cancel()
+        return True
+
+    def metrics(self) -> Dict:
+        """Queue depth, counters and wait/run latency percentiles in seconds"""
+        with self._lock:
+            states = [job.state for job in self._jobs.values()]
+            wait_times = sorted(self._wait_times)
+            run_times = sorted(self._run_times)
+        return {
+            'max_workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'queued': states.count(QUEUED),
+            'running': states.count(RUNNING),
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'cancelled': self.cancelled,
+            'rejected': self.rejected,
+            'wait_seconds': _percentiles(wait_times),
+            'run_seconds': _percentiles(run_times)
+        }
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def _percentiles(values) -> Dict:
+    """p50/p95/max of an already sorted list"""
+    if not values:
+        return {'p50': None, 'p95': None, 'max': None}
+    return {
+        'p50': values[len(values) // 2],
+        'p95': values[min(int(len(values) * 0.95), len(values) - 1)],
+        'max': values[-1]
+    }
@@ -0,0 +1,101 @@
+"""
+matchupmodels.py - Matchup probability models
+Each model turns batter and pitcher outcome rates into a matchup distribution.
+Kernels work on whole broadcastable (..., 8) rate arrays, so a model costs
+one NumPy pass whether it is applied to one pair or the full matchup matrix.
+
+    average    mean of the batter and pitcher rates (the original model)
+    log5       odds-ratio (log5) of batter and pitcher against the league rates
+    shrinkage  log5 after shrinking each player toward the league rates by
+               sample size, so a 10-PA player counts for less than a 200-PA one
+"""
+
+import numpy as np
+from typing import Callable, Dict, Optional
+
+# Plate appearances of league-average performance added to every player by
+# the shrinkage model
+SHRINKAGE_PRIOR = 50.0
+# Rates are clipped into (EPSILON, 1 - EPSILON) before taking odds
+EPSILON = 1e-6
+
+
+def normalize(probabilities: np.ndarray) -> np.ndarray:
+    """Scale the last axis to sum to 1, leaving all-zero rows alone"""
+    total = probabilities.sum(axis=-1, keepdims=True)
+    return np.divide(probabilities, total, out=probabilities, where=total > 0)
+
+
+def league_rates(batter_rates: np.ndarray, batter_sizes: np.ndarray,
+                 pitcher_rates: np.ndarray, pitcher_sizes: np.ndarray) -> np.ndarray:
+    """League baseline: every batter and pitcher rate weighted by its PA or BF
+
+    Falls back to an unweighted mean when no sample sizes are known.
+    """
+    rates = np.concatenate([batter_rates, pitcher_rates]).reshape(-1, batter_rates.shape[-1])
+    sizes = np.concatenate([batter_sizes, pitcher_sizes]).astype(float)
+    if not len(rates):
+        return np.full(batter_rates.shape[-1], 1.0 / batter_rates.shape[-1])
+    if sizes.sum() <= 0:
+        sizes = np.ones(len(rates))
+    return normalize(sizes @ rates / sizes.sum())
+
+
+def average_kernel(batter_rates: np.ndarray, pitcher_rates: np.ndarray, league: np.ndarray) -> np.ndarray:
+    return normalize((batter_rates + pitcher_rates) / 2)
+
+
+def log5_kernel(batter_rates: np.ndarray, pitcher_rates: np.ndarray, league: np.ndarray) -> np.ndarray:
+    """Per-outcome odds ratio: odds(b) * odds(p) / odds(league), then renormalized"""
+    def odds(p):
+        p = np.clip(p, EPSILON, 1 - EPSILON)
+        return p / (1 - p)
+
+    matchup_odds = odds(batter_rates) * odds(pitcher_rates) / odds(league)
+    return normalize(matchup_odds / (1 + matchup_odds))
+
+
+class MatchupModel:
+    """A kernel plus the optional shrinkage applied to player rates first"""
+    __slots__ = ('name', 'label', 'kernel', 'prior')
+
+    def __init__(self, name: str, label: str, kernel: Callable, prior: float = 0.0):
+        self.name = name
+        self.label = label
+        self.kernel = kernel
+        self.prior = prior
+
+    @property
+    def uses_league(self) -> bool:
+        return self.kernel is not average_kernel or self.prior > 0
+
+    def player_rates(self, rates: np.ndarray, sizes: Optional[np.ndarray], league: np.ndarray) -> np.ndarray:
+        """Rates after shrinking toward the league by sample size (a no-op without a prior)"""
+        if not self.prior or sizes is None:
+            return rates
+        weight = np.asarray(sizes, dtype=float)[..., None]
+        return (weight * rates + self.prior * league) / (weight + self.prior)
+
+    def probabilities(self, batter_rates: np.ndarray, pitcher_rates: np.ndarray, league: np.ndarray,
+                      batter_sizes: Optional[np.ndarray] = None,
+                      pitcher_sizes: Optional[np.ndarray] = None) -> np.ndarray:
+        """Matchup distributions for broadcastable (..., 8) batter and pitcher rates"""
+        batter_rates = self.player_rates(np.asarray(batter_rates, dtype=float), batter_sizes, league)
+        pitcher_rates = self.player_rates(np.asarray(pitcher_rates, dtype=float), pitcher_sizes, league)
+        return self.kernel(batter_rates, pitcher_rates, league)
+
+
+MODELS: Dict[str, MatchupModel] = {
+    'average': MatchupModel('average', 'Average of Rates', average_kernel),
+    'log5': MatchupModel('log5', 'Log5 / Odds Ratio', log5_kernel),
+    'shrinkage': MatchupModel('shrinkage', 'Log5 + Sample-Size Shrinkage', log5_kernel, prior=SHRINKAGE_PRIOR),
+}
+DEFAULT_MODEL = 'average'
+
+
+def get_model(name: Optional[str]) -> MatchupModel:
+    """Look up a model by name; None means the default model"""
+    try:
+        return MODELS[name or DEFAULT_MODEL]
+    except KeyError:
+        raise ValueError(f"Unknown matchup model {name!r}; expected one of {sorted(MODELS)}")
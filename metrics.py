@@ -0,0 +1,226 @@
+"""
+metrics.py - Lightweight latency/throughput metrics with Prometheus export
+Counters and fixed-bucket histograms kept in process memory, plus collectors
+that read existing counters (cache and job queue stats) at scrape time.
+Recording is off until enable() is called (yeoAPP does so when YEO_METRICS
+is set); while off, inc/observe and timed() functions return after one
+attribute check.
+
+Log records go out as key=value (logfmt) lines: log_event() attaches fields
+such as callback, duration_ms and bytes, and configure_logging() installs the
+formatter. Entry points call it; importing a module never does.
+"""
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Latency buckets in seconds, from sub-millisecond lookups to long batch runs
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Response size buckets in bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Sequence[Tuple[str, str]] = ()) -> str:
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """Monotonic count per label set"""
+    kind = 'counter'
+
+    def __init__(self, registry: 'Registry', name: str, documentation: str):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        if not self.registry.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{_format_labels(key)} {_format_value(value)}" for key, value in values]
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count per label set"""
+    kind = 'histogram'
+
+    def __init__(self, registry: 'Registry', name: str, documentation: str,
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (+Inf last), sum]
+        self._values: Dict[LabelKey, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        if not self.registry.enabled:
+            return
+        key = _label_key(labels)
+        slot = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][slot] += 1
+            entry[1] += value
+
+    def count(self, **labels) -> int:
+        entry = self._values.get(_label_key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        lines = []
+        for key, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else _format_value(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(key, [('le', le)])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """The metrics of one process and the collectors read at scrape time"""
+
+    def __init__(self):
+        self.enabled = False
+        self._metrics: List = []
+        # Each collector returns (name, kind, help, [(labels, value), ...]) tuples
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, List[Tuple[Dict, float]]]]]] = []
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        metric = Counter(self, name, documentation)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        metric = Histogram(self, name, documentation, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        for collector in self._collectors:
+            for name, kind, documentation, samples in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.extend(f"{name}{_format_labels(_label_key(labels))} {_format_value(value)}"
+                             for labels, value in samples)
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def enable(on: bool = True):
+    REGISTRY.enabled = on
+
+
+def enabled() -> bool:
+    return REGISTRY.enabled
+
+
+class KeyValueFormatter(logging.Formatter):
+    """One logfmt line per record: time, level, logger, event, then the record's fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        pairs = [('time', self.formatTime(record, '%Y-%m-%dT%H:%M:%S%z')), ('level', record.levelname),
+                 ('logger', record.name), ('event', record.getMessage())]
+        pairs.extend((key, value) for key, value in getattr(record, 'fields', {}).items() if value is not None)
+        line = ' '.join(f"{key}={_logfmt_value(value)}" for key, value in pairs)
+        if record.exc_info:
+            line += '\n' + self.formatException(record.exc_info)
+        return line
+
+
+def _logfmt_value(value) -> str:
+    text = f"{value:.3f}" if isinstance(value, float) else str(value)
+    if not text or any(c in text for c in ' ="\n'):
+        return json.dumps(text, ensure_ascii=False)
+    return text
+
+
+def log_event(logger: logging.Logger, event: str, level: int = logging.INFO, exc_info: bool = False, **fields):
+    """Log event with key=value fields (rendered by KeyValueFormatter)"""
+    if logger.isEnabledFor(level):
+        logger.log(level, event, exc_info=exc_info, extra={'fields': fields})
+
+
+def configure_logging(level=None):
+    """Send log records to stderr as key=value lines, at level or YEO_LOG_LEVEL (default INFO)"""
+    handler = logging.StreamHandler()
+    handler.setFormatter(KeyValueFormatter())
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(level or os.environ.get('YEO_LOG_LEVEL', 'INFO'))
+
+
+def timed(histogram: Histogram, **labels):
+    """Decorator observing each call's wall time in histogram (when enabled)"""
+    def decorate(func: Callable) -> Callable:
+        registry = histogram.registry
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start, **labels)
+        return wrapper
+    return decorate
+
+
+# Shared metrics, so every module records into the same series
+SIMULATOR_SECONDS = REGISTRY.histogram('yeo_simulator_seconds', "Simulator method latency by method")
+SIMULATED_AT_BATS = REGISTRY.counter('yeo_simulated_at_bats_total', "At-bats drawn by sampled simulations")
+CALLBACK_SECONDS = REGISTRY.histogram('yeo_callback_seconds', "Dash callback latency by callback")
+REQUEST_SECONDS = REGISTRY.histogram('yeo_request_seconds', "HTTP request latency by route")
+RESPONSE_BYTES = REGISTRY.histogram('yeo_response_bytes', "HTTP response body size by route", SIZE_BUCKETS)
@@ -0,0 +1,62 @@
+"""
+parallelsim.py - Process-pool backend for large simulation batches
+Splits N trials into fixed-size chunks, gives each chunk its own child of one
+np.random.SeedSequence and runs the chunks across a ProcessPoolExecutor.
+Chunk boundaries and seeds never depend on the worker count, so a seeded run
+returns the same result on 1 core or 64.
+"""
+
+import os
+import numpy as np
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, List, Optional
+
+DEFAULT_CHUNK_SIZE = 100000
+
+
+def chunk_sizes(n: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[int]:
+    """Split n trials into fixed-size chunks (the last one may be short)"""
+    sizes = [chunk_size] * (n // chunk_size)
+    if n % chunk_size:
+        sizes.append(n % chunk_size)
+    return sizes
+
+
+def default_workers() -> int:
+    """Number of worker processes to use when none is given"""
+    return os.cpu_count() or 1
+
+
+def run_chunked(task: Callable, n: int, *args, seed: Optional[int] = None, workers: Optional[int] = None,
+                chunk_size: int = DEFAULT_CHUNK_SIZE, executor: Optional[Executor] = None) -> List:
+    """Run task(chunk_n, seed_sequence, *args) over every chunk of n trials
+
+    The task must be a module-level function so it can be pickled. Pass an
+    existing executor to reuse its workers; otherwise a pool of `workers`
+    processes is created for the call, and workers=None or 1 runs in-process.
+    Results are returned in chunk order.
+    """
+    sizes = chunk_sizes(n, chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    repeated = [[arg] * len(sizes) for arg in args]
+
+    if executor is not None:
+        return list(executor.map(task, sizes, seeds, *repeated))
+    if workers is None or workers <= 1 or len(sizes) <= 1:
+        return [task(size, seq, *args) for size, seq in zip(sizes, seeds)]
+    with ProcessPoolExecutor(max_workers=min(workers, len(sizes))) as pool:
+        return list(pool.map(task, sizes, seeds, *repeated))
+
+
+def outcome_count_task(n: int, seed_seq: np.random.SeedSequence, probabilities: np.ndarray) -> np.ndarray:
+    """Draw the outcome counts of one chunk of at-bats"""
+    return np.random.default_rng(seed_seq).multinomial(n, probabilities)
+
+
+def parallel_outcome_counts(probabilities: np.ndarray, n: int, seed: Optional[int] = None,
+                            workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                            executor: Optional[Executor] = None) -> np.ndarray:
+    """Draw n at-bats chunk by chunk and return the summed outcome counts"""
+    counts = run_chunked(outcome_count_task, n, probabilities, seed=seed, workers=workers,
+                         chunk_size=chunk_size, executor=executor)
+    return np.sum(counts, axis=0) if counts else np.zeros(len(probabilities), dtype=np.int64)
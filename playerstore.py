@@ -0,0 +1,279 @@
+"""
+playerstore.py - Columnar player table
+Stores a roster as one NumPy structured array (a column per stat) plus a
+contiguous (n_players, 8) float array of outcome rates, indexed by player_id,
+year and jersey. PlayerTable and PlayerView behave like the old read-only
+dict-of-dicts, so callers can keep using table[pid]['name'] or
+player.get('avg'), while hot code works on row indices and the rate array.
+"""
+
+import numpy as np
+from collections import Counter
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+# Column kinds; every other value type is stored as its string form
+INT, FLOAT, STR = 'i8', 'f8', 'U'
+
+
+def _column_kind(values: List) -> str:
+    """Pick the narrowest column kind that holds every value of a field"""
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+        return INT
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        return FLOAT
+    return STR
+
+
+class PlayerTable(Mapping):
+    """Read-only columnar roster keyed by player_id"""
+
+    def __init__(self, data: np.ndarray, rates: np.ndarray, rate_keys: Sequence[str]):
+        """data is a structured array with one field per stat plus a boolean
+        '_present' mask, rates the (n_players, len(rate_keys)) rate array."""
+        self.data = data
+        self.rates = rates
+        self.rate_keys = list(rate_keys)
+        self.fields = [name for name in data.dtype.names if name != '_present']
+        self._field_pos = {name: i for i, name in enumerate(self.fields)}
+        # Field views are cached so row lookups skip the dtype machinery
+        self.columns = {name: data[name] for name in self.fields}
+        self.present = data['_present']
+        self.ids = data['player_id'].tolist() if len(data) else []
+        self.index = {pid: row for row, pid in enumerate(self.ids)}
+        self.by_year = self._group_rows('year')
+        self.by_jersey = self._group_rows('jersey')
+        self._build_lookup_indexes()
+
+    @classmethod
+    def from_records(cls, records: Sequence[Dict], rate_keys: Sequence[str],
+                     default_rate: float = 0.125) -> 'PlayerTable':
+        """Build a table from JSON player dicts (missing rates default to default_rate)"""
+        names: List[str] = ['player_id']
+        for record in records:
+            names.extend(key for key in record if key not in names)
+
+        columns = []
+        for name in names:
+            values = [r[name] for r in records if name in r]
+            kind = _column_kind(values)
+            if kind == STR:
+                width = max((len(str(v)) for v in values), default=1)
+                columns.append((name, f'U{max(width, 1)}'))
+            else:
+                columns.append((name, kind))
+        dtype = np.dtype(columns + [('_present', '?', (len(names),))])
+
+        data = np.zeros(len(records), dtype=dtype)
+        for row, record in enumerate(records):
+            present = data['_present'][row]
+            for i, name in enumerate(names):
+                if name in record:
+                    value = record[name]
+                    data[name][row] = str(value) if dtype[name].kind == 'U' else value
+                    present[i] = True
+
+        rates = np.array([[r.get(key, default_rate) for key in rate_keys] for r in records],
+                         dtype=float).reshape(-1, len(rate_keys))
+        return cls(data, rates, rate_keys)
+
+    def _group_rows(self, field: str) -> Dict:
+        groups: Dict = {}
+        if field not in self._field_pos:
+            return groups
+        present = self.present[:, self._field_pos[field]]
+        for row, value in enumerate(self.columns[field].tolist()):
+            if present[row]:
+                groups.setdefault(value, []).append(row)
+        return {value: np.array(rows) for value, rows in groups.items()}
+
+    def _build_lookup_indexes(self):
+        """Build the indexes find_row and fuzzy_rows use, once per table"""
+        self.id_lookup: Dict[str, int] = {}
+        self.jersey_year: Dict[Tuple[str, str], int] = {}
+        self.latest_by_jersey: Dict[str, int] = {}
+        self.folded_names: List[str] = []
+        # Every 1-, 2- and 3-character substring of each name -> rows, so a
+        # partial-name search only touches names sharing its n-grams
+        self.name_grams: Dict[str, Set[int]] = {}
+        self.name_trigrams: List[Set[str]] = []
+        self.trigram_rows: Dict[str, List[int]] = {}
+
+        latest_year: Dict[str, int] = {}
+        for row, pid in enumerate(self.ids):
+            self.id_lookup.setdefault(pid.casefold(), row)
+            jersey = str(self.value(row, 'jersey'))
+            year = self.value(row, 'year')
+            self.jersey_year.setdefault((jersey, str(year)), row)
+            if jersey not in latest_year or (year or 0) > latest_year[jersey]:
+                latest_year[jersey] = year or 0
+                self.latest_by_jersey[jersey] = row
+
+            name = str(self.value(row, 'name', '')).casefold()
+            self.folded_names.append(name)
+            for n in (1, 2, 3):
+                for i in range(len(name) - n + 1):
+                    self.name_grams.setdefault(name[i:i + n], set()).add(row)
+            self.name_trigrams.append(_trigrams(name))
+            for gram in self.name_trigrams[row]:
+                self.trigram_rows.setdefault(gram, []).append(row)
+
+    def find_row(self, identifier: str) -> Optional[int]:
+        """Find a row by player_id, partial name, JERSEY_YEAR or jersey
+
+        Tried in that order; a name or jersey_year match returns the first
+        row, a bare jersey the player's most recent year.
+        """
+        identifier = identifier.strip().casefold()
+
+        # Exact player_id match
+        if identifier in self.id_lookup:
+            return self.id_lookup[identifier]
+
+        # Partial name match
+        rows = self.name_rows(identifier)
+        if rows:
+            return min(rows)
+
+        # Jersey number and year
+        parts = identifier.split('_')
+        if len(parts) == 2 and tuple(parts) in self.jersey_year:
+            return self.jersey_year[tuple(parts)]
+
+        # Jersey number only (most recent year)
+        return self.latest_by_jersey.get(identifier)
+
+    def name_rows(self, fragment: str) -> Set[int]:
+        """Rows whose case-folded name contains fragment"""
+        if not fragment:
+            return set()
+        if len(fragment) <= 3:
+            return set(self.name_grams.get(fragment, ()))
+
+        grams = [fragment[i:i + 3] for i in range(len(fragment) - 2)]
+        candidates = set.intersection(*(self.name_grams.get(g, set()) for g in grams))
+        return {row for row in candidates if fragment in self.folded_names[row]}
+
+    def fuzzy_rows(self, query: str, limit: int = 5, min_score: float = 0.1) -> List[Tuple[int, float]]:
+        """Rank rows by trigram similarity of their name to query, best first"""
+        query_trigrams = _trigrams(query.strip().casefold())
+        shared: Counter = Counter()
+        for gram in query_trigrams:
+            shared.update(self.trigram_rows.get(gram, ()))
+
+        scored = []
+        for row, common in shared.items():
+            score = common / (len(query_trigrams) + len(self.name_trigrams[row]) - common)
+            if score >= min_score:
+                scored.append((row, score))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
+
+    def value(self, row: int, field: str, default=None):
+        """Read one field of one row as a plain Python value"""
+        pos = self._field_pos.get(field)
+        if pos is None or not self.present[row, pos]:
+            return default
+        return self.columns[field][row].item()
+
+    def numeric_column(self, field: str, default: float = 0.0) -> np.ndarray:
+        """One field of every row as floats, with default where it is missing or not numeric"""
+        pos = self._field_pos.get(field)
+        if pos is None or self.columns[field].dtype.kind not in 'if':
+            return np.full(len(self), default)
+        return np.where(self.present[:, pos], self.columns[field], default).astype(float)
+
+    def record(self, row: int) -> Dict:
+        """Rebuild the original player dict for a row"""
+        present = self.present[row]
+        return {name: self.columns[name][row].item() for i, name in enumerate(self.fields) if present[i]}
+
+    def records(self) -> List[Dict]:
+        return [self.record(row) for row in range(len(self))]
+
+    def replace(self, record: Dict) -> 'PlayerTable':
+        """Return a new table with one player added or replaced (row order is kept)"""
+        records = self.records()
+        row = self.index.get(record['player_id'])
+        if row is None:
+            records.append(dict(record))
+        else:
+            records[row] = dict(record)
+        return PlayerTable.from_records(records, self.rate_keys)
+
+    def changed_ids(self, other: 'PlayerTable') -> Set[str]:
+        """player_ids added, removed or edited between this table and other"""
+        changed = set(self.index) ^ set(other.index)
+        for pid in set(self.index) & set(other.index):
+            if self.record(self.index[pid]) != other.record(other.index[pid]):
+                changed.add(pid)
+        return changed
+
+    def view(self, row: int) -> 'PlayerView':
+        return PlayerView(self, row)
+
+    def __getitem__(self, player_id: str) -> 'PlayerView':
+        return PlayerView(self, self.index[player_id])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, player_id) -> bool:
+        return player_id in self.index
+
+
+class PlayerView(Mapping):
+    """Lightweight read-only view of one table row, used like a player dict"""
+    __slots__ = ('table', 'row')
+
+    def __init__(self, table: PlayerTable, row: int):
+        self.table = table
+        self.row = row
+
+    @property
+    def player_id(self) -> str:
+        return self.table.ids[self.row]
+
+    @property
+    def rates(self) -> np.ndarray:
+        """The player's outcome rates in the table's rate_keys order"""
+        return self.table.rates[self.row]
+
+    def __getitem__(self, key: str):
+        value = self.table.value(self.row, key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default=None):
+        return self.table.value(self.row, key, default)
+
+    def __iter__(self) -> Iterator[str]:
+        present = self.table.present[self.row]
+        return (name for i, name in enumerate(self.table.fields) if present[i])
+
+    def __len__(self) -> int:
+        return int(self.table.present[self.row].sum())
+
+    def __repr__(self) -> str:
+        return f"PlayerView({self.get('player_id')!r})"
+
+
+def year_from_player_id(player_id: str) -> Optional[int]:
+    """Read the season out of an OBR_YYYY_JERSEY_NAME player_id"""
+    parts = player_id.split('_')
+    if len(parts) >= 2 and parts[1].isdigit():
+        return int(parts[1])
+    return None
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Trigrams of a space-padded string, used for fuzzy name matching"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+_MISSING = object()
@@ -0,0 +1,178 @@
+"""
+simcache.py - Bounded LRU/TTL cache for simulation results
+Keeps recent results in memory and, optionally, in a local SQLite file so a
+restarted server starts warm. Values must be JSON-serializable. Disk entries
+are tagged with the data version they were computed from, and entries of any
+other version are dropped, so a restart after the player data changed does
+not serve stale results.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class SimulationCache:
+    """Thread-safe LRU cache with per-entry TTL and hit/miss/eviction counters"""
+
+    def __init__(self, maxsize: int = 512, ttl: Optional[float] = 600, path: Optional[str] = None,
+                 disk_maxsize: Optional[int] = None, version: Optional[str] = None):
+        """maxsize bounds the in-memory entries, ttl is in seconds (None for no
+        expiry) and path enables the on-disk store, bounded by disk_maxsize
+        (10 x maxsize by default). version identifies the data results are
+        computed from (e.g. the simulator's data_version)."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path
+        self.disk_maxsize = disk_maxsize or maxsize * 10
+        self.version = version
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.disk_hits = 0
+
+        if self.path:
+            with self._connect() as conn:
+                columns = [row[1] for row in conn.execute("PRAGMA table_info(results)")]
+                if columns and 'version' not in columns:
+                    # Written before entries were versioned, so nothing says what data they came from
+                    conn.execute("DROP TABLE results")
+                conn.execute("CREATE TABLE IF NOT EXISTS results "
+                             "(key TEXT PRIMARY KEY, value TEXT, stored_at REAL, version TEXT)")
+                conn.execute("DELETE FROM results WHERE version IS NOT ?", (self.version,))
+            self._load_recent()
+
+    def _connect(self) -> sqlite3.Connection:
+        # A fresh connection per operation keeps the store safe across threads
+        # and forked workers
+        return sqlite3.connect(self.path, timeout=5)
+
+    def _key(self, key: Hashable) -> str:
+        return json.dumps(key)
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl is not None and now - stored_at > self.ttl
+
+    def _load_recent(self):
+        """Warm the memory tier with the newest unexpired entries on disk"""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT key, value, stored_at FROM results WHERE version IS ? "
+                                "ORDER BY stored_at DESC LIMIT ?", (self.version, self.maxsize)).fetchall()
+        now = time.time()
+        for key, value, stored_at in reversed(rows):
+            if not self._expired(stored_at, now):
+                self._entries[key] = (json.loads(value), stored_at)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None on a miss"""
+        k = self._key(key)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(k)
+            if entry is not None:
+                if not self._expired(entry[1], now):
+                    self._entries.move_to_end(k)
+                    self.hits += 1
+                    return entry[0]
+                del self._entries[k]
+                self.expirations += 1
+
+        if self.path:
+            with self._connect() as conn:
+                row = conn.execute("SELECT value, stored_at FROM results WHERE key = ? AND version IS ?",
+                                   (k, self.version)).fetchone()
+            if row is not None and not self._expired(row[1], now):
+                value = json.loads(row[0])
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                    self._store(k, value, row[1])
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry if full"""
+        k = self._key(key)
+        now = time.time()
+        with self._lock:
+            self._store(k, value, now)
+
+        if self.path:
+            with self._connect() as conn:
+                conn.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                             (k, json.dumps(value), now, self.version))
+                conn.execute("DELETE FROM results WHERE key NOT IN "
+                             "(SELECT key FROM results ORDER BY stored_at DESC LIMIT ?)", (self.disk_maxsize,))
+
+    def _store(self, k: str, value: Any, stored_at: float):
+        self._entries[k] = (value, stored_at)
+        self._entries.move_to_end(k)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, predicate: Callable[[Any], bool]) -> int:
+        """Drop every entry whose key matches predicate; returns how many were dropped
+
+        Keys are passed to predicate as they come back from JSON, so tuples
+        arrive as lists.
+        """
+        with self._lock:
+            doomed = [k for k in self._entries if predicate(json.loads(k))]
+            for k in doomed:
+                del self._entries[k]
+        dropped = len(doomed)
+
+        if self.path:
+            with self._connect() as conn:
+                keys = [k for (k,) in conn.execute("SELECT key FROM results") if predicate(json.loads(k))]
+                conn.executemany("DELETE FROM results WHERE key = ?", [(k,) for k in keys])
+            dropped = max(dropped, len(keys))
+        return dropped
+
+    def set_version(self, version: Optional[str]):
+        """Move to a new data version, carrying over the disk entries of the current one
+
+        Call it after invalidate() has dropped the entries the data change
+        affected, so only results that are still valid carry over. Entries of
+        any other version are dropped.
+        """
+        previous, self.version = self.version, version
+        if self.path:
+            with self._connect() as conn:
+                conn.execute("UPDATE results SET version = ? WHERE version IS ?", (version, previous))
+                conn.execute("DELETE FROM results WHERE version IS NOT ?", (version,))
+
+    def clear(self):
+        """Drop every entry from memory and disk"""
+        with self._lock:
+            self._entries.clear()
+        if self.path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM results")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict:
+        """Counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'disk_hits': self.disk_hits
+        }
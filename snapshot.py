@@ -0,0 +1,149 @@
+"""
+snapshot.py - Compiled player data snapshot for fast simulator startup
+Saves the player tables, rate arrays and matchup matrix as .npy files next to
+the source JSON, and loads them back memory-mapped, so a cold start skips
+JSON parsing and forked workers share the same pages. The snapshot records
+the mtime, size and SHA-256 of each source file and is rebuilt automatically
+when they change.
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+from typing import Dict, Optional, Sequence
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_DIR = '.snapshot'
+SOURCES = ('batters.json', 'pitchers.json')
+ARRAYS = ('batters', 'pitchers', 'batter_rates', 'pitcher_rates', 'matchups')
+
+
+def snapshot_dir(data_dir: str) -> str:
+    return os.path.join(data_dir, SNAPSHOT_DIR)
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_signature(path: str, with_hash: bool = True) -> Dict:
+    """mtime, size and (optionally) SHA-256 of a source file"""
+    stat = os.stat(path)
+    signature = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+    if with_hash:
+        signature['sha256'] = file_hash(path)
+    return signature
+
+
+def source_signatures(data_dir: str) -> Dict[str, Dict]:
+    """Signatures of every source file; take them before reading the sources"""
+    return {name: source_signature(os.path.join(data_dir, name))
+            for name in SOURCES if os.path.exists(os.path.join(data_dir, name))}
+
+
+def data_version(sources: Dict[str, Dict]) -> str:
+    """Short digest of the source hashes, identifying one version of the player data"""
+    digest = hashlib.sha256()
+    for name in sorted(sources):
+        digest.update(f"{name}:{sources[name].get('sha256', '')};".encode())
+    return digest.hexdigest()[:16]
+
+
+def recorded_sources(data_dir: str) -> Dict[str, Dict]:
+    """Source signatures the current snapshot was built from"""
+    meta = _read_meta(data_dir)
+    return meta['sources'] if meta else {}
+
+
+def _read_meta(data_dir: str) -> Optional[Dict]:
+    try:
+        with open(os.path.join(snapshot_dir(data_dir), 'meta.json'), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(data_dir: str, meta: Dict):
+    path = os.path.join(snapshot_dir(data_dir), 'meta.json')
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, path)
+
+
+def is_current(data_dir: str, rate_keys: Sequence[str]) -> bool:
+    """True if the snapshot matches the current source files
+
+    A matching mtime and size is trusted as-is. Otherwise the file is hashed,
+    and an unchanged hash just refreshes the recorded mtime.
+    """
+    meta = _read_meta(data_dir)
+    if not meta or meta.get('version') != SNAPSHOT_VERSION or meta.get('rate_keys') != list(rate_keys):
+        return False
+
+    touched = False
+    for name in SOURCES:
+        recorded = meta['sources'].get(name)
+        path = os.path.join(data_dir, name)
+        if recorded is None or not os.path.exists(path):
+            return False
+        current = source_signature(path, with_hash=False)
+        if current['mtime_ns'] == recorded['mtime_ns'] and current['size'] == recorded['size']:
+            continue
+        if current['size'] != recorded['size'] or file_hash(path) != recorded['sha256']:
+            return False
+        recorded.update(current)
+        touched = True
+
+    if touched:
+        try:
+            _write_meta(data_dir, meta)
+        except OSError:
+            pass
+    return True
+
+
+def load_snapshot(data_dir: str, rate_keys: Sequence[str]) -> Optional[Dict[str, np.ndarray]]:
+    """Load the snapshot arrays memory-mapped (read-only), or None if stale or missing"""
+    if not is_current(data_dir, rate_keys):
+        return None
+    try:
+        return {name: np.load(os.path.join(snapshot_dir(data_dir), f'{name}.npy'), mmap_mode='r')
+                for name in ARRAYS}
+    except (OSError, ValueError):
+        return None
+
+
+def save_snapshot(data_dir: str, rate_keys: Sequence[str], arrays: Dict[str, np.ndarray],
+                  sources: Dict[str, Dict]) -> bool:
+    """Write the snapshot arrays and meta; returns False if the directory is not writable
+
+    sources are the source_signatures taken before the JSON was read, so an
+    edit made while the snapshot was being built still invalidates it.
+
+    Each file is written to a temporary name and renamed into place, and the
+    meta file goes last, so readers never see a half-written snapshot.
+    """
+    directory = snapshot_dir(data_dir)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        for name in ARRAYS:
+            path = os.path.join(directory, f'{name}.npy')
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, 'wb') as f:
+                np.save(f, np.ascontiguousarray(arrays[name]))
+            os.replace(tmp, path)
+
+        _write_meta(data_dir, {
+            'version': SNAPSHOT_VERSION,
+            'rate_keys': list(rate_keys),
+            'sources': sources
+        })
+    except OSError:
+        return False
+    return True
@@ -4,12 +4,43 @@ Beautiful UI matching thaAPP.py styling
 """
 
 import dash
-from dash import dcc, html, Input, Output, State
+from dash import dcc, html, Input, Output, State, ALL, ClientsideFunction
+from flask import Response, g, jsonify, request
+import csv
+import hashlib
+import hmac
+import io
 import json
+import logging
+import os
+import threading
+import time
+from statistics import NormalDist
 import numpy as np
 import plotly.graph_objects as go
 from typing import Dict, List, Tuple, Optional
 
+from atbatsimmyYEO import (OberlinAtBatSimulator as BaseAtBatSimulator, HIT_OUTCOMES, OUTCOMES, STAT_WEIGHTS,
+                           SUMMARY_STATS)
+from simcache import SimulationCache
+from jobs import JobQueue, QueueFull
+from api import create_api
+from cages import CAGES, DEFAULT_CAGE, cage_factors, cage_lean, describe_factors, hit_factors
+from matchupmodels import DEFAULT_MODEL, MODELS
+import metrics
+from metrics import CALLBACK_SECONDS, REQUEST_SECONDS, RESPONSE_BYTES, configure_logging, log_event, timed
+
+if __name__ == '__main__':
+    # Run directly; under gunicorn, gunicorn_config.py configures logging
+    configure_logging()
+logger = logging.getLogger('yeoAPP')
+# One record per callback/API request, with callback, duration_ms and bytes
+request_logger = logging.getLogger('yeoAPP.requests')
+
+# Timings, sizes and counters for /metrics; YEO_METRICS=1 turns recording on
+metrics.enable(bool(os.environ.get('YEO_METRICS')))
+DATA_SECONDS = metrics.REGISTRY.histogram('yeo_data_seconds', "Player data reload and option building latency by step")
+
 # Initialize Dash app with external CSS
 app = dash.Dash(__name__)
 
@@ -153,6 +184,244 @@ app.index_string = '''
                 border-color: #c8322f !important;
                 box-shadow: 0 0 10px rgba(200, 50, 47, 0.5) !important;
             }
+
+            /* Results view: built once in the layout, filled in from results-store */
+            .glass-card {
+                background: rgba(0, 0, 0, 0.7);
+                backdrop-filter: blur(10px);
+                -webkit-backdrop-filter: blur(10px);
+                border-radius: 24px;
+                border: 2px solid #f9c74f;
+                padding: 32px;
+                box-shadow: 0 8px 32px rgba(0, 0, 0, 0.5);
+                transition: all 0.3s ease;
+                animation: fadeInUp 0.8s ease-out both;
+            }
+
+            .player-card {
+                padding: 24px;
+                background: rgba(0,0,0,0.5);
+                border-radius: 16px;
+                border: 1px solid #f9c74f;
+            }
+
+            .player-card-header, .player-card-stat, .summary-stat {
+                text-align: center;
+            }
+
+            .player-card-icon {
+                font-size: 48px;
+                margin-bottom: 16px;
+                color: #f9c74f;
+            }
+
+            .player-card-name {
+                font-size: 24px;
+                font-weight: 700;
+                margin-bottom: 8px;
+                color: #f9c74f;
+            }
+
+            .player-card-meta {
+                font-size: 16px;
+                color: rgba(255, 255, 255, 0.9);
+                margin-bottom: 16px;
+            }
+
+            .player-card-stat {
+                margin-bottom: 12px;
+            }
+
+            .player-card-stat-label {
+                font-size: 12px;
+                color: rgba(255, 255, 255, 0.9);
+                display: block;
+            }
+
+            .player-card-stat-value {
+                font-size: 28px;
+                font-weight: 700;
+                color: #c8322f;
+            }
+
+            .matchup-side {
+                width: 45%;
+                display: inline-block;
+            }
+
+            .matchup-side.pitcher {
+                float: right;
+            }
+
+            .matchup-vs {
+                width: 10%;
+                display: inline-block;
+                text-align: center;
+                vertical-align: middle;
+            }
+
+            .matchup-vs h2 {
+                font-size: 48px;
+                font-weight: 800;
+                color: #c8322f;
+                text-shadow: 2px 2px 4px rgba(0,0,0,0.5);
+            }
+
+            .results-title {
+                font-size: 24px;
+                font-weight: 700;
+                color: #f9c74f;
+                margin-bottom: 16px;
+                text-align: center;
+            }
+
+            .results-info {
+                text-align: center;
+                margin-bottom: 24px;
+                padding: 12px;
+                background-color: rgba(0,0,0,0.3);
+                border-radius: 12px;
+                border: 1px solid #f9c74f;
+            }
+
+            .results-info-icon {
+                font-size: 24px;
+                color: #f9c74f;
+                margin-right: 12px;
+            }
+
+            .results-info.hitter-friendly {
+                border-color: #c8322f;
+            }
+
+            .results-info.hitter-friendly .results-info-icon {
+                color: #c8322f;
+            }
+
+            .results-info-cage {
+                font-size: 18px;
+                font-weight: 600;
+                color: rgba(255, 255, 255, 0.9);
+            }
+
+            .results-info-detail, .results-note {
+                color: rgba(249, 199, 79, 0.8);
+                font-style: italic;
+            }
+
+            .results-info-detail {
+                font-size: 16px;
+            }
+
+            .summary-stats {
+                margin-bottom: 32px;
+            }
+
+            .summary-stat {
+                width: 25%;
+                display: inline-block;
+                padding: 16px;
+                box-sizing: border-box;
+            }
+
+            .summary-stat-label {
+                font-size: 12px;
+                color: rgba(255, 255, 255, 0.9);
+            }
+
+            .summary-stat-value {
+                font-size: 36px;
+                font-weight: 700;
+                color: #f9c74f;
+            }
+
+            .summary-stat-value.OPS {
+                color: #c8322f;
+            }
+
+            .summary-stat-ci {
+                font-size: 11px;
+                color: rgba(249, 199, 79, 0.8);
+            }
+
+            .results-subtitle {
+                font-size: 18px;
+                font-weight: 600;
+                color: #f9c74f;
+                margin-bottom: 16px;
+            }
+
+            .results-note {
+                font-size: 12px;
+                margin-bottom: 16px;
+            }
+
+            .outcome-row {
+                margin-bottom: 12px;
+            }
+
+            .outcome-label {
+                display: inline-block;
+                width: 100px;
+                font-size: 14px;
+                color: rgba(255, 255, 255, 0.9);
+            }
+
+            .outcome-bar {
+                display: inline-block;
+                height: 24px;
+                border-radius: 12px;
+                margin-left: 12px;
+                vertical-align: middle;
+                transition: width 0.3s ease;
+            }
+
+            .outcome-bar.o-1B { background: #f9c74f; }
+            .outcome-bar.o-2B { background: #f77f00; }
+            .outcome-bar.o-3B { background: #ee6c4d; }
+            .outcome-bar.o-HR { background: #c8322f; }
+            .outcome-bar.o-BB { background: #6a994e; }
+            .outcome-bar.o-K { background: #bc4749; }
+            .outcome-bar.o-HBP { background: #577590; }
+            .outcome-bar.o-FO { background: #495057; }
+
+            .outcome-pct {
+                margin-left: 12px;
+                font-size: 14px;
+                font-weight: 600;
+                color: #f9c74f;
+            }
+
+            .progress-status {
+                font-size: 16px;
+                font-weight: 600;
+                color: rgba(255, 255, 255, 0.9);
+                margin-bottom: 12px;
+            }
+
+            .progress-track {
+                height: 12px;
+                background-color: rgba(255,255,255,0.1);
+                border-radius: 8px;
+                margin-bottom: 12px;
+            }
+
+            .progress-fill {
+                height: 100%;
+                background: linear-gradient(135deg, #f9c74f 0%, #d4942a 100%);
+                border-radius: 8px;
+                transition: width 0.2s ease;
+            }
+
+            .progress-ci {
+                font-size: 13px;
+                color: rgba(249, 199, 79, 0.8);
+                font-style: italic;
+            }
+
+            .progress-ci.settled {
+                color: #4ECDC4;
+            }
         </style>
     </head>
     <body>
@@ -186,160 +455,195 @@ COLORS = {
     'error': '#c8322f'
 }
 
-class OberlinAtBatSimulator:
+class OberlinAtBatSimulator(BaseAtBatSimulator):
     """Simulator class adapted from atbatsimmyYEO"""
-    def __init__(self):
-        self.batters = self.load_batters()
-        self.pitchers = self.load_pitchers()
-        print(f"✅ Loaded {len(self.batters)} batters and {len(self.pitchers)} pitchers")
-        # Debug: print sample player IDs to see format
-        if self.batters:
-            sample_id = list(self.batters.keys())[0]
-            print(f"Sample batter ID format: {sample_id}")
-        if self.pitchers:
-            sample_id = list(self.pitchers.keys())[0]
-            print(f"Sample pitcher ID format: {sample_id}")
-
-    def load_batters(self) -> Dict:
-        try:
-            with open('oberlin_baseball_data/batters.json', 'r') as f:
-                batters_list = json.load(f)
-            return {b['player_id']: b for b in batters_list}
-        except FileNotFoundError:
-            return {}
+    def __init__(self, seed: Optional[int] = None, **kwargs):
+        super().__init__(seed, **kwargs)
+        if self.batters and self.pitchers:
+            log_event(logger, 'sample_player_ids', logging.DEBUG,
+                      batter=next(iter(self.batters)), pitcher=next(iter(self.pitchers)))
+
+# Initialize simulator. Its arrays are read-only and every model's matrix is
+# built up front, so preloaded gunicorn workers share them copy-on-write.
+simulator = OberlinAtBatSimulator()
+simulator.warm_model_matrices()
+
+# Cache of simulation results keyed on (batter_id, pitcher_id, n, cage, seed, model).
+# Set YEO_SIM_CACHE_PATH to persist it across restarts; persisted entries are
+# tagged with the player data version and dropped when the data changes.
+simulation_cache = SimulationCache(
+    maxsize=int(os.environ.get('YEO_SIM_CACHE_SIZE', 512)),
+    ttl=float(os.environ.get('YEO_SIM_CACHE_TTL', 600)),
+    path=os.environ.get('YEO_SIM_CACHE_PATH'),
+    version=simulator.data_version
+)
 
-    def load_pitchers(self) -> Dict:
-        try:
-            with open('oberlin_baseball_data/pitchers.json', 'r') as f:
-                pitchers_list = json.load(f)
-            return {p['player_id']: p for p in pitchers_list}
-        except FileNotFoundError:
-            return {}
-
-    def get_outcomes(self, batter: Dict, pitcher: Dict) -> List[Tuple[str, float]]:
-        outcomes = []
-        outcome_types = ['1B%', '2B%', '3B%', 'HR%', 'BB%', 'K%', 'HBP%', 'FO%']
-
-        for outcome in outcome_types:
-            batter_prob = batter.get(outcome, 0.125)
-            pitcher_prob = pitcher.get(outcome, 0.125)
-            avg_prob = (batter_prob + pitcher_prob) / 2
-            outcome_name = outcome.replace('%', '')
-            outcomes.append((outcome_name, avg_prob))
-
-        total = sum(prob for _, prob in outcomes)
-        if total > 0:
-            outcomes = [(name, prob/total) for name, prob in outcomes]
-
-        return outcomes
-
-    def simulate_at_bat(self, batter: Dict, pitcher: Dict) -> str:
-        outcomes = self.get_outcomes(batter, pitcher)
-        outcome_names = [name for name, _ in outcomes]
-        probabilities = [prob for _, prob in outcomes]
-        result = np.random.choice(outcome_names, p=probabilities)
-        return result
-
-    def simulate_multiple_at_bats(self, batter: Dict, pitcher: Dict, n: int = 1000, park_factor: float = 1.0) -> Dict:
-        results = []
-        for _ in range(n):
-            result = self.simulate_at_bat(batter, pitcher)
-            results.append(result)
-
-        stats = {}
-        outcomes = ['1B', '2B', '3B', 'HR', 'BB', 'K', 'HBP', 'FO']
-        for outcome in outcomes:
-            count = results.count(outcome)
-            stats[outcome] = {
-                'count': count,
-                'pct': count / n
-            }
-
-        # Apply park factors to positive offensive outcomes
-        positive_outcomes = ['1B', '2B', '3B', 'HR']
-        if park_factor != 1.0:
-            # Adjust the counts based on park factor
-            for outcome in positive_outcomes:
-                original_count = stats[outcome]['count']
-                adjusted_count = int(original_count * park_factor)
-                diff = adjusted_count - original_count
-
-                # Add or remove hits based on park factor
-                if diff > 0:
-                    # Add more of this outcome (convert some outs)
-                    fo_count = stats['FO']['count']
-                    if fo_count >= diff:
-                        stats[outcome]['count'] += diff
-                        stats['FO']['count'] -= diff
-                elif diff < 0:
-                    # Remove some of this outcome (convert to outs)
-                    stats[outcome]['count'] += diff  # diff is negative
-                    stats['FO']['count'] -= diff  # diff is negative, so this adds
-
-            # Recalculate percentages
-            for outcome in outcomes:
-                stats[outcome]['pct'] = stats[outcome]['count'] / n
-
-        # Calculate adjusted stats
-        hits = sum(stats[x]['count'] for x in ['1B', '2B', '3B', 'HR'])
-        at_bats = n - stats['BB']['count'] - stats['HBP']['count']
-
-        stats['summary'] = {
-            'AVG': hits / at_bats if at_bats > 0 else 0,
-            'OBP': (hits + stats['BB']['count'] + stats['HBP']['count']) / n,
-            'SLG': self.calculate_slg_from_stats(stats, at_bats),
-            'total_sims': n,
-            'park_factor': park_factor
+# Sampled simulations run on this pool instead of the request thread.
+# YEO_JOB_WORKERS caps concurrent jobs, YEO_JOB_QUEUE the jobs waiting or running.
+job_queue = JobQueue(
+    max_workers=int(os.environ.get('YEO_JOB_WORKERS', 2)),
+    max_pending=int(os.environ.get('YEO_JOB_QUEUE', 32))
+)
+JOB_POLL_MS = 500
+# Largest at-bat count the UI accepts (matches the API's MAX_SIMS)
+MAX_SIM_COUNT = 10000000
+
+def simulation_key(job):
+    """The get_simulation cache key of a sampled-simulation job"""
+    return (job['batter_id'], job['pitcher_id'], job['n'], job['cage'], job['seed'], job.get('model', DEFAULT_MODEL))
+
+def submit_simulation_job(job, sim=None):
+    """Queue a sampled simulation and return its job ID
+
+    The ID is derived from the cache key, so identical requests share one job
+    and a poll that lands on a process which never saw the job can resubmit
+    it and get the same result. A job for an unseeded request (job['unseeded'])
+    also caches its result under the seed-less key, so repeated unseeded
+    clicks hit the cache. The job's n is checked again here because a job
+    resubmitted from a poll comes back from the browser's job-store.
+    """
+    n = parse_sim_count(job.get('n'))
+    if n is None or n != job['n']:
+        raise ValueError(f"Invalid simulation count {job.get('n')!r}")
+    job_id = hashlib.sha1(json.dumps(simulation_key(job)).encode()).hexdigest()
+    return job_queue.submit(get_simulation, job['batter_id'], job['pitcher_id'], job['n'],
+                            job['cage'], job['seed'], model=job.get('model', DEFAULT_MODEL), sim=sim or simulator,
+                            unseeded=job.get('unseeded', False), job_id=job_id)
+
+# Progressive mode: the first chunk is small so results show up at once, and
+# each interval tick doubles the chunk size until N is reached or the user stops
+PROGRESSIVE_FIRST_CHUNK = 1000
+PROGRESSIVE_INTERVAL_MS = 250
+# OPS confidence interval half-width at which the running result is called settled
+PROGRESSIVE_TARGET_HALF_WIDTH = 0.005
+
+def get_simulation(batter_id, pitcher_id, n, cage, seed=None, exact=False, model=DEFAULT_MODEL, sim=None,
+                   unseeded=False):
+    """Return cached simulation stats for a matchup, simulating on a miss
+
+    Exact (analytic) results are cheap and skip the cache. The returned dict
+    is shared with the cache and must not be modified. Pass the simulator a
+    callback started with as sim so a reload mid-request cannot mix rosters.
+    With unseeded, a fresh result is also cached under seed None, the key
+    an unseeded request looks up.
+    """
+    sim = sim or simulator
+    if exact:
+        return sim.simulate_multiple_at_bats(sim.batters[batter_id], sim.pitchers[pitcher_id],
+                                             n, exact=True, cage=cage, model=model)
+    key = (batter_id, pitcher_id, n, cage, seed, model)
+    stats = simulation_cache.get(key)
+    if stats is None:
+        stats = sim.simulate_multiple_at_bats(sim.batters[batter_id], sim.pitchers[pitcher_id],
+                                              n, seed=seed, cage=cage, model=model)
+        # A result computed from data that was reloaded meanwhile is not cached
+        if sim is simulator:
+            simulation_cache.set(key, stats)
+            if unseeded:
+                simulation_cache.set((batter_id, pitcher_id, n, cage, None, model), stats)
+    return stats
+
+@timed(DATA_SECONDS, step='build_player_options')
+def build_player_options(players):
+    """Build sorted dropdown options for a player table, keyed by season plus 'all'"""
+    def options_for(pids):
+        options = [{
+            'label': f"⚾ {players[pid]['name']} (#{players[pid].get('jersey', 'N/A')})",
+            'value': pid
+        } for pid in pids]
+        # Sort by name
+        return sorted(options, key=lambda x: x['label'])
+
+    by_year = {year: options_for(players.ids[row] for row in rows) for year, rows in players.by_year.items()}
+    by_year['all'] = options_for(players)
+    return by_year
+
+def refresh_player_options():
+    """Rebuild the precomputed dropdown options; call whenever player data reloads"""
+    global player_options
+    player_options = {
+        'batter': build_player_options(simulator.batters),
+        'pitcher': build_player_options(simulator.pitchers)
+    }
+
+def season_options():
+    """Season dropdown options, newest first"""
+    years = sorted(set(simulator.batters.by_year) | set(simulator.pitchers.by_year), reverse=True)
+    return [{'label': f"{'🏆' if i == 0 else '📅'} {year} Season", 'value': year} for i, year in enumerate(years)]
+
+def latest_season():
+    options = season_options()
+    return options[0]['value'] if options else None
+
+refresh_player_options()
+
+# Guards reloads against each other; callbacks never take it, they just read
+# the current simulator/player_options once and keep using that snapshot
+reload_lock = threading.Lock()
+
+@timed(DATA_SECONDS, step='reload_player_data')
+def reload_player_data():
+    """Re-read the roster JSON and swap in a new simulator without a restart
+
+    The new simulator is built off to the side (a copy of the live one with
+    only the changed players' matrix slices recomputed, see
+    OberlinAtBatSimulator.reload) and published by rebinding the module
+    globals, which is atomic, so in-flight callbacks finish on the data they
+    started with. Only the option buckets, player cards and cached results of
+    players that changed are rebuilt or dropped; the layout is rebuilt so the
+    season dropdown picks up added or removed seasons.
+    """
+    global simulator, player_options, current_layout
+    with reload_lock:
+        old = simulator
+        new = old.reload()
+        new.warm_model_matrices()
+        changed = {
+            'batter': old.batters.changed_ids(new.batters),
+            'pitcher': old.pitchers.changed_ids(new.pitchers)
         }
 
-        return stats
-
-    def calculate_slg_from_stats(self, stats: Dict, at_bats: int) -> float:
-        if at_bats == 0:
-            return 0
-        total_bases = (stats['1B']['count'] +
-                      stats['2B']['count'] * 2 +
-                      stats['3B']['count'] * 3 +
-                      stats['HR']['count'] * 4)
-        return total_bases / at_bats
-
-    def calculate_slg(self, results: List[str], at_bats: int) -> float:
-        if at_bats == 0:
-            return 0
-        total_bases = (results.count('1B') +
-                      results.count('2B') * 2 +
-                      results.count('3B') * 3 +
-                      results.count('HR') * 4)
-        return total_bases / at_bats
-
-    def calculate_slg_from_stats(self, stats: Dict, at_bats: int) -> float:
-        if at_bats == 0:
-            return 0
-        total_bases = (stats['1B']['count'] +
-                      stats['2B']['count'] * 2 +
-                      stats['3B']['count'] * 3 +
-                      stats['HR']['count'] * 4)
-        return total_bases / at_bats
-
-# Initialize simulator
-simulator = OberlinAtBatSimulator()
+        options = {}
+        for player_type, old_players, new_players in (('batter', old.batters, new.batters),
+                                                      ('pitcher', old.pitchers, new.pitchers)):
+            options[player_type] = dict(player_options[player_type])
+            if not changed[player_type]:
+                continue
+            years = {players.value(players.index[pid], 'year')
+                     for players in (old_players, new_players)
+                     for pid in changed[player_type] if pid in players}
+            rebuilt = build_player_options(new_players)
+            for year in years | {'all'}:
+                if year in rebuilt:
+                    options[player_type][year] = rebuilt[year]
+                else:
+                    options[player_type].pop(year, None)
+
+        simulator = new
+        player_options = options
+        # New page loads get the new season list
+        current_layout = build_layout()
+        for key in [key for key in player_cards if key[1] in changed[key[0].lower()]]:
+            player_cards.pop(key, None)
+
+    # Models built on league rates (see matchupmodels.py) shift with any change
+    league_moved = bool(changed['batter'] or changed['pitcher'])
+    dropped = simulation_cache.invalidate(
+        lambda key: key[0] in changed['batter'] or key[1] in changed['pitcher']
+        or (league_moved and key[5] in MODELS and MODELS[key[5]].uses_league))
+    # What survived invalidation is still valid for the new data
+    simulation_cache.set_version(new.data_version)
+    return {
+        'batters': len(new.batters),
+        'pitchers': len(new.pitchers),
+        'changed_batters': sorted(changed['batter']),
+        'changed_pitchers': sorted(changed['pitcher']),
+        'cache_entries_dropped': dropped
+    }
 
-def create_modern_glass_card(content, animation_delay='0s'):
-    """Create a modern glassmorphism card with animations"""
-    return html.Div(
-        content,
-        style={
-            'background': COLORS['surface'],
-            'backdropFilter': 'blur(10px)',
-            'WebkitBackdropFilter': 'blur(10px)',
-            'borderRadius': '24px',
-            'border': f'2px solid {COLORS["oberlin_gold"]}',
-            'padding': '32px',
-            'boxShadow': COLORS['card_shadow'],
-            'transition': 'all 0.3s ease',
-            'animation': f'fadeInUp 0.8s ease-out {animation_delay} both'
-        }
-    )
+def create_modern_glass_card(content, animation_delay='0s', **kwargs):
+    """Create a modern glassmorphism card with animations (styled by .glass-card)"""
+    return html.Div(content, className='glass-card', style={'animationDelay': animation_delay}, **kwargs)
 
 def create_sleek_dropdown(label, dropdown_id, options, placeholder, value=None, animation_delay='0s'):
     """Create a styled dropdown with label"""
@@ -366,274 +670,496 @@ def create_sleek_dropdown(label, dropdown_id, options, placeholder, value=None,
         )
     ], style={'animation': f'fadeInUp 0.6s ease-out {animation_delay} both'})
 
-def create_player_card(player_type, player, color_gradient):
+def create_player_card(player_type, player):
     """Create a player display card"""
     if not player:
         return html.Div()
 
-    # Try to get year from player data or extract from ID
+    # Year is filled in from the player_id at load time when the data lacks it
     year = player.get('year', 'N/A')
-    if year == 'N/A' and 'player_id' in player:
-        # Try to extract from player_id format: OBR_YYYY_...
-        try:
-            parts = player['player_id'].split('_')
-            if len(parts) >= 2 and parts[1].isdigit():
-                year = parts[1]
-        except:
-            pass
+    is_batter = player_type == 'Batter'
 
     return html.Div([
         html.Div([
-            html.I(className=f"fas fa-{'user' if player_type == 'Batter' else 'baseball-ball'}",
-                   style={
-                       'fontSize': '48px',
-                       'marginBottom': '16px',
-                       'color': COLORS['oberlin_gold']
-                   }),
-            html.H3(player['name'], style={
-                'fontSize': '24px',
-                'fontWeight': '700',
-                'marginBottom': '8px',
-                'color': COLORS['oberlin_gold']
-            }),
-            html.P(f"#{player.get('jersey', 'N/A')} • {year}", style={
-                'fontSize': '16px',
-                'color': COLORS['text_light'],
-                'marginBottom': '16px'
-            })
-        ], style={'textAlign': 'center'}),
+            html.I(className=f"fas fa-{'user' if is_batter else 'baseball-ball'} player-card-icon"),
+            html.H3(player['name'], className='player-card-name'),
+            html.P(f"#{player.get('jersey', 'N/A')} • {year}", className='player-card-meta')
+        ], className='player-card-header'),
 
         html.Div([
             html.Div([
-                html.Span("AVG" if player_type == 'Batter' else "ERA", style={
-                    'fontSize': '12px',
-                    'color': COLORS['text_light'],
-                    'display': 'block'
-                }),
-                html.Span(f"{player.get('avg' if player_type == 'Batter' else 'era', 0):.3f}", style={
-                    'fontSize': '28px',
-                    'fontWeight': '700',
-                    'color': COLORS['oberlin_red']
-                })
-            ], style={'textAlign': 'center', 'marginBottom': '12px'}),
+                html.Span("AVG" if is_batter else "ERA", className='player-card-stat-label'),
+                html.Span(f"{player.get('avg' if is_batter else 'era', 0):.3f}", className='player-card-stat-value')
+            ], className='player-card-stat'),
 
             html.Div([
-                html.Span("OPS" if player_type == 'Batter' else "WHIP", style={
-                    'fontSize': '12px',
-                    'color': COLORS['text_light'],
-                    'display': 'block'
-                }),
-                html.Span(f"{player.get('ops' if player_type == 'Batter' else 'whip', 0):.3f}", style={
-                    'fontSize': '28px',
-                    'fontWeight': '700',
-                    'color': COLORS['oberlin_red']
-                })
-            ], style={'textAlign': 'center'})
+                html.Span("OPS" if is_batter else "WHIP", className='player-card-stat-label'),
+                html.Span(f"{player.get('ops' if is_batter else 'whip', 0):.3f}", className='player-card-stat-value')
+            ], className='player-card-stat')
         ])
-    ], style={
-        'padding': '24px',
-        'background': 'rgba(0,0,0,0.5)',
-        'borderRadius': '16px',
-        'border': f'1px solid {COLORS["oberlin_gold"]}'
-    })
+    ], className='player-card')
+
+# Player cards only change when the roster does, so each is built once per
+# (player type, player_id); reload_player_data drops the cards of changed players
+player_cards: Dict[Tuple[str, str], html.Div] = {}
+
+def cached_player_card(player_type, players, player_id):
+    key = (player_type, player_id)
+    card = player_cards.get(key)
+    if card is None:
+        card = player_cards[key] = create_player_card(player_type, players.get(player_id))
+    return card
+
+def format_outcome(outcome):
+    """Format outcome for display"""
+    outcome_map = {
+        '1B': 'Single',
+        '2B': 'Double',
+        '3B': 'Triple',
+        'HR': 'Home Run',
+        'BB': 'Walk',
+        'K': 'Strikeout',
+        'HBP': 'Hit by Pitch',
+        'FO': 'Field Out'
+    }
+    return outcome_map.get(outcome, outcome)
+
+def create_matchup_cards(sim, batter_id, pitcher_id):
+    """The batter-vs-pitcher header of the results view"""
+    return html.Div([
+        html.Div(cached_player_card("Batter", sim.batters, batter_id), className='matchup-side'),
+        html.Div(html.H2("VS"), className='matchup-vs'),
+        html.Div(cached_player_card("Pitcher", sim.pitchers, pitcher_id), className='matchup-side pitcher')
+    ])
+
+def results_config():
+    """Static inputs of the client-side renderer: cages and the stat weights"""
+    return {
+        'cages': {name: {
+            'label': cage['label'],
+            'description': cage['description'],
+            'factors': hit_factors(name),
+            'detail': describe_factors(name),
+            'hitter_friendly': cage_lean(name) > 1
+        } for name, cage in CAGES.items()},
+        'stats': SUMMARY_STATS,
+        'outcomes': OUTCOMES,
+        'weights': STAT_WEIGHTS.tolist(),
+        'hits': [OUTCOMES.index(outcome) for outcome in HIT_OUTCOMES],
+        'fo': OUTCOMES.index('FO')
+    }
+
+def create_results_view():
+    """Static skeleton of the results cards, filled in client-side from results-store
+
+    Callbacks only send the numbers (see results_payload), so the cards and
+    their styles cross the wire once, with the layout.
+    """
+    return html.Div([
+        create_modern_glass_card(html.Div(id='matchup-cards'), animation_delay='0.1s'),
+        create_modern_glass_card([
+            html.H3("Simulation Results", className='results-title'),
+
+            # Cage info with icon
+            html.Div([
+                html.I(className="fas fa-baseball-ball results-info-icon"),
+                html.Span(id='results-cage', className='results-info-cage'),
+                html.Span(id='results-detail', className='results-info-detail')
+            ], id='results-info', className='results-info'),
+
+            # Summary stats
+            html.Div([
+                html.Div([
+                    html.Div(stat, className='summary-stat-label'),
+                    html.Div(id={'type': 'summary-value', 'stat': stat}, className=f'summary-stat-value {stat}'),
+                    html.Div(id={'type': 'summary-ci', 'stat': stat}, className='summary-stat-ci')
+                ], className='summary-stat') for stat in SUMMARY_STATS
+            ], className='summary-stats'),
+
+            # Outcome breakdown
+            html.Div([
+                html.H4("Outcome Breakdown", className='results-subtitle'),
+                html.P(id='results-note', className='results-note'),
+                html.Div([
+                    html.Div([
+                        html.Span(format_outcome(outcome), className='outcome-label'),
+                        html.Div(id={'type': 'outcome-bar', 'outcome': outcome}, className=f'outcome-bar o-{outcome}'),
+                        html.Span(id={'type': 'outcome-pct', 'outcome': outcome}, className='outcome-pct')
+                    ], className='outcome-row') for outcome in OUTCOMES
+                ])
+            ])
+        ], animation_delay='0.2s')
+    ], id='results-view', hidden=True)
 
 # App layout
-app.layout = html.Div([
-    # CSS and Font Awesome
-    html.Link(rel='stylesheet', href='https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css'),
-    html.Link(rel='stylesheet', href='https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;800&display=swap'),
+def build_layout():
+    """The page layout; the season dropdown lists the seasons loaded when it is built"""
+    return html.Div([
+        # CSS and Font Awesome
+        html.Link(rel='stylesheet', href='https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css'),
+        html.Link(rel='stylesheet', href='https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;800&display=swap'),
 
 
 
-    # Main container
-    html.Div([
-        # Header with OCHSTEIN branding
+        # Main container
         html.Div([
-            # Logo and title section
+            # Header with OCHSTEIN branding
             html.Div([
+                # Logo and title section
                 html.Div([
-                    html.I(className="fas fa-baseball-ball", style={
-                        'fontSize': '80px',
-                        'color': COLORS['oberlin_gold'],
-                        'marginBottom': '20px',
-                        'animation': 'pulse 2s infinite'
-                    }),
-                    html.H1("OCHSTEIN", style={
-                        'fontSize': '72px',
-                        'fontWeight': '900',
-                        'color': COLORS['oberlin_gold'],
-                        'letterSpacing': '4px',
-                        'marginBottom': '8px',
-                        'textShadow': '3px 3px 6px rgba(0,0,0,0.7)'
-                    }),
-                    html.H2("OBERLIN CAGE HIERARCHAL SIMULATOR", style={
-                        'fontSize': '24px',
-                        'fontWeight': '700',
-                        'color': COLORS['oberlin_red'],
-                        'letterSpacing': '2px',
-                        'marginBottom': '4px'
-                    }),
-                    html.H3("TO EVALUATE INDOOR NUMERICAL-METRICS", style={
-                        'fontSize': '18px',
-                        'fontWeight': '500',
-                        'color': COLORS['text_secondary'],
-                        'letterSpacing': '1px'
+                    html.Div([
+                        html.I(className="fas fa-baseball-ball", style={
+                            'fontSize': '80px',
+                            'color': COLORS['oberlin_gold'],
+                            'marginBottom': '20px',
+                            'animation': 'pulse 2s infinite'
+                        }),
+                        html.H1("OCHSTEIN", style={
+                            'fontSize': '72px',
+                            'fontWeight': '900',
+                            'color': COLORS['oberlin_gold'],
+                            'letterSpacing': '4px',
+                            'marginBottom': '8px',
+                            'textShadow': '3px 3px 6px rgba(0,0,0,0.7)'
+                        }),
+                        html.H2("OBERLIN CAGE HIERARCHAL SIMULATOR", style={
+                            'fontSize': '24px',
+                            'fontWeight': '700',
+                            'color': COLORS['oberlin_red'],
+                            'letterSpacing': '2px',
+                            'marginBottom': '4px'
+                        }),
+                        html.H3("TO EVALUATE INDOOR NUMERICAL-METRICS", style={
+                            'fontSize': '18px',
+                            'fontWeight': '500',
+                            'color': COLORS['text_secondary'],
+                            'letterSpacing': '1px'
+                        })
+                    ], style={
+                        'textAlign': 'center',
+                        'padding': '40px',
+                        'background': COLORS['gradient_dark'],
+                        'borderRadius': '24px',
+                        'border': f'3px solid {COLORS["oberlin_gold"]}',
+                        'marginBottom': '40px',
+                        'animation': 'fadeInUp 0.8s ease-out'
                     })
-                ], style={
+                ]),
+
+                html.P("Simulate matchups between any Oberlin batter and pitcher", style={
+                    'fontSize': '20px',
+                    'color': COLORS['text_light'],
                     'textAlign': 'center',
-                    'padding': '40px',
-                    'background': COLORS['gradient_dark'],
-                    'borderRadius': '24px',
-                    'border': f'3px solid {COLORS["oberlin_gold"]}',
-                    'marginBottom': '40px',
-                    'animation': 'fadeInUp 0.8s ease-out'
+                    'marginBottom': '48px',
+                    'animation': 'fadeInUp 0.8s ease-out 0.2s both'
                 })
             ]),
 
-            html.P("Simulate matchups between any Oberlin batter and pitcher", style={
-                'fontSize': '20px',
-                'color': COLORS['text_light'],
-                'textAlign': 'center',
-                'marginBottom': '48px',
-                'animation': 'fadeInUp 0.8s ease-out 0.2s both'
-            })
-        ]),
-
-        # Configuration card
-        create_modern_glass_card([
-            html.H3("⚾ Configure Matchup", style={
-                'fontFamily': 'Inter, sans-serif',
-                'fontWeight': '700',
-                'color': COLORS['oberlin_gold'],
-                'marginBottom': '32px',
-                'fontSize': '28px',
-                'textAlign': 'center'
-            }),
+            # Configuration card
+            create_modern_glass_card([
+                html.H3("⚾ Configure Matchup", style={
+                    'fontFamily': 'Inter, sans-serif',
+                    'fontWeight': '700',
+                    'color': COLORS['oberlin_gold'],
+                    'marginBottom': '32px',
+                    'fontSize': '28px',
+                    'textAlign': 'center'
+                }),
 
-            # Configuration grid
-            html.Div([
-                # Left column - Year and simulations
+                # Configuration grid
                 html.Div([
-                    create_sleek_dropdown(
-                        "Season",
-                        'year-select',
-                        [
-                            {'label': '🏆 2025 Season', 'value': 2025},
-                            {'label': '📅 2024 Season', 'value': 2024},
-                            {'label': '📅 2023 Season', 'value': 2023}
-                        ],
-                        "Select season...",
-                        value=2025,
-                        animation_delay='0.1s'
-                    ),
+                    # Left column - Year and simulations
+                    html.Div([
+                        create_sleek_dropdown(
+                            "Season",
+                            'year-select',
+                            season_options(),
+                            "Select season...",
+                            value=latest_season(),
+                            animation_delay='0.1s'
+                        ),
 
+                        html.Div([
+                            html.Label("Number of Simulations", style={
+                                'fontWeight': '700',
+                                'color': COLORS['oberlin_gold'],
+                                'fontSize': '14px',
+                                'marginBottom': '8px',
+                                'display': 'block',
+                                'textTransform': 'uppercase',
+                                'letterSpacing': '0.05em'
+                            }),
+                            dcc.Input(
+                                id='sim-count',
+                                type='number',
+                                value=1000,
+                                min=100,
+                                max=MAX_SIM_COUNT,
+                                step=100,
+                                style={
+                                    'width': '100%',
+                                    'padding': '12px',
+                                    'borderRadius': '12px',
+                                    'border': f'2px solid {COLORS["oberlin_gold"]}',
+                                    'backgroundColor': 'white',
+                                    'color': '#333',
+                                    'fontSize': '16px'
+                                }
+                            )
+                        ], style={'animation': 'fadeInUp 0.6s ease-out 0.2s both'}),
+
+                        html.Div([
+                            html.Label("Random Seed (Optional)", style={
+                                'fontWeight': '700',
+                                'color': COLORS['oberlin_gold'],
+                                'fontSize': '14px',
+                                'marginBottom': '8px',
+                                'marginTop': '20px',
+                                'display': 'block',
+                                'textTransform': 'uppercase',
+                                'letterSpacing': '0.05em'
+                            }),
+                            dcc.Input(
+                                id='sim-seed',
+                                type='number',
+                                placeholder='Random',
+                                min=0,
+                                step=1,
+                                style={
+                                    'width': '100%',
+                                    'padding': '12px',
+                                    'borderRadius': '12px',
+                                    'border': f'2px solid {COLORS["oberlin_gold"]}',
+                                    'backgroundColor': 'white',
+                                    'color': '#333',
+                                    'fontSize': '16px'
+                                }
+                            )
+                        ], style={'animation': 'fadeInUp 0.6s ease-out 0.25s both'})
+                    ], style={'width': '48%', 'display': 'inline-block', 'verticalAlign': 'top'}),
+
+                    # Right column - Player selections
                     html.Div([
-                        html.Label("Number of Simulations", style={
-                            'fontWeight': '700',
-                            'color': COLORS['oberlin_gold'],
-                            'fontSize': '14px',
-                            'marginBottom': '8px',
-                            'display': 'block',
-                            'textTransform': 'uppercase',
-                            'letterSpacing': '0.05em'
-                        }),
-                        dcc.Input(
-                            id='sim-count',
-                            type='number',
-                            value=1000,
-                            min=100,
-                            max=10000,
-                            step=100,
-                            style={
-                                'width': '100%',
-                                'padding': '12px',
-                                'borderRadius': '12px',
-                                'border': f'2px solid {COLORS["oberlin_gold"]}',
-                                'backgroundColor': 'white',
-                                'color': '#333',
-                                'fontSize': '16px'
-                            }
+                        create_sleek_dropdown(
+                            "Select Batter",
+                            'batter-select',
+                            [],
+                            "Choose a batter...",
+                            animation_delay='0.3s'
+                        ),
+
+                        create_sleek_dropdown(
+                            "Select Pitcher",
+                            'pitcher-select',
+                            [],
+                            "Choose a pitcher...",
+                            animation_delay='0.4s'
+                        ),
+
+                        create_sleek_dropdown(
+                            "Select Batting Cage",
+                            'ballpark-select',
+                            [
+                                {'label': f"{cage['label']} ({cage['description']} - {describe_factors(name)})", 'value': name}
+                                for name, cage in CAGES.items()
+                            ],
+                            "Choose a cage...",
+                            value=DEFAULT_CAGE,
+                            animation_delay='0.5s'
+                        ),
+
+                        create_sleek_dropdown(
+                            "Simulation Mode",
+                            'sim-mode',
+                            [
+                                {'label': '⚡ Exact (Instant Expected Stats)', 'value': 'exact'},
+                                {'label': '🎲 Sampled (Show Sample Noise)', 'value': 'sampled'},
+                                {'label': '📈 Progressive (Live Running Results)', 'value': 'progressive'}
+                            ],
+                            "Choose a mode...",
+                            value='exact',
+                            animation_delay='0.55s'
+                        ),
+
+                        create_sleek_dropdown(
+                            "Matchup Model",
+                            'model-select',
+                            [{'label': model.label, 'value': name} for name, model in MODELS.items()],
+                            "Choose a model...",
+                            value=DEFAULT_MODEL,
+                            animation_delay='0.6s'
                         )
-                    ], style={'animation': 'fadeInUp 0.6s ease-out 0.2s both'})
-                ], style={'width': '48%', 'display': 'inline-block', 'verticalAlign': 'top'}),
+                    ], style={'width': '48%', 'display': 'inline-block', 'float': 'right'})
+                ]),
 
-                # Right column - Player selections
+                # Run button
                 html.Div([
-                    create_sleek_dropdown(
-                        "Select Batter",
-                        'batter-select',
-                        [],
-                        "Choose a batter...",
-                        animation_delay='0.3s'
-                    ),
-
-                    create_sleek_dropdown(
-                        "Select Pitcher",
-                        'pitcher-select',
-                        [],
-                        "Choose a pitcher...",
-                        animation_delay='0.4s'
-                    ),
-
-                    create_sleek_dropdown(
-                        "Select Batting Cage",
-                        'ballpark-select',
-                        [
-                            {'label': '⬅️ Left Cage (Pitcher Friendly - Park Factor: 0.95)', 'value': 'left'},
-                            {'label': '➡️ Right Cage (Hitter Friendly - Park Factor: 1.05)', 'value': 'right'}
-                        ],
-                        "Choose a cage...",
-                        value='right',
-                        animation_delay='0.5s'
+                    html.Button([
+                        html.I(className="fas fa-play", style={
+                            'marginRight': '12px',
+                            'animation': 'pulse 2s infinite'
+                        }),
+                        "Run Simulation"
+                    ], id='run-sim-btn',
+                        className='gradient-button',
+                        style={
+                            'background': COLORS['gradient_primary'],
+                            'color': 'white',
+                            'border': 'none',
+                            'padding': '18px 48px',
+                            'fontSize': '18px',
+                            'fontWeight': '700',
+                            'borderRadius': '50px',
+                            'cursor': 'pointer',
+                            'boxShadow': '0 10px 30px rgba(200, 50, 47, 0.5)',
+                            'transition': 'all 0.3s ease',
+                            'fontFamily': 'Inter, sans-serif',
+                            'display': 'block',
+                            'margin': '48px auto 0',
+                            'animation': 'slideInUp 0.8s ease-out 0.6s both',
+                            'position': 'relative',
+                            'overflow': 'hidden'
+                        }
                     )
-                ], style={'width': '48%', 'display': 'inline-block', 'float': 'right'})
+                ])
             ]),
 
-            # Run button
+            # Stop button for progressive runs, shown only while one is running
             html.Div([
                 html.Button([
-                    html.I(className="fas fa-play", style={
-                        'marginRight': '12px',
-                        'animation': 'pulse 2s infinite'
-                    }),
-                    "Run Simulation"
-                ], id='run-sim-btn',
-                    className='gradient-button',
+                    html.I(className="fas fa-stop", style={'marginRight': '10px'}),
+                    "Stop Simulation"
+                ], id='stop-sim-btn',
+                    hidden=True,
                     style={
-                        'background': COLORS['gradient_primary'],
-                        'color': 'white',
-                        'border': 'none',
-                        'padding': '18px 48px',
-                        'fontSize': '18px',
+                        'background': 'transparent',
+                        'color': COLORS['oberlin_gold'],
+                        'border': f'2px solid {COLORS["oberlin_gold"]}',
+                        'padding': '10px 32px',
+                        'fontSize': '14px',
                         'fontWeight': '700',
                         'borderRadius': '50px',
                         'cursor': 'pointer',
-                        'boxShadow': '0 10px 30px rgba(200, 50, 47, 0.5)',
-                        'transition': 'all 0.3s ease',
                         'fontFamily': 'Inter, sans-serif',
-                        'display': 'block',
-                        'margin': '48px auto 0',
-                        'animation': 'slideInUp 0.8s ease-out 0.6s both',
-                        'position': 'relative',
-                        'overflow': 'hidden'
+                        'margin': '24px auto 0'
                     }
                 )
-            ])
-        ]),
+            ], style={'textAlign': 'center'}),
+
+            # Status cards (progress, queued job, errors) and the results view
+            html.Div(id='results-container', style={'marginTop': '40px'}),
+            create_results_view(),
+            dcc.Store(id='results-store', data=None),
+            dcc.Store(id='results-config', data=results_config()),
+            dcc.Store(id='matchup-store', data=None),
+
+            # All-pairs matchup matrix for the selected season and cage
+            create_modern_glass_card([
+                html.H3("📊 Matchup Matrix", style={
+                    'fontSize': '24px',
+                    'fontWeight': '700',
+                    'color': COLORS['oberlin_gold'],
+                    'marginBottom': '8px',
+                    'textAlign': 'center'
+                }),
+                html.P("Every batter against every pitcher in the selected season and cage", style={
+                    'fontSize': '14px',
+                    'color': COLORS['text_secondary'],
+                    'textAlign': 'center',
+                    'marginBottom': '24px'
+                }),
+                html.Div([
+                    html.Div([
+                        create_sleek_dropdown(
+                            "Heatmap Stat",
+                            'matrix-stat',
+                            [{'label': stat, 'value': stat} for stat in SUMMARY_STATS],
+                            "Choose a stat...",
+                            value='OPS'
+                        )
+                    ], style={'width': '48%', 'display': 'inline-block'}),
+                    html.Div([
+                        create_sleek_dropdown(
+                            "Values",
+                            'matrix-source',
+                            [
+                                {'label': '⚡ Expected', 'value': 'expected'},
+                                {'label': '🎲 Simulated (uses Number of Simulations and Seed)', 'value': 'simulated'}
+                            ],
+                            "Choose values...",
+                            value='expected'
+                        )
+                    ], style={'width': '48%', 'display': 'inline-block', 'float': 'right'})
+                ]),
+                html.Div([
+                    html.Button([
+                        html.I(className="fas fa-th", style={'marginRight': '10px'}),
+                        "Build Matrix"
+                    ], id='matrix-btn',
+                        className='gradient-button',
+                        style={
+                            'background': COLORS['gradient_primary'],
+                            'color': 'white',
+                            'border': 'none',
+                            'padding': '12px 32px',
+                            'fontSize': '16px',
+                            'fontWeight': '700',
+                            'borderRadius': '50px',
+                            'cursor': 'pointer',
+                            'fontFamily': 'Inter, sans-serif',
+                            'marginRight': '16px'
+                        }
+                    ),
+                    html.Button([
+                        html.I(className="fas fa-download", style={'marginRight': '10px'}),
+                        "Export CSV"
+                    ], id='matrix-download-btn',
+                        style={
+                            'background': 'transparent',
+                            'color': COLORS['oberlin_gold'],
+                            'border': f'2px solid {COLORS["oberlin_gold"]}',
+                            'padding': '10px 32px',
+                            'fontSize': '16px',
+                            'fontWeight': '700',
+                            'borderRadius': '50px',
+                            'cursor': 'pointer',
+                            'fontFamily': 'Inter, sans-serif'
+                        }
+                    )
+                ], style={'textAlign': 'center', 'marginBottom': '24px'}),
+                dcc.Graph(id='matrix-heatmap', figure=go.Figure(), config={'displaylogo': False},
+                          style={'display': 'none'}),
+                dcc.Download(id='matrix-download'),
+                dcc.Store(id='matrix-store', data=None)
+            ], animation_delay='0.7s'),
+
+            # Queued sampled-simulation job, polled until it finishes
+            dcc.Store(id='job-store', data=None),
+            dcc.Interval(id='job-interval', interval=JOB_POLL_MS, disabled=True),
+
+            # Progressive run state, advanced one chunk per interval tick
+            dcc.Store(id='progress-store', data=None),
+            dcc.Interval(id='progress-interval', interval=PROGRESSIVE_INTERVAL_MS, disabled=True),
+
+            # Hidden store for player data
+            dcc.Store(id='player-store', data={})
+
+        ], style={
+            'minHeight': '100vh',
+            'padding': '40px',
+            'background': f'linear-gradient(180deg, {COLORS["background"]} 0%, #2d1414 50%, {COLORS["background"]} 100%)',
+            'position': 'relative'
+        })
+    ])
 
-        # Results container
-        html.Div(id='results-container', style={'marginTop': '40px'}),
+# Built once and served to every page load; reload_player_data rebuilds it
+# so added or removed seasons reach the season dropdown
+current_layout = build_layout()
 
-        # Hidden store for player data
-        dcc.Store(id='player-store', data={})
+def serve_layout():
+    return current_layout
 
-    ], style={
-        'minHeight': '100vh',
-        'padding': '40px',
-        'background': f'linear-gradient(180deg, {COLORS["background"]} 0%, #2d1414 50%, {COLORS["background"]} 100%)',
-        'position': 'relative'
-    })
-])
+app.layout = serve_layout
 
 # Callbacks
 @app.callback(
@@ -641,314 +1167,572 @@ app.layout = html.Div([
      Output('pitcher-select', 'options')],
     Input('year-select', 'value')
 )
+@timed(CALLBACK_SECONDS, callback='update_player_options')
 def update_player_options(year):
     """Update player dropdowns based on selected year"""
     if not year:
         return [], []
 
-    # Filter players by year - with fallback for missing year field
-    batter_options = []
-    pitcher_options = []
-
-    for pid, batter in simulator.batters.items():
-        # Check if player matches year or if year field is missing (include all)
-        player_year = batter.get('year', None)
-        if player_year == year or player_year is None:
-            # Extract year from player_id if possible
-            if player_year is None and '_' in pid:
-                try:
-                    # Format: OBR_YYYY_JERSEY_NAME
-                    parts = pid.split('_')
-                    if len(parts) >= 2 and parts[1].isdigit():
-                        id_year = int(parts[1])
-                        if id_year == year:
-                            batter_options.append({
-                                'label': f"⚾ {batter['name']} (#{batter.get('jersey', 'N/A')})",
-                                'value': pid
-                            })
-                except:
-                    pass
-            else:
-                batter_options.append({
-                    'label': f"⚾ {batter['name']} (#{batter.get('jersey', 'N/A')})",
-                    'value': pid
-                })
-
-    for pid, pitcher in simulator.pitchers.items():
-        # Check if player matches year or if year field is missing (include all)
-        player_year = pitcher.get('year', None)
-        if player_year == year or player_year is None:
-            # Extract year from player_id if possible
-            if player_year is None and '_' in pid:
-                try:
-                    # Format: OBR_YYYY_JERSEY_NAME
-                    parts = pid.split('_')
-                    if len(parts) >= 2 and parts[1].isdigit():
-                        id_year = int(parts[1])
-                        if id_year == year:
-                            pitcher_options.append({
-                                'label': f"⚾ {pitcher['name']} (#{pitcher.get('jersey', 'N/A')})",
-                                'value': pid
-                            })
-                except:
-                    pass
-            else:
-                pitcher_options.append({
-                    'label': f"⚾ {pitcher['name']} (#{pitcher.get('jersey', 'N/A')})",
-                    'value': pid
-                })
+    # Options are precomputed per season; fall back to everyone if a season is empty
+    options = player_options
+    batter_options = options['batter'].get(year) or options['batter']['all']
+    pitcher_options = options['pitcher'].get(year) or options['pitcher']['all']
+    return batter_options, pitcher_options
 
-    # Sort by name
-    batter_options.sort(key=lambda x: x['label'])
-    pitcher_options.sort(key=lambda x: x['label'])
-
-    # If no players found for the year, show all players
-    if not batter_options:
-        print(f"No batters found for year {year}, showing all batters")
-        for pid, batter in simulator.batters.items():
-            batter_options.append({
-                'label': f"⚾ {batter['name']} (#{batter.get('jersey', 'N/A')})",
-                'value': pid
-            })
-        batter_options.sort(key=lambda x: x['label'])
-
-    if not pitcher_options:
-        print(f"No pitchers found for year {year}, showing all pitchers")
-        for pid, pitcher in simulator.pitchers.items():
-            pitcher_options.append({
-                'label': f"⚾ {pitcher['name']} (#{pitcher.get('jersey', 'N/A')})",
-                'value': pid
+def create_error_card(title, message):
+    """Centered error card shown in place of results"""
+    return create_modern_glass_card([
+        html.Div([
+            html.I(className="fas fa-exclamation-circle", style={
+                'fontSize': '64px',
+                'color': COLORS['oberlin_red'],
+                'marginBottom': '24px'
+            }),
+            html.H3(title, style={
+                'color': COLORS['oberlin_gold'],
+                'marginBottom': '16px'
+            }),
+            html.P(message, style={
+                'color': COLORS['text_light']
             })
-        pitcher_options.sort(key=lambda x: x['label'])
+        ], style={'textAlign': 'center'})
+    ])
 
-    return batter_options, pitcher_options
+def parse_sim_count(value):
+    """The sim-count input as an int in 1..MAX_SIM_COUNT, or None if it is empty or invalid"""
+    if isinstance(value, bool):
+        return None
+    try:
+        n = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not 1 <= n <= MAX_SIM_COUNT or n != int(n):
+        return None
+    return int(n)
 
 @app.callback(
-    Output('results-container', 'children'),
+    [Output('results-container', 'children'),
+     Output('results-store', 'data'),
+     Output('matchup-cards', 'children'),
+     Output('matchup-store', 'data'),
+     Output('progress-store', 'data'),
+     Output('progress-interval', 'disabled'),
+     Output('job-store', 'data'),
+     Output('job-interval', 'disabled'),
+     Output('stop-sim-btn', 'hidden')],
     [Input('run-sim-btn', 'n_clicks')],
     [State('batter-select', 'value'),
      State('pitcher-select', 'value'),
      State('sim-count', 'value'),
-     State('ballpark-select', 'value')],
+     State('ballpark-select', 'value'),
+     State('sim-seed', 'value'),
+     State('sim-mode', 'value'),
+     State('model-select', 'value'),
+     State('matchup-store', 'data')],
     prevent_initial_call=True
 )
-def run_simulation(n_clicks, batter_id, pitcher_id, sim_count, ballpark):
-    """Run simulation and display results"""
+@timed(CALLBACK_SECONDS, callback='run_simulation')
+def run_simulation(n_clicks, batter_id, pitcher_id, sim_count, ballpark, seed=None, mode='exact',
+                   model=DEFAULT_MODEL, shown_matchup=None):
+    """Run simulation and display results
+
+    Only the numbers are sent (results-store); the player cards are resent
+    only when the matchup differs from the one already shown.
+    """
     if not batter_id or not pitcher_id:
-        return create_modern_glass_card([
-            html.Div([
-                html.I(className="fas fa-exclamation-circle", style={
-                    'fontSize': '64px',
-                    'color': COLORS['oberlin_red'],
-                    'marginBottom': '24px'
-                }),
-                html.H3("Missing Selection", style={
-                    'color': COLORS['oberlin_gold'],
-                    'marginBottom': '16px'
-                }),
-                html.P("Please select both a batter and pitcher", style={
-                    'color': COLORS['text_light']
-                })
-            ], style={'textAlign': 'center'})
-        ])
-
-    # Get player data
-    batter = simulator.batters.get(batter_id)
-    pitcher = simulator.pitchers.get(pitcher_id)
+        return (create_error_card("Missing Selection", "Please select both a batter and pitcher"),
+                None, dash.no_update, dash.no_update, None, True, None, True, True)
+
+    # Validated once here, before the exact, sampled and progressive paths split
+    n = parse_sim_count(sim_count)
+    if n is None:
+        return (create_error_card("Invalid Simulation Count",
+                                  f"Enter a whole number of at-bats between 1 and {MAX_SIM_COUNT:,}"),
+                None, dash.no_update, dash.no_update, None, True, None, True, True)
+    sim_count = n
+
+    # Get player data from one simulator for the whole callback, even if a reload swaps it
+    sim = simulator
+    batter = sim.batters.get(batter_id)
+    pitcher = sim.pitchers.get(pitcher_id)
 
     if not batter or not pitcher:
-        return html.Div("Error: Player not found")
-
-    # Add player_id to the player dicts if not present
-    if 'player_id' not in batter:
-        batter['player_id'] = batter_id
-    if 'player_id' not in pitcher:
-        pitcher['player_id'] = pitcher_id
-
-    # Determine park factor
-    park_factor = 1.05 if ballpark == 'right' else 0.95
-
-    # Run simulation with park factor
-    stats = simulator.simulate_multiple_at_bats(batter, pitcher, sim_count, park_factor)
-
-    # Create results display
-    return html.Div([
-        # Matchup header
-        create_modern_glass_card([
-            html.Div([
-                # Batter card
-                html.Div([
-                    create_player_card("Batter", batter, COLORS['gradient_primary'])
-                ], style={'width': '45%', 'display': 'inline-block'}),
+        return html.Div("Error: Player not found"), None, dash.no_update, dash.no_update, None, True, None, True, True
+
+    matchup = {'batter_id': batter_id, 'pitcher_id': pitcher_id}
+    if matchup == shown_matchup:
+        cards, matchup = dash.no_update, dash.no_update
+    else:
+        cards = create_matchup_cards(sim, batter_id, pitcher_id)
+
+    # Cage park factors are folded into the distribution before sampling
+    cage = ballpark if ballpark in CAGES else DEFAULT_CAGE
+    model = model if model in MODELS else DEFAULT_MODEL
+
+    if mode == 'progressive':
+        progress, results, state = start_progressive_simulation(sim, batter, pitcher, sim_count, cage, seed, model)
+        return progress, results, cards, matchup, state, state is None, None, True, state is None
+
+    if mode == 'sampled':
+        # Sampled runs go through the job queue unless the result is cached,
+        # so a long simulation never holds this request thread. The lookup
+        # uses the requested seed, so unseeded clicks share the seed-less
+        # entry; a seed is only drawn on a miss.
+        job = {'batter_id': batter_id, 'pitcher_id': pitcher_id, 'n': sim_count,
+               'cage': cage, 'seed': seed, 'model': model}
+        stats = simulation_cache.get(simulation_key(job))
+        if stats is None:
+            job.update(seed=sim.resolve_seed(seed), unseeded=seed is None)
+            try:
+                job['job_id'] = submit_simulation_job(job, sim)
+            except QueueFull:
+                return create_busy_card(), None, cards, matchup, None, True, None, True, True
+            return (create_job_card(job_queue.status(job['job_id'])), None, cards, matchup,
+                    None, True, job, False, False)
+        return None, results_payload(stats), cards, matchup, None, True, None, True, True
+
+    stats = get_simulation(batter_id, pitcher_id, sim_count, cage, exact=True, model=model, sim=sim)
+    return None, results_payload(stats), cards, matchup, None, True, None, True, True
+
+def results_payload(stats):
+    """What the results view needs, as stored in results-store and rendered client-side
+
+    The distribution the stats came from (expected or observed frequencies)
+    is sent instead of the stats, so assets/results.js can re-apply a
+    different cage's park factors without a round trip.
+    """
+    summary = stats['summary']
+    confidence = summary.get('confidence')
+    return {
+        'pct': [stats[outcome]['pct'] for outcome in OUTCOMES],
+        'n': summary['total_sims'],
+        'cage': summary.get('cage', DEFAULT_CAGE),
+        'model': MODELS[summary.get('model', DEFAULT_MODEL)].label,
+        'seed': summary.get('seed'),
+        'confidence': confidence,
+        'z': NormalDist().inv_cdf(0.5 + confidence / 2) if confidence else None
+    }
 
-                # VS text
-                html.Div([
-                    html.H2("VS", style={
-                        'fontSize': '48px',
-                        'fontWeight': '800',
-                        'color': COLORS['oberlin_red'],
-                        'textShadow': '2px 2px 4px rgba(0,0,0,0.5)'
-                    })
-                ], style={'width': '10%', 'display': 'inline-block', 'textAlign': 'center', 'verticalAlign': 'middle'}),
+# Fills the static results view from results-store, and re-renders it for a
+# new cage, without a server round trip (see assets/results.js)
+app.clientside_callback(
+    ClientsideFunction(namespace='results', function_name='render'),
+    [Output('results-view', 'hidden'),
+     Output('results-cage', 'children'),
+     Output('results-detail', 'children'),
+     Output('results-info', 'className'),
+     Output('results-note', 'children'),
+     Output({'type': 'summary-value', 'stat': ALL}, 'children'),
+     Output({'type': 'summary-ci', 'stat': ALL}, 'children'),
+     Output({'type': 'outcome-bar', 'outcome': ALL}, 'style'),
+     Output({'type': 'outcome-pct', 'outcome': ALL}, 'children')],
+    [Input('results-store', 'data'),
+     Input('ballpark-select', 'value')],
+    State('results-config', 'data')
+)
 
-                # Pitcher card
-                html.Div([
-                    create_player_card("Pitcher", pitcher, COLORS['gradient_accent'])
-                ], style={'width': '45%', 'display': 'inline-block', 'float': 'right'})
-            ])
-        ], animation_delay='0.1s'),
+def progressive_chunk(state):
+    """Draw the next chunk of a progressive run
+
+    Chunk k is drawn from child k of the run's SeedSequence, so a tick needs
+    nothing but the stored state and any worker can serve it.
+    """
+    k = state['chunk']
+    size = min(PROGRESSIVE_FIRST_CHUNK << k, state['n'] - state['done'])
+    rng = np.random.default_rng(np.random.SeedSequence(state['seed'], spawn_key=(k,)))
+    counts = rng.multinomial(size, state['probabilities'])
+    return dict(state,
+                chunk=k + 1,
+                done=state['done'] + size,
+                counts=(np.asarray(state['counts']) + counts).tolist())
+
+def render_progressive(state, status):
+    """Progress card and results payload for the at-bats simulated so far"""
+    stats = simulator.stats_from_counts(np.asarray(state['counts']), state['done'], confidence=0.95)
+    stats['summary']['cage'] = state['cage']
+    stats['summary']['seed'] = state['seed']
+    stats['summary']['model'] = state.get('model', DEFAULT_MODEL)
+    low, high = stats['summary']['ci']['OPS']
+    half_width = (high - low) / 2
+    settled = half_width <= PROGRESSIVE_TARGET_HALF_WIDTH
+
+    progress = create_modern_glass_card([
+        html.Div(f"{status} • {state['done']:,} of {state['n']:,} at-bats", className='progress-status'),
+        html.Div(html.Div(className='progress-fill', style={'width': f"{100 * state['done'] / state['n']:.1f}%"}),
+                 className='progress-track'),
+        html.Div(f"OPS ±{half_width:.4f}" + (" • ✓ CI tight enough to stop" if settled else ""),
+                 className='progress-ci settled' if settled else 'progress-ci')
+    ])
+    return progress, results_payload(stats)
+
+def start_progressive_simulation(sim, batter, pitcher, n, cage, seed=None, model=DEFAULT_MODEL):
+    """Run the first chunk of a progressive simulation
+
+    n is a count already checked with parse_sim_count. Returns the progress
+    card, the results payload and the state to store, which is None if the
+    first chunk already covered all n at-bats.
+    """
+    state = {
+        'batter_id': batter['player_id'],
+        'pitcher_id': pitcher['player_id'],
+        'n': n,
+        'cage': cage,
+        'model': model,
+        'seed': sim.resolve_seed(seed),
+        # The distribution is stored so a reload mid-run cannot change it
+        'probabilities': sim.cage_probabilities(batter, pitcher, cage, model).tolist(),
+        'chunk': 0,
+        'done': 0,
+        'counts': [0] * len(OUTCOMES)
+    }
+    state = progressive_chunk(state)
+    finished = state['done'] >= state['n']
+    status = "✅ Complete" if finished else "⏳ Running"
+    return render_progressive(state, status) + (None if finished else state,)
 
-        # Results stats
-        create_modern_glass_card([
-            html.H3("Simulation Results", style={
-                'fontSize': '24px',
-                'fontWeight': '700',
+@app.callback(
+    [Output('results-container', 'children', allow_duplicate=True),
+     Output('results-store', 'data', allow_duplicate=True),
+     Output('progress-store', 'data', allow_duplicate=True),
+     Output('progress-interval', 'disabled', allow_duplicate=True),
+     Output('stop-sim-btn', 'hidden', allow_duplicate=True)],
+    [Input('progress-interval', 'n_intervals'),
+     Input('stop-sim-btn', 'n_clicks')],
+    State('progress-store', 'data'),
+    prevent_initial_call=True
+)
+@timed(CALLBACK_SECONDS, callback='advance_progressive_simulation')
+def advance_progressive_simulation(n_intervals, stop_clicks, state):
+    """Add one chunk to a progressive run, or stop it where it is"""
+    if not state or state['done'] >= state['n']:
+        return dash.no_update, dash.no_update, dash.no_update, True, True
+
+    if dash.ctx.triggered_id == 'stop-sim-btn':
+        return render_progressive(state, "⏹️ Stopped") + (None, True, True)
+
+    state = progressive_chunk(state)
+    finished = state['done'] >= state['n']
+    status = "✅ Complete" if finished else "⏳ Running"
+    return render_progressive(state, status) + (state, finished, finished)
+
+def create_job_card(status):
+    """Placeholder shown while a sampled simulation waits in the job queue or runs"""
+    if status['state'] == 'queued':
+        message = f"⏳ Queued • position {status.get('position', 1)}"
+    else:
+        message = "⚙️ Simulating..."
+    return create_modern_glass_card([
+        html.Div([
+            html.I(className="fas fa-spinner fa-spin", style={
+                'fontSize': '36px',
                 'color': COLORS['oberlin_gold'],
-                'marginBottom': '16px',
-                'textAlign': 'center'
+                'marginBottom': '16px'
             }),
+            html.Div(message, style={
+                'fontSize': '18px',
+                'fontWeight': '600',
+                'color': COLORS['text_light']
+            })
+        ], style={'textAlign': 'center'})
+    ])
 
-            # Cage info with icon
-            html.Div([
-                html.I(className="fas fa-baseball-ball", style={
-                    'fontSize': '24px',
-                    'color': COLORS['oberlin_red'] if stats['summary'].get('park_factor', 1.0) > 1 else COLORS['oberlin_gold'],
-                    'marginRight': '12px'
-                }),
-                html.Span(f"{'➡️ Right Cage (Hitter Friendly)' if stats['summary'].get('park_factor', 1.0) > 1 else '⬅️ Left Cage (Pitcher Friendly)'}", style={
-                    'fontSize': '18px',
-                    'fontWeight': '600',
-                    'color': COLORS['text_light']
-                }),
-                html.Span(f" • Park Factor: {stats['summary'].get('park_factor', 1.0):.2f}", style={
-                    'fontSize': '16px',
-                    'color': COLORS['text_secondary'],
-                    'fontStyle': 'italic'
-                })
-            ], style={
-                'textAlign': 'center',
-                'marginBottom': '24px',
-                'padding': '12px',
-                'backgroundColor': 'rgba(0,0,0,0.3)',
-                'borderRadius': '12px',
-                'border': f'1px solid {"#c8322f" if stats["summary"].get("park_factor", 1.0) > 1 else "#f9c74f"}'
+def create_busy_card():
+    return create_modern_glass_card([
+        html.Div([
+            html.H3("Simulator Busy", style={
+                'color': COLORS['oberlin_gold'],
+                'marginBottom': '16px'
             }),
+            html.P("Too many simulations are running right now. Please try again in a moment.", style={
+                'color': COLORS['text_light']
+            })
+        ], style={'textAlign': 'center'})
+    ])
 
-            # Summary stats
-            html.Div([
-                html.Div([
-                    html.Div([
-                        html.Div("AVG", style={'fontSize': '12px', 'color': COLORS['text_light']}),
-                        html.Div(f"{stats['summary']['AVG']:.3f}", style={
-                            'fontSize': '36px', 'fontWeight': '700', 'color': COLORS['oberlin_gold']
-                        })
-                    ], style={'textAlign': 'center', 'padding': '16px'})
-                ], style={'width': '25%', 'display': 'inline-block'}),
-
-                html.Div([
-                    html.Div([
-                        html.Div("OBP", style={'fontSize': '12px', 'color': COLORS['text_light']}),
-                        html.Div(f"{stats['summary']['OBP']:.3f}", style={
-                            'fontSize': '36px', 'fontWeight': '700', 'color': COLORS['oberlin_gold']
-                        })
-                    ], style={'textAlign': 'center', 'padding': '16px'})
-                ], style={'width': '25%', 'display': 'inline-block'}),
-
-                html.Div([
-                    html.Div([
-                        html.Div("SLG", style={'fontSize': '12px', 'color': COLORS['text_light']}),
-                        html.Div(f"{stats['summary']['SLG']:.3f}", style={
-                            'fontSize': '36px', 'fontWeight': '700', 'color': COLORS['oberlin_gold']
-                        })
-                    ], style={'textAlign': 'center', 'padding': '16px'})
-                ], style={'width': '25%', 'display': 'inline-block'}),
+@app.callback(
+    [Output('results-container', 'children', allow_duplicate=True),
+     Output('results-store', 'data', allow_duplicate=True),
+     Output('job-store', 'data', allow_duplicate=True),
+     Output('job-interval', 'disabled', allow_duplicate=True),
+     Output('stop-sim-btn', 'hidden', allow_duplicate=True)],
+    [Input('job-interval', 'n_intervals'),
+     Input('stop-sim-btn', 'n_clicks')],
+    State('job-store', 'data'),
+    prevent_initial_call=True
+)
+@timed(CALLBACK_SECONDS, callback='poll_simulation_job')
+def poll_simulation_job(n_intervals, stop_clicks, job):
+    """Show a queued simulation's result once done, or cancel it"""
+    if not job:
+        return dash.no_update, dash.no_update, dash.no_update, True, dash.no_update
+
+    if dash.ctx.triggered_id == 'stop-sim-btn':
+        job_queue.cancel(job['job_id'])
+        return create_modern_glass_card([
+            html.H3("Simulation Cancelled", style={'color': COLORS['oberlin_gold'], 'textAlign': 'center'})
+        ]), None, None, True, True
 
-                html.Div([
-                    html.Div([
-                        html.Div("OPS", style={'fontSize': '12px', 'color': COLORS['text_light']}),
-                        html.Div(f"{stats['summary']['OBP'] + stats['summary']['SLG']:.3f}", style={
-                            'fontSize': '36px', 'fontWeight': '700', 'color': COLORS['oberlin_red']
-                        })
-                    ], style={'textAlign': 'center', 'padding': '16px'})
-                ], style={'width': '25%', 'display': 'inline-block'})
-            ], style={'marginBottom': '32px'}),
+    status = job_queue.status(job['job_id'])
+    if status is None or status['state'] == 'cancelled':
+        # Another process took the request, or the job was pruned; the ID and
+        # seed make the rerun identical
+        try:
+            job = dict(job, job_id=submit_simulation_job(job))
+        except QueueFull:
+            return create_busy_card(), None, None, True, True
+        except ValueError as e:
+            return create_error_card("Invalid Simulation", str(e)), None, None, True, True
+        status = job_queue.status(job['job_id'])
+
+    if status['state'] == 'failed':
+        return html.Div(f"Error: {status['error']}"), None, None, True, True
+    if status['state'] != 'done':
+        return create_job_card(status), dash.no_update, job, False, False
+
+    return None, results_payload(status['result']), None, True, True
+
+def matrix_params(year, ballpark, sim_count, seed, source, model=DEFAULT_MODEL):
+    """The parameters behind a heatmap; stored so the export matches it"""
+    simulate = source == 'simulated'
+    return {
+        'year': year,
+        'n': int(sim_count or 1000),
+        'cage': ballpark if ballpark in CAGES else DEFAULT_CAGE,
+        'model': model if model in MODELS else DEFAULT_MODEL,
+        'simulate': simulate,
+        'seed': simulator.resolve_seed(seed) if simulate else None
+    }
 
-            # Outcome breakdown
-            html.Div([
-                html.H4("Outcome Breakdown", style={
-                    'fontSize': '18px',
-                    'fontWeight': '600',
-                    'color': COLORS['oberlin_gold'],
-                    'marginBottom': '16px'
-                }),
+def matrix_pairs(sim, params):
+    return sim.all_pairs(params['year'], n=params['n'], park_factor=cage_factors(params['cage']),
+                         simulate=params['simulate'], seed=params['seed'],
+                         model=params.get('model', DEFAULT_MODEL))
 
-                # Note about park factor
-                html.P(f"* {'↑' if stats['summary'].get('park_factor', 1.0) > 1 else '↓'} Hit outcomes adjusted by {abs(stats['summary'].get('park_factor', 1.0) - 1)*100:.0f}% for cage dimensions", style={
-                    'fontSize': '12px',
-                    'color': COLORS['text_secondary'],
-                    'fontStyle': 'italic',
-                    'marginBottom': '16px'
-                }),
+def player_label(players, pid):
+    return f"{players[pid]['name']} (#{players[pid].get('jersey', 'N/A')})"
 
-                # Create outcome bars
-                html.Div([
-                    html.Div([
-                        html.Div([
-                            html.Span(format_outcome(outcome), style={
-                                'display': 'inline-block',
-                                'width': '100px',
-                                'fontSize': '14px',
-                                'color': COLORS['text_light']
-                            }),
-                            html.Div(style={
-                                'display': 'inline-block',
-                                'width': f"{stats[outcome]['pct'] * 300}px",
-                                'height': '24px',
-                                'background': get_outcome_color(outcome),
-                                'borderRadius': '12px',
-                                'marginLeft': '12px',
-                                'verticalAlign': 'middle'
-                            }),
-                            html.Span(f"{stats[outcome]['pct']*100:.1f}%", style={
-                                'marginLeft': '12px',
-                                'fontSize': '14px',
-                                'fontWeight': '600',
-                                'color': COLORS['oberlin_gold']
-                            })
-                        ], style={'marginBottom': '12px'})
-                    ]) for outcome in ['1B', '2B', '3B', 'HR', 'BB', 'K', 'HBP', 'FO']
-                ])
-            ])
-        ], animation_delay='0.2s')
-    ])
+@app.callback(
+    [Output('matrix-heatmap', 'figure'),
+     Output('matrix-heatmap', 'style'),
+     Output('matrix-store', 'data')],
+    [Input('matrix-btn', 'n_clicks'),
+     Input('matrix-stat', 'value'),
+     Input('matrix-source', 'value')],
+    [State('year-select', 'value'),
+     State('ballpark-select', 'value'),
+     State('sim-count', 'value'),
+     State('sim-seed', 'value'),
+     State('model-select', 'value'),
+     State('matrix-store', 'data')],
+    prevent_initial_call=True
+)
+@timed(CALLBACK_SECONDS, callback='build_matchup_matrix')
+def build_matchup_matrix(n_clicks, stat, source, year, ballpark, sim_count, seed, model, stored):
+    """Render the all-pairs heatmap; switching the stat reuses the stored parameters"""
+    if dash.ctx.triggered_id != 'matrix-btn' and not stored:
+        return dash.no_update, dash.no_update, dash.no_update
+    if dash.ctx.triggered_id == 'matrix-stat' and stored:
+        params = stored
+    else:
+        params = matrix_params(year, ballpark, sim_count, seed, source, model)
+
+    sim = simulator
+    pairs = matrix_pairs(sim, params)
+    values = pairs['simulated' if params['simulate'] else 'expected'][stat or 'OPS']
+    batters = [player_label(sim.batters, pid) for pid in pairs['batter_ids']]
+    pitchers = [player_label(sim.pitchers, pid) for pid in pairs['pitcher_ids']]
+
+    figure = go.Figure(go.Heatmap(
+        z=values.round(3),
+        x=pitchers,
+        y=batters,
+        colorscale=[[0, COLORS['background']], [0.5, COLORS['oberlin_red']], [1, COLORS['oberlin_gold']]],
+        hovertemplate="%{y}<br>vs %{x}<br>" + (stat or 'OPS') + ": %{z:.3f}<extra></extra>",
+        colorbar={'title': stat or 'OPS'}
+    ))
+    title = (f"{'Simulated' if params['simulate'] else 'Expected'} {stat or 'OPS'} • "
+             f"{params['year'] or 'All'} Season • {CAGES[params['cage']]['label']} • "
+             f"{MODELS[params.get('model', DEFAULT_MODEL)].label}")
+    if params['simulate']:
+        title += f" • {params['n']:,} AB per pair • Seed {params['seed']}"
+    figure.update_layout(
+        title=title,
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font={'family': 'Inter, sans-serif', 'color': COLORS['oberlin_gold']},
+        xaxis={'tickangle': -45},
+        yaxis={'autorange': 'reversed'},
+        height=max(400, 24 * len(batters) + 200),
+        margin={'l': 200, 'b': 160}
+    )
+    return figure, {'display': 'block'}, params
 
-def format_outcome(outcome):
-    """Format outcome for display"""
-    outcome_map = {
-        '1B': 'Single',
-        '2B': 'Double',
-        '3B': 'Triple',
-        'HR': 'Home Run',
-        'BB': 'Walk',
-        'K': 'Strikeout',
-        'HBP': 'Hit by Pitch',
-        'FO': 'Field Out'
-    }
-    return outcome_map.get(outcome, outcome)
+@app.callback(
+    Output('matrix-download', 'data'),
+    Input('matrix-download-btn', 'n_clicks'),
+    [State('matrix-store', 'data'),
+     State('year-select', 'value'),
+     State('ballpark-select', 'value'),
+     State('sim-count', 'value'),
+     State('sim-seed', 'value'),
+     State('matrix-source', 'value'),
+     State('model-select', 'value')],
+    prevent_initial_call=True
+)
+@timed(CALLBACK_SECONDS, callback='export_matchup_matrix')
+def export_matchup_matrix(n_clicks, stored, year, ballpark, sim_count, seed, source, model):
+    """Download the matrix as one CSV row per pair, matching the heatmap if one is shown"""
+    params = stored or matrix_params(year, ballpark, sim_count, seed, source, model)
+    sim = simulator
+    pairs = matrix_pairs(sim, params)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    columns = [f'expected_{stat}' for stat in SUMMARY_STATS]
+    if params['simulate']:
+        columns += [f'simulated_{stat}' for stat in SUMMARY_STATS]
+    writer.writerow(['batter_id', 'batter', 'pitcher_id', 'pitcher', 'cage', 'model', 'n', 'seed'] + columns)
+    for i, batter_id in enumerate(pairs['batter_ids']):
+        for j, pitcher_id in enumerate(pairs['pitcher_ids']):
+            values = [f"{pairs['expected'][stat][i, j]:.6f}" for stat in SUMMARY_STATS]
+            if params['simulate']:
+                values += [f"{pairs['simulated'][stat][i, j]:.6f}" for stat in SUMMARY_STATS]
+            writer.writerow([batter_id, sim.batters[batter_id]['name'], pitcher_id, sim.pitchers[pitcher_id]['name'],
+                             params['cage'], pairs['model'], params['n'], params['seed'] or ''] + values)
+
+    filename = f"matchup_matrix_{params['year'] or 'all'}_{'simulated' if params['simulate'] else 'expected'}.csv"
+    return dcc.send_string(buffer.getvalue(), filename)
 
-def get_outcome_color(outcome):
-    """Get color for outcome type"""
-    color_map = {
-        '1B': '#f9c74f',  # Gold for singles
-        '2B': '#f77f00',  # Orange for doubles
-        '3B': '#ee6c4d',  # Coral for triples
-        'HR': '#c8322f',  # Oberlin Red for home runs
-        'BB': '#6a994e',  # Green for walks
-        'K': '#bc4749',  # Dark red for strikeouts
-        'HBP': '#577590',  # Blue-gray for HBP
-        'FO': '#495057'   # Gray for field outs
-    }
-    return color_map.get(outcome, '#666')
 server = app.server
+# JSON API for scripted bulk simulations (see api.py)
+server.register_blueprint(create_api(lambda: simulator))
+
+def admin_denied():
+    """Error response unless the request carries YEO_ADMIN_TOKEN as X-Admin-Token or a Bearer token
+
+    Admin routes 404 while no token is configured.
+    """
+    token = os.environ.get('YEO_ADMIN_TOKEN')
+    if not token:
+        return jsonify({'error': 'not found'}), 404
+    supplied = request.headers.get('X-Admin-Token', '')
+    auth = request.headers.get('Authorization', '')
+    if auth.startswith('Bearer '):
+        supplied = auth[len('Bearer '):]
+    if not hmac.compare_digest(supplied.encode(), token.encode()):
+        return jsonify({'error': 'forbidden'}), 403
+    return None
+
+def callback_name(output):
+    """Function name of the Dash callback behind an /_dash-update-component output spec"""
+    entry = app.callback_map.get(output)
+    return getattr(entry.get('callback'), '__name__', 'unknown') if entry else 'unknown'
+
+def collect_app_metrics():
+    """Simulation cache and job queue counters, read at scrape time"""
+    cache = simulation_cache.stats()
+    jobs = job_queue.metrics()
+    return [
+        ('yeo_sim_cache_lookups_total', 'counter', "Simulation cache lookups by result",
+         [({'result': 'hit'}, cache['hits']), ({'result': 'miss'}, cache['misses'])]),
+        ('yeo_sim_cache_hit_ratio', 'gauge', "Simulation cache hits over lookups", [({}, cache['hit_rate'])]),
+        ('yeo_sim_cache_entries', 'gauge', "Simulation cache entries in memory", [({}, cache['size'])]),
+        ('yeo_sim_cache_evictions_total', 'counter', "Simulation cache LRU evictions", [({}, cache['evictions'])]),
+        ('yeo_player_cards_cached', 'gauge', "Memoized player cards", [({}, len(player_cards))]),
+        ('yeo_jobs', 'gauge', "Simulation jobs by state",
+         [({'state': 'queued'}, jobs['queued']), ({'state': 'running'}, jobs['running'])]),
+        ('yeo_jobs_total', 'counter', "Simulation jobs by outcome",
+         [({'outcome': outcome}, jobs[outcome]) for outcome in ('completed', 'failed', 'cancelled', 'rejected')]),
+    ]
+
+metrics.REGISTRY.add_collector(collect_app_metrics)
+
+@server.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@server.after_request
+def record_request_metrics(response):
+    """Request latency and response size, labeled by route (and callback for Dash updates)
+
+    Callback and API requests are also logged as request events.
+    """
+    if 'request_start' not in g:
+        return response
+    dash_update = request.path.endswith('/_dash-update-component')
+    log = (dash_update or request.path.startswith('/api/')) and request_logger.isEnabledFor(logging.INFO)
+    if not (metrics.enabled() or log):
+        return response
+
+    duration = time.perf_counter() - g.request_start
+    callback = callback_name((request.get_json(silent=True) or {}).get('output')) if dash_update else ''
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    size = response.calculate_content_length()
+    REQUEST_SECONDS.observe(duration, route=route, callback=callback)
+    if size is not None:
+        RESPONSE_BYTES.observe(size, route=route, callback=callback)
+    if log:
+        log_event(request_logger, 'request', route=route, callback=callback or None, status=response.status_code,
+                  duration_ms=duration * 1000, bytes=size)
+    return response
+
+@server.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus scrape endpoint (404 unless YEO_METRICS is set)
+
+    Each gunicorn worker keeps its own metrics, so a scrape sees the worker
+    that answered it.
+    """
+    if not metrics.enabled():
+        return jsonify({'error': 'not found'}), 404
+    return Response(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
+
+@server.route('/admin/reload', methods=['POST'])
+def admin_reload():
+    """Reload player data"""
+    return admin_denied() or jsonify(reload_player_data())
+
+@server.route('/admin/jobs', methods=['GET'])
+def admin_jobs():
+    """Job queue depth and latency, plus simulation cache counters"""
+    return admin_denied() or jsonify({'jobs': job_queue.metrics(), 'cache': simulation_cache.stats()})
+
+def watch_player_data(interval: float):
+    """Poll the roster JSON mtimes and reload when they change"""
+    def mtimes():
+        return {name: os.stat(os.path.join(simulator.data_dir, name)).st_mtime_ns
+                for name in ('batters.json', 'pitchers.json')
+                if os.path.exists(os.path.join(simulator.data_dir, name))}
+
+    seen = mtimes()
+    while True:
+        time.sleep(interval)
+        current = mtimes()
+        if current != seen:
+            seen = current
+            try:
+                result = reload_player_data()
+                log_event(logger, 'player_data_reloaded', batters=result['batters'], pitchers=result['pitchers'],
+                          changed_batters=len(result['changed_batters']),
+                          changed_pitchers=len(result['changed_pitchers']),
+                          cache_entries_dropped=result['cache_entries_dropped'])
+            except Exception:
+                log_event(logger, 'player_data_reload_failed', logging.ERROR, exc_info=True)
+
+watcher_pid = None
+
+@server.before_request
+def start_data_watcher():
+    """Start the watcher once per process when YEO_WATCH_DATA (seconds) is set
+
+    Started lazily from the first request because threads do not survive the
+    fork of preloaded gunicorn workers.
+    """
+    global watcher_pid
+    interval = os.environ.get('YEO_WATCH_DATA')
+    if interval and watcher_pid != os.getpid():
+        watcher_pid = os.getpid()
+        threading.Thread(target=watch_player_data, args=(float(interval),), daemon=True).start()
+
 if __name__ == '__main__':
     app.run_server(debug=False, port=8051)
\ No newline at end of file